@@ -0,0 +1,103 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks.suite import (
+    SCENARIOS,
+    find_regressions,
+    run_scenario,
+    warm_up,
+)
+
+# Timings only compare on the machine they were recorded on, so the baseline
+# is not committed: record it with `make benchmark-baseline` first.
+BASELINE = Path(__file__).parent / 'baseline.json'
+
+
+def main() -> int:
+    """Run the benchmarks and compare them against the baseline."""
+    parser = argparse.ArgumentParser(
+        description='Time the Octadocs pipeline on synthetic sites.',
+    )
+    parser.add_argument(
+        'scenarios',
+        nargs='*',
+        help=f'Scenarios to run, all by default: {", ".join(SCENARIOS)}.',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed slowdown against the baseline, as a fraction.',
+    )
+    parser.add_argument(
+        '--noise-floor',
+        type=float,
+        default=0.05,
+        help='Slowdowns below this many seconds are ignored.',
+    )
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='Store the timings as the new baseline.',
+    )
+    arguments = parser.parse_args()
+
+    unknown_scenarios = set(arguments.scenarios) - set(SCENARIOS)
+    if unknown_scenarios:
+        parser.error(
+            f'unknown scenarios: {", ".join(sorted(unknown_scenarios))}',
+        )
+
+    # Per-file import messages would bury the results.
+    logging.getLogger('octadocs').setLevel(logging.WARNING)
+
+    warm_up()
+
+    timings = {}
+    for scenario_name in arguments.scenarios or SCENARIOS:
+        timings[scenario_name] = run_scenario(
+            SCENARIOS[scenario_name],
+            repeat=arguments.repeat,
+        )
+        for stage_name, duration in timings[scenario_name].items():
+            print(f'{scenario_name:>10} {stage_name:<20} {duration:>8.3f}s')
+
+    if arguments.save:
+        rounded_timings = {
+            scenario_name: {
+                stage_name: round(duration, 4)
+                for stage_name, duration in stage_timings.items()
+            }
+            for scenario_name, stage_timings in timings.items()
+        }
+        arguments.baseline.write_text(
+            json.dumps(rounded_timings, indent=2, sort_keys=True) + '\n',
+        )
+        return 0
+
+    if not arguments.baseline.exists():
+        print(
+            f'No baseline at {arguments.baseline}, record one on this ' +
+            'machine with --save.',
+        )
+        return 0
+
+    regressions = find_regressions(
+        timings=timings,
+        baseline=json.loads(arguments.baseline.read_text()),
+        tolerance=arguments.tolerance,
+        noise_floor=arguments.noise_floor,
+    )
+    for regression in regressions:
+        print(f'Regression: {regression}')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+MKDOCS_YML = '''site_name: Octadocs benchmark
+docs_dir: docs
+'''
+
+CONTEXT_YAML = '''seeAlso:
+  $id: rdfs:seeAlso
+  $type: $id
+'''
+
+RULE = '''PREFIX local: <local:>
+
+INSERT {{ ?page local:rule{index} ?value }}
+WHERE {{ ?page local:property{index} ?value }}
+'''
+
+
+@dataclass(frozen=True)
+class CorpusParameters:
+    """Shape of a synthetic documentation site."""
+
+    page_count: int = 100
+    directory_depth: int = 3
+    context_file_count: int = 5
+    front_matter_size: int = 5
+    vocabulary_size: int = 20
+    rule_count: int = 2
+
+
+def directories(parameters: CorpusParameters) -> Iterator[Path]:
+    """
+    Directories to place pages into, relative to docs_dir.
+
+    Every level holds two subdirectories, down to the configured depth.
+    """
+    level = [Path()]
+    yield from level
+    for _depth in range(parameters.directory_depth):
+        level = [
+            parent / f'section-{branch}'
+            for parent in level
+            for branch in range(2)
+        ]
+        yield from level
+
+
+def front_matter(index: int, parameters: CorpusParameters) -> str:
+    """YAML front matter of a page."""
+    vocabulary_size = max(parameters.vocabulary_size, 1)
+    lines = [
+        f'title: Page {index}',
+        f'position: {index}',
+        f'$type: Class{index % vocabulary_size}',
+        f'seeAlso: page-{(index + 1) % parameters.page_count}',
+    ]
+    lines.extend(
+        f'property{property_index}: Value {index}.{property_index}'
+        for property_index in range(parameters.front_matter_size)
+    )
+    return '\n'.join(lines)
+
+
+def vocabulary(parameters: CorpusParameters) -> str:
+    """Turtle vocabulary with chains of classes and properties."""
+    lines = [
+        '@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .',
+        '@prefix owl: <http://www.w3.org/2002/07/owl#> .',
+        '@prefix local: <local:> .',
+    ]
+    for index in range(parameters.vocabulary_size):
+        lines.append(f'local:Class{index} a owl:Class ;')
+        lines.append(f'    rdfs:label "Class {index}"')
+        if index:
+            lines.append(f'    ; rdfs:subClassOf local:Class{index - 1}')
+        lines.append('    .')
+
+    for property_index in range(parameters.front_matter_size):
+        lines.append(
+            f'local:property{property_index} a owl:DatatypeProperty ; ' +
+            'rdfs:domain local:Class0 .',
+        )
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_corpus(root: Path, parameters: CorpusParameters) -> Path:
+    """
+    Write a synthetic site into the root directory.
+
+    Returns docs_dir of the site.
+    """
+    docs_dir = root / 'docs'
+    all_directories = list(directories(parameters))
+    for directory in all_directories:
+        (docs_dir / directory).mkdir(parents=True, exist_ok=True)
+
+    (root / 'mkdocs.yml').write_text(MKDOCS_YML)
+
+    for directory in all_directories[:parameters.context_file_count]:
+        (docs_dir / directory / 'context.yaml').write_text(CONTEXT_YAML)
+
+    for index in range(parameters.page_count):
+        directory = all_directories[index % len(all_directories)]
+        (docs_dir / directory / f'page-{index}.md').write_text(
+            f'---\n{front_matter(index, parameters)}\n---\n\n' +
+            f'# Page {index}\n\nSome prose.\n',
+        )
+
+    for directory in all_directories:
+        index_page = docs_dir / directory / 'index.md'
+        index_page.write_text(f'---\ntitle: {directory.name or "Home"}\n---\n')
+
+    (docs_dir / 'vocabulary.ttl').write_text(vocabulary(parameters))
+
+    inference = root / 'inference'
+    inference.mkdir(exist_ok=True)
+    for rule_index in range(parameters.rule_count):
+        (inference / f'rule-{rule_index}.sparql').write_text(
+            RULE.format(index=rule_index),
+        )
+
+    return docs_dir
@@ -0,0 +1,159 @@
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping
+
+import octadocs
+import rdflib
+from benchmarks.corpus import CorpusParameters, generate_corpus
+from mkdocs.config import load_config
+from mkdocs.structure.files import get_files
+from mkdocs.structure.nav import get_navigation
+from octadocs.conversions import src_path_to_iri
+from octadocs.navigation.processor import OctadocsNavigationProcessor
+from octadocs.octiron import Octiron
+from octadocs.page_index import build_page_index
+from octadocs.resolver import Resolver
+
+# Seconds per stage of the pipeline.
+StageTimings = Dict[str, float]
+
+# To prevent WPS407 Found mutable module constant
+SCENARIOS = MappingProxyType({
+    'small': CorpusParameters(page_count=50),
+    'medium': CorpusParameters(page_count=300, context_file_count=15),
+    'deep': CorpusParameters(page_count=100, directory_depth=6),
+    'rich': CorpusParameters(
+        page_count=50,
+        front_matter_size=20,
+        vocabulary_size=50,
+        rule_count=10,
+    ),
+})
+
+# Per page, the kind of lookups a typical template makes.
+PAGE_QUERY = '''
+    SELECT ?property ?value WHERE {
+        ?this ?property ?value .
+    }
+'''
+
+
+@contextmanager
+def stage(timings: StageTimings, name: str) -> Iterator[None]:
+    """Measure wall time of a pipeline stage."""
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+
+
+def run_pipeline(root: Path, parameters: CorpusParameters) -> StageTimings:
+    """Generate a site and time every stage of building it."""
+    timings: StageTimings = {}
+
+    docs_dir = generate_corpus(root, parameters)
+    config = load_config(config_file=str(root / 'mkdocs.yml'))
+    files = get_files(config)
+
+    octiron = Octiron(root_directory=docs_dir)
+
+    with stage(timings, 'update_from_file'):
+        octiron.update_from_file(
+            path=Path(octadocs.__file__).parent / 'octadocs.yaml',
+            local_iri=rdflib.URIRef('https://ns.octadocs.io/'),
+            global_url='/octadocs.yaml',
+        )
+
+        for mkdocs_file in files:
+            octiron.update_from_file(
+                path=Path(mkdocs_file.abs_src_path),
+                local_iri=src_path_to_iri(mkdocs_file.src_path),
+                global_url=f'/{mkdocs_file.url}',
+            )
+
+    with stage(timings, 'apply_inference'):
+        octiron.apply_inference()
+
+    navigation = get_navigation(files, config)
+    with stage(timings, 'navigation'):
+        OctadocsNavigationProcessor(
+            graph=octiron.graph,
+            navigation=navigation,
+        ).generate()
+
+    with stage(timings, 'macro queries'):
+        page_index = build_page_index(octiron.graph)
+        resolver = Resolver(octiron=octiron)
+        for page in navigation.pages:
+            this = page_index.this(src_path_to_iri(page.file.src_path))
+            rows = octiron.query(PAGE_QUERY, this=this)
+            resolver.urls(row['value'] for row in rows)  # type: ignore
+            resolver.labels(row['value'] for row in rows)  # type: ignore
+
+    return timings
+
+
+def warm_up() -> None:
+    """
+    Build a tiny site once, without recording the timings.
+
+    The first build in a process pays for lazy imports and for compiling the
+    SPARQL grammar, which would otherwise be blamed on the first scenario.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        run_pipeline(
+            Path(temp_dir),
+            CorpusParameters(page_count=2, directory_depth=1, rule_count=1),
+        )
+
+
+def run_scenario(parameters: CorpusParameters, repeat: int) -> StageTimings:
+    """
+    Build the synthetic site several times.
+
+    The best time of every stage is reported, as the least affected by
+    whatever else runs on the machine.
+    """
+    runs: List[StageTimings] = []
+    for _run in range(repeat):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runs.append(run_pipeline(Path(temp_dir), parameters))
+
+    return {
+        stage_name: min(run[stage_name] for run in runs)
+        for stage_name in runs[0]
+    }
+
+
+def find_regressions(
+    timings: Mapping[str, StageTimings],
+    baseline: Mapping[str, StageTimings],
+    tolerance: float,
+    noise_floor: float,
+) -> List[str]:
+    """
+    Describe stages which got slower than the baseline allows.
+
+    Differences below the noise floor, in seconds, are never regressions.
+    """
+    regressions = []
+    for scenario_name, stage_timings in timings.items():
+        baseline_timings = baseline.get(scenario_name, {})
+        for stage_name, duration in stage_timings.items():
+            baseline_duration = baseline_timings.get(stage_name)
+            if baseline_duration is None:
+                continue
+
+            if (
+                duration > baseline_duration * (1 + tolerance) and
+                duration - baseline_duration > noise_floor
+            ):
+                regressions.append(
+                    f'{scenario_name} / {stage_name}: ' +
+                    f'{duration:.3f}s, baseline {baseline_duration:.3f}s',
+                )
+
+    return regressions
+
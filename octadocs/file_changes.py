@@ -0,0 +1,106 @@
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, FrozenSet, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileChanges:
+    """Source files changed or removed since the previous build."""
+
+    changed: FrozenSet[Path]
+    removed: FrozenSet[Path]
+
+    @property
+    def paths(self) -> FrozenSet[Path]:
+        """All the affected paths."""
+        return self.changed | self.removed
+
+
+class FileChangeTracker:
+    """
+    Collect paths changed under docs_dir in between `mkdocs serve` rebuilds.
+
+    Events are received from the file watcher thread of the live reload
+    server, and taken by the plugin at the start of the next build. Until
+    the tracker is watching, and after events which cannot be attributed to
+    particular files, the set of changes is unknown.
+
+    The tracker is a watchdog event handler by duck typing, so that watchdog
+    is only needed when the live reload server actually uses it.
+    """
+
+    def __init__(self) -> None:
+        """Create a tracker which is not watching anything yet."""
+        self.lock = threading.Lock()
+        self.is_watching = False
+        self.is_complete = False
+        self.changed: Set[Path] = set()
+        self.removed: Set[Path] = set()
+
+    def watch(self, observer, directory: Path) -> None:  # type: ignore
+        """Subscribe to the events of a watchdog observer."""
+        with self.lock:
+            if self.is_watching:
+                return
+
+            observer.schedule(self, str(directory), recursive=True)
+            self.is_watching = True
+            self.is_complete = True
+
+    def dispatch(self, event: Any) -> None:  # type: ignore
+        """Receive a watchdog event from the observer."""
+        self.on_any_event(event)
+
+    def on_any_event(self, event: Any) -> None:  # type: ignore
+        """Record the paths the event affects."""
+        with self.lock:
+            if event.is_directory:
+                # Creating a directory, or changing its contents, is reported
+                # separately for every file; removing or moving it might not.
+                if event.event_type in {'deleted', 'moved'}:
+                    self.is_complete = False
+                return
+
+            if event.event_type == 'moved':
+                self._remove(Path(event.src_path))
+                self._change(Path(event.dest_path))
+
+            elif event.event_type == 'deleted':
+                self._remove(Path(event.src_path))
+
+            elif event.event_type in {'created', 'modified'}:
+                self._change(Path(event.src_path))
+
+    def take(self) -> Optional[FileChanges]:
+        """
+        Retrieve the changes since the last call and start over.
+
+        Returns None if the changes are not known, and every file has to be
+        checked.
+        """
+        with self.lock:
+            file_changes = FileChanges(
+                changed=frozenset(self.changed),
+                removed=frozenset(self.removed),
+            ) if self.is_complete else None
+
+            self.changed = set()
+            self.removed = set()
+            self.is_complete = self.is_watching
+
+        return file_changes
+
+    def _change(self, path: Path) -> None:
+        self.removed.discard(path)
+        self.changed.add(path)
+
+    def _remove(self, path: Path) -> None:
+        self.changed.discard(path)
+        self.removed.add(path)
+
+
+file_change_tracker = FileChangeTracker()
@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, DefaultDict, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Name and category of a span.
+SpanKey = Tuple[str, str]
+
+# Category, start time and arguments of a span which is not closed yet.
+OpenSpan = Tuple[str, float, Dict[str, Any]]  # type: ignore
+
+
+@dataclass(frozen=True)
+class Span:
+    """A timed stage of the build."""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    arguments: Dict[str, Any]  # type: ignore
+
+
+@dataclass(frozen=True)
+class SpanSummary:
+    """Timings of all spans with the same name and category."""
+
+    name: str
+    category: str
+    count: int
+    total_duration: float
+    max_duration: float
+
+
+@dataclass
+class Instrumentation:
+    """
+    Wall time and counters of the build stages.
+
+    Spans may be nested. When instrumentation is disabled, recording costs
+    next to nothing.
+    """
+
+    enabled: bool = False
+    origin: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+    counters: DefaultDict[str, int] = field(
+        default_factory=lambda: defaultdict(int),
+    )
+    open_spans: Dict[str, OpenSpan] = field(  # type: ignore
+        default_factory=dict,
+    )
+
+    def reset(self, enabled: bool) -> None:
+        """Start recording a new build."""
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.counters.clear()
+        self.open_spans.clear()
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: str,
+        **arguments: Any,
+    ) -> Iterator[None]:
+        """Measure wall time of the block."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, category, start, arguments)
+
+    def begin(self, name: str, category: str, **arguments: Any) -> None:
+        """
+        Open a span which is closed by a different call.
+
+        Useful to measure stages which start and end in different hooks.
+        """
+        if self.enabled:
+            self.open_spans[name] = (category, time.perf_counter(), arguments)
+
+    def end(self, name: str) -> None:
+        """Close a span opened by `begin()`, if any."""
+        open_span = self.open_spans.pop(name, None)
+        if open_span is None:
+            return
+
+        category, start, arguments = open_span
+        self._record(name, category, start, arguments)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        if self.enabled:
+            self.counters[name] += amount
+
+    def summary(self) -> List[SpanSummary]:
+        """Aggregate spans by name and category, slowest first."""
+        spans_per_key: Dict[SpanKey, List[Span]] = defaultdict(list)
+        for span in self.spans:
+            spans_per_key[(span.name, span.category)].append(span)
+
+        return sorted(
+            (
+                SpanSummary(
+                    name=name,
+                    category=category,
+                    count=len(spans),
+                    total_duration=sum(span.duration for span in spans),
+                    max_duration=max(span.duration for span in spans),
+                )
+                for (name, category), spans in spans_per_key.items()
+            ),
+            key=lambda span_summary: span_summary.total_duration,
+            reverse=True,
+        )
+
+    def log_summary(self) -> None:
+        """Log a table of timings and the counters."""
+        logger.info(
+            'Build timings:\n%s',
+            '\n'.join(
+                f'{span_summary.category:>10} {span_summary.name:<40} ' +
+                f'{span_summary.count:>6} × ' +
+                f'{span_summary.total_duration:>8.3f}s ' +
+                f'(max {span_summary.max_duration:.3f}s)'
+                for span_summary in self.summary()
+            ),
+        )
+
+        for counter_name, counter_value in sorted(self.counters.items()):
+            logger.info('Build counter: %s = %s', counter_name, counter_value)
+
+    def chrome_trace(self) -> Dict[str, Any]:  # type: ignore
+        """
+        Convert spans to Chrome trace event format.
+
+        The result can be opened in chrome://tracing or Perfetto.
+        """
+        process_id = os.getpid()
+        trace_events: List[Dict[str, Any]] = [  # type: ignore
+            {
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': process_id,
+                'tid': 0,
+                'args': span.arguments,
+            }
+            for span in self.spans
+        ]
+
+        if self.counters:
+            trace_events.append({
+                'name': 'counters',
+                'ph': 'C',
+                'ts': (time.perf_counter() - self.origin) * 1e6,
+                'pid': process_id,
+                'args': dict(self.counters),
+            })
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write spans to a JSON file in Chrome trace event format."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str))
+        logger.info('Build trace: written to %s', path)
+
+    def _record(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        arguments: Dict[str, Any],  # type: ignore
+    ) -> None:
+        """Store a span which has just ended."""
+        self.spans.append(Span(
+            name=name,
+            category=category,
+            start=start - self.origin,
+            duration=time.perf_counter() - start,
+            arguments=arguments,
+        ))
+
+
+instrumentation = Instrumentation()
@@ -2,7 +2,7 @@ import html
 import io
 from base64 import b64encode
 from functools import partial
-from typing import Any, Dict, Optional
+from typing import Iterable, Optional, Union
 from unittest.mock import patch
 
 import pydotplus
@@ -10,7 +10,15 @@ import rdflib
 from mkdocs_macros.plugin import MacrosPlugin
 from octadocs.conversions import iri_by_page, src_path_to_iri
 from octadocs.environment import iri_to_url
-from octadocs.query import query
+from octadocs.profiler import query_profiler
+from octadocs.query import (
+    ColumnarResult,
+    prepare,
+    query_columns,
+    query_many,
+)
+from octadocs.repeated_queries import repeated_query_detector
+from octadocs.resolver import Resolver
 from rdflib.plugins.sparql.processor import SPARQLResult
 from rdflib.tools.rdf2dot import rdf2dot
 
@@ -55,25 +63,42 @@ def sparql(
         for argument_name, argument_value in kwargs.items()
     }
 
-    return instance.query(query, initBindings=bindings)
+    repeated_query_detector.record(query, bindings)
+    return query_profiler.profile(
+        source='sparql',
+        query_text=query,
+        execute=partial(
+            instance.query,
+            prepare(query, instance),
+            initBindings=bindings,
+        ),
+    )
 
 
-def _render_as_row(row: Dict[rdflib.Variable, Any]) -> str:  # type: ignore
+def _render_as_row(cells: Iterable[Optional[rdflib.term.Node]]) -> str:
     """Render row of a Markdown table."""
-    formatted_row = ' | '.join(row.values())
+    formatted_row = ' | '.join(
+        '' if cell is None else cell
+        for cell in cells
+    )
     return f'| {formatted_row} |'
 
 
-def table(query_result: SPARQLResult) -> str:
+def table(query_result: Union[SPARQLResult, ColumnarResult]) -> str:
     """Render as a Markdown table."""
-    headers = ' | '.join(str(cell) for cell in query_result.vars)
+    if isinstance(query_result, ColumnarResult):
+        variables = query_result.variables
+        cells_per_row = query_result.rows()
 
-    rows = '\n'.join(
-        _render_as_row(row)
-        for row in query_result.bindings
-    )
+    else:
+        variables = query_result.vars
+        cells_per_row = (row.values() for row in query_result.bindings)
 
-    separators = '| ' + (' --- |' * len(query_result.vars))  # noqa: WPS336
+    headers = ' | '.join(str(variable) for variable in variables)
+
+    rows = '\n'.join(map(_render_as_row, cells_per_row))
+
+    separators = '| ' + (' --- |' * len(variables))  # noqa: WPS336
 
     return f'''
 ---
@@ -89,50 +114,20 @@ def construct(
     **kwargs: str,
 ) -> rdflib.Graph:
     """Run SPARQL SELECT query and return formatted result."""
-    sparql_result: SPARQLResult = instance.query(
-        query_text,
-        initBindings=kwargs,
+    repeated_query_detector.record(query_text, kwargs)
+    sparql_result: SPARQLResult = query_profiler.profile(
+        source='construct',
+        query_text=query_text,
+        execute=partial(
+            instance.query,
+            prepare(query_text, instance),
+            initBindings=kwargs,
+        ),
     )
 
     return sparql_result.graph
 
 
-def url(
-    resource: rdflib.URIRef,
-    graph: rdflib.ConjunctiveGraph
-) -> Optional[str]:
-    """Convert a URIRef to a clickable URL."""
-    bindings = graph.query(
-        'SELECT ?url WHERE { ?resource octa:subjectOf/octa:url ?url . } ',
-        initBindings={
-            'resource': resource,
-        }
-    ).bindings
-
-    if not bindings:
-        return None
-
-    return '/' + bindings[0][rdflib.Variable('url')].value
-
-
-def label(
-    resource: rdflib.URIRef,
-    graph: rdflib.ConjunctiveGraph
-) -> Optional[str]:
-    """Convert a URIRef to a clickable URL."""
-    bindings = graph.query(
-        'SELECT ?label WHERE { ?resource rdfs:label ?label . } ',
-        initBindings={
-            'resource': resource,
-        }
-    ).bindings
-
-    if not bindings:
-        return None
-
-    return bindings[0][rdflib.Variable('label')].value
-
-
 def define_env(env: MacrosPlugin) -> MacrosPlugin:  # noqa: WPS213
     """Create mkdocs-macros Jinja environment."""
     env.filter(graph)
@@ -142,44 +137,40 @@ def define_env(env: MacrosPlugin) -> MacrosPlugin:  # noqa: WPS213
 
     octiron = env.variables.octiron
 
+    env.macro(octiron.query, name='query')
+
     env.macro(
         partial(
-            query,
+            construct,
             instance=env.variables.graph,
         ),
-        name='query',
+        name='construct',
     )
 
     env.macro(
         partial(
-            construct,
+            query_columns,
             instance=env.variables.graph,
         ),
-        name='construct',
+        name='query_columns',
     )
 
     env.macro(
         partial(
-            url,
-            graph=env.variables.graph,
+            query_many,
+            instance=env.variables.graph,
         ),
-        name='url',
+        name='query_many',
     )
 
-    env.filter(
-        partial(
-            url,
-            graph=env.variables.graph,
-        ), name='url',
-    )
+    resolver = Resolver(octiron=octiron)
 
-    env.filter(
-        partial(
-            label,
-            graph=env.variables.graph,
-        ),
-        name='label',
-    )
+    env.macro(resolver.url, name='url')
+    env.filter(resolver.url, name='url')
+    env.macro(resolver.urls, name='urls')
+    env.filter(resolver.urls, name='urls')
+    env.filter(resolver.label, name='label')
+    env.filter(resolver.labels, name='labels')
 
     env.macro(iri_to_url)
     env.macro(src_path_to_iri)
@@ -1 +1,2 @@
-from octadocs.octiron.octiron import Octiron
+from octadocs.octiron.ingestion import SourceFile
+from octadocs.octiron.octiron import InferenceProfile, Octiron
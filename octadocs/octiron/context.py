@@ -1,14 +1,75 @@
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Generic, NamedTuple, Tuple, TypeVar
+
 from deepmerge import always_merger
 from octadocs.types import Context
 
+ProcessedContext = TypeVar('ProcessedContext')
+
+# Context files contributing to a directory, with their modification times.
+ContextFingerprint = Tuple[Tuple[Path, float], ...]
+
+
+class CachedContext(NamedTuple):
+    """Context computed from a particular set of context files."""
+
+    fingerprint: ContextFingerprint
+    context: Context
+
 
 def merge(first: Context, second: Context) -> Context:
     """
     Merge two contexts into one.
 
-    Second context can override the first.
+    Second context can override the first. Neither of the arguments is
+    modified, which makes it safe to merge contexts that are cached.
     """
     return always_merger.merge(
-        base=first,
+        base=copy.deepcopy(first),
         nxt=second,
     )
+
+
+def hash_context(context: Context) -> str:
+    """Compute a hash of a context which does not depend on key order."""
+    serialized_context = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_context.encode('utf-8')).hexdigest()
+
+
+class ProcessedContextCache(Generic[ProcessedContext]):
+    """
+    Least recently used cache of processed contexts.
+
+    Processing a context is expensive, but the number of distinct merged
+    contexts is small: typically, one per directory. Thus, every distinct
+    context is processed once and shared by all documents using it.
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.processed_contexts: 'OrderedDict[str, ProcessedContext]' = (
+            OrderedDict()
+        )
+
+    def get(
+        self,
+        context_hash: str,
+        process: Callable[[], ProcessedContext],
+    ) -> ProcessedContext:
+        """Retrieve processed context by hash, processing it if necessary."""
+        processed_context = self.processed_contexts.get(context_hash)
+        if processed_context is not None:
+            self.processed_contexts.move_to_end(context_hash)
+            return processed_context
+
+        processed_context = process()
+        self.processed_contexts[context_hash] = processed_context
+        if len(self.processed_contexts) > self.max_size:
+            self.processed_contexts.popitem(last=False)
+
+        return processed_context
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from documented import DocumentedError
+from pyld import jsonld
+
+logger = logging.getLogger(__name__)
+
+# A document as returned by pyld document loaders.
+RemoteDocument = Dict[str, Any]   # type: ignore
+
+
+@dataclass
+class RemoteDocumentUnavailable(DocumentedError):
+    """
+    Remote JSON-LD document is not available offline.
+
+        URL: {self.url}
+
+    Octadocs does not access the network by default. Please download the
+    document and list it under `contexts` option of the plugin, like this:
+
+        plugins:
+          - octadocs:
+              contexts:
+                {self.url}: contexts/my-context.jsonld
+
+    or allow downloads with `offline: false`.
+    """
+
+    url: str
+
+
+def _file_name_by_url(url: str) -> str:
+    """Derive cache file name from document URL."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json'
+
+
+@dataclass
+class CachingDocumentLoader:
+    """
+    JSON-LD document loader which avoids the network whenever it can.
+
+    A remote document is looked up, in this order:
+
+      - in memory, so that each URL is resolved at most once per build;
+      - among bundled contexts, which are local copies of remote documents;
+      - in the on-disk cache, populated by previous builds;
+      - on the network, if it is not offline.
+    """
+
+    cache_directory: Optional[Path] = None
+    bundled_contexts: Mapping[str, Path] = field(default_factory=dict)
+    offline: bool = True
+    timeout: float = 10
+    documents: Dict[str, RemoteDocument] = field(default_factory=dict)
+
+    def configure(
+        self,
+        cache_directory: Optional[Path] = None,
+        bundled_contexts: Optional[Mapping[str, Path]] = None,
+        offline: bool = True,
+        timeout: float = 10,
+    ) -> None:
+        """Apply configuration for a new build."""
+        self.cache_directory = cache_directory
+        self.bundled_contexts = bundled_contexts or {}
+        self.offline = offline
+        self.timeout = timeout
+        self.documents = {}
+
+    @property
+    def settings(self) -> Dict[str, Any]:  # type: ignore
+        """Arguments of configure() to set up a loader like this one."""
+        return {
+            'cache_directory': self.cache_directory,
+            'bundled_contexts': dict(self.bundled_contexts),
+            'offline': self.offline,
+            'timeout': self.timeout,
+        }
+
+    def __call__(
+        self,
+        url: str,
+        options: Optional[Dict[str, Any]] = None,  # type: ignore
+    ) -> RemoteDocument:
+        """Load a remote document by URL."""
+        document = self.documents.get(url)
+        if document is None:
+            document = self._load(url, options)
+            self.documents[url] = document
+
+        return document
+
+    def _load(
+        self,
+        url: str,
+        options: Optional[Dict[str, Any]],  # type: ignore
+    ) -> RemoteDocument:
+        """Find the document in the bundle, on disk, or on the network."""
+        bundled_path = self.bundled_contexts.get(url)
+        if bundled_path is not None:
+            logger.info('Loading %s from %s', url, bundled_path)
+            return {
+                'contentType': 'application/ld+json',
+                'contextUrl': None,
+                'documentUrl': url,
+                'document': json.loads(bundled_path.read_text()),
+            }
+
+        cache_path = self._cache_path(url)
+        if cache_path is not None and cache_path.is_file():
+            logger.info('Loading %s from cache', url)
+            return json.loads(cache_path.read_text())
+
+        if self.offline:
+            raise RemoteDocumentUnavailable(url=url)
+
+        logger.info('Downloading %s', url)
+        document = self._network_loader(url, options or {})
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(document))
+
+        return document
+
+    def _cache_path(self, url: str) -> Optional[Path]:
+        """Path to the cached copy of a document, if cache is configured."""
+        if self.cache_directory is None:
+            return None
+
+        return self.cache_directory / 'contexts' / _file_name_by_url(url)
+
+    @property
+    def _network_loader(self) -> Callable[..., RemoteDocument]:
+        """Create the document loader which uses the network."""
+        return jsonld.requests_document_loader(timeout=self.timeout)
+
+
+document_loader = CachingDocumentLoader()
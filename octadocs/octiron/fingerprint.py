@@ -0,0 +1,73 @@
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Files are read in chunks of this size when hashing.
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """
+    Identity of a source file together with the context it was read in.
+
+    Modification time and size are only used to avoid hashing files which
+    have not been touched. A file is considered changed if its content, its
+    context, or its global URL differ: loaders store the URL in the graph.
+    """
+
+    modification_time: float
+    size: int
+    content_hash: str
+    context_hash: str
+    global_url: Optional[str] = None
+
+    def matches(self, other: 'FileFingerprint') -> bool:
+        """Decide whether the file would be imported in the same way."""
+        return (
+            self.content_hash == other.content_hash and
+            self.context_hash == other.context_hash and
+            self.global_url == other.global_url
+        )
+
+
+def hash_file(path: Path) -> str:
+    """Compute a hash of the file content."""
+    content_hash = hashlib.blake2b(digest_size=16)
+    with path.open('rb') as source_file:
+        for chunk in iter(lambda: source_file.read(CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def fingerprint_file(
+    path: Path,
+    context_hash: str,
+    previous: Optional[FileFingerprint] = None,
+    global_url: Optional[str] = None,
+) -> FileFingerprint:
+    """
+    Fingerprint a file, reusing the previous content hash if possible.
+
+    The content is only hashed if the modification time or size of the file
+    differ from the previous fingerprint.
+    """
+    file_stat = path.stat()
+
+    if previous is not None and (
+        previous.modification_time == file_stat.st_mtime and
+        previous.size == file_stat.st_size
+    ):
+        content_hash = previous.content_hash
+    else:
+        content_hash = hash_file(path)
+
+    return FileFingerprint(
+        modification_time=file_stat.st_mtime,
+        size=file_stat.st_size,
+        content_hash=content_hash,
+        context_hash=context_hash,
+        global_url=global_url,
+    )
@@ -0,0 +1,438 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Set, Type
+
+import rdflib
+from octadocs.octiron.owlrl_named_graph import (
+    INFERENCE,
+    OWLRLExtensionNamedGraph,
+    RDFSNamedGraph,
+    improved_datatypes,
+)
+from octadocs.types import Triple
+from rdflib import OWL, RDF, RDFS, XSD
+from rdflib.graph import ReadOnlyGraphAggregate
+
+logger = logging.getLogger(__name__)
+
+ERROR = rdflib.Namespace('http://www.daml.org/2002/03/agents/agent-ont#')
+
+# Terms of these namespaces are mentioned by too many triples to be useful
+# for finding the triples affected by a change.
+VOCABULARY_NAMESPACES = (str(RDF), str(RDFS), str(OWL), str(XSD))
+
+# OWL RL rules over these constructs are triggered by the construct itself and
+# may reach the changed triples via RDF lists. We process such triples on
+# every cycle of incremental closure.
+OWL_CONSTRUCT_PREDICATES = (
+    OWL.allValuesFrom,
+    OWL.someValuesFrom,
+    OWL.hasValue,
+    OWL.onProperty,
+    OWL.onClass,
+    OWL.maxCardinality,
+    OWL.maxQualifiedCardinality,
+    OWL.intersectionOf,
+    OWL.unionOf,
+    OWL.complementOf,
+    OWL.oneOf,
+    OWL.propertyChainAxiom,
+    OWL.hasKey,
+    OWL.inverseOf,
+    OWL.equivalentClass,
+    OWL.equivalentProperty,
+    OWL.disjointWith,
+    OWL.propertyDisjointWith,
+    OWL.sameAs,
+    OWL.differentFrom,
+    OWL.members,
+    OWL.distinctMembers,
+    OWL.sourceIndividual,
+    OWL.assertionProperty,
+    OWL.targetIndividual,
+    OWL.targetValue,
+    OWL.withRestrictions,
+    OWL.onDatatype,
+)
+
+# Rules over these schema triples conclude facts which share no term with the
+# schema triple except for its subject or object.
+SCHEMA_PREDICATES = (
+    RDFS.subClassOf,
+    RDFS.subPropertyOf,
+    RDFS.domain,
+    RDFS.range,
+)
+
+OWL_CONSTRUCT_CLASSES = (
+    OWL.TransitiveProperty,
+    OWL.FunctionalProperty,
+    OWL.InverseFunctionalProperty,
+    OWL.SymmetricProperty,
+    OWL.AsymmetricProperty,
+    OWL.IrreflexiveProperty,
+    OWL.AllDifferent,
+    OWL.AllDisjointClasses,
+    OWL.AllDisjointProperties,
+    OWL.NegativePropertyAssertion,
+)
+
+
+@dataclass
+class InferenceDelta:
+    """Explicit triples added to or removed from the graph since inference."""
+
+    added: Set[Triple] = field(default_factory=set)
+    removed: Set[Triple] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        """Nothing has changed."""
+        return not self.added and not self.removed
+
+
+def is_vocabulary_term(term: rdflib.term.Node) -> bool:
+    """Check if the term belongs to RDF, RDFS, OWL or XSD."""
+    return isinstance(term, rdflib.URIRef) and term.startswith(
+        VOCABULARY_NAMESPACES,
+    )
+
+
+def is_owl_construct(triple: Triple) -> bool:
+    """Check if the triple is part of an OWL construct or an RDF list."""
+    _subject, predicate, object_ = triple
+
+    return (
+        predicate in OWL_CONSTRUCT_PREDICATES or
+        predicate in {RDF.first, RDF.rest} or
+        (predicate == RDF.type and object_ in OWL_CONSTRUCT_CLASSES)
+    )
+
+
+def is_untraceable(triple: Triple) -> bool:
+    """
+    Check if consequences of the triple cannot be found by its terms.
+
+    Vocabulary terms are not followed, thus `ex:title rdfs:subPropertyOf
+    rdfs:label` shares no traced term with `ex:a rdfs:label "A"`, which it
+    implies.
+    """
+    subject, predicate, object_ = triple
+
+    return is_owl_construct(triple) or (
+        predicate in SCHEMA_PREDICATES and (
+            is_vocabulary_term(subject) or is_vocabulary_term(object_)
+        )
+    )
+
+
+def abandons_vocabulary_predicate(
+    graph: rdflib.Graph,
+    triples: Iterable[Triple],
+) -> bool:
+    """
+    Check if a vocabulary term used as predicate by the triples is now unused.
+
+    Closure describes the vocabulary terms used as predicates: RDFS infers
+    `rdfs:label rdf:type rdf:Property`, for instance. Such descriptions have
+    to go if the term is not used as a predicate anymore, even though it is
+    still mentioned elsewhere.
+    """
+    predicates = {
+        predicate
+        for _subject, predicate, _object in triples
+        if is_vocabulary_term(predicate)
+    }
+
+    return any(
+        next(iter(graph.triples((None, predicate, None))), None) is None
+        for predicate in predicates
+    )
+
+
+def terms_of(triples: Iterable[Triple]) -> Set[rdflib.term.Node]:
+    """Collect terms of given triples which are not vocabulary terms."""
+    return {
+        term
+        for triple in triples
+        for term in triple
+        if not is_vocabulary_term(term)
+    }
+
+
+def triples_mentioning(
+    graph: rdflib.Graph,
+    terms: Iterable[rdflib.term.Node],
+) -> Iterator[Triple]:
+    """Find triples which mention any of the terms in any position."""
+    for term in terms:
+        yield from graph.triples((term, None, None))
+        yield from graph.triples((None, term, None))
+        yield from graph.triples((None, None, term))
+
+
+def owl_constructs(graph: rdflib.Graph) -> Iterator[Triple]:
+    """Find all triples describing OWL constructs."""
+    for predicate in OWL_CONSTRUCT_PREDICATES:
+        yield from graph.triples((None, predicate, None))
+
+    for owl_class in OWL_CONSTRUCT_CLASSES:
+        yield from graph.triples((None, RDF.type, owl_class))
+
+
+def is_stated(graph: rdflib.ConjunctiveGraph, triple: Triple) -> bool:
+    """Check if a triple is present in the graph and was not inferred."""
+    return any(
+        context.identifier != INFERENCE
+        for context in graph.contexts(triple)
+    )
+
+
+def over_delete(
+    inference_graph: rdflib.Graph,
+    removed: Set[Triple],
+) -> Optional[Set[Triple]]:
+    """
+    Remove inferred triples which might have been derived from removed ones.
+
+    This is the first step of DRed (Delete and Rederive) algorithm. Inferred
+    triples sharing a term with a removed triple lose their support, and so
+    on, transitively. Some of them are still supported by other triples, and
+    the closure will derive them again.
+
+    Returns None if consequences of the removed triples cannot be reliably
+    traced, as for OWL constructs; in this case, full closure is necessary.
+    """
+    if any(map(is_untraceable, removed)):
+        return None
+
+    deleted: Set[Triple] = set()
+    visited_terms: Set[rdflib.term.Node] = set()
+    terms = terms_of(removed)
+
+    while terms:
+        visited_terms.update(terms)
+
+        candidates = set(triples_mentioning(inference_graph, terms)) - deleted
+        deleted.update(candidates)
+
+        terms = terms_of(candidates) - visited_terms
+
+    for triple in deleted:
+        inference_graph.remove(triple)
+
+    return deleted
+
+
+class StatedGraphView(ReadOnlyGraphAggregate):
+    """
+    View of a graph without its inferred triples.
+
+    Triples added to the view are kept aside in a pending graph.
+    """
+
+    def __init__(self, graph: rdflib.ConjunctiveGraph) -> None:
+        """Aggregate all named graphs except the inference graph."""
+        self.pending_graph = rdflib.Graph()
+        super().__init__([
+            *(
+                named_graph
+                for named_graph in graph.contexts()
+                if named_graph.identifier != INFERENCE
+            ),
+            self.pending_graph,
+        ])
+
+    def add(self, triple: Triple) -> None:
+        """Store the triple in the pending graph."""
+        self.pending_graph.add(triple)
+
+
+class IncrementalClosure:
+    """
+    Mixin for closure of a change to a graph which was already closed.
+
+    Instead of every triple of the graph, on every cycle the rules are applied
+    to the triples affected by the change: the changed triples themselves,
+    triples sharing a term with them, and OWL constructs.
+    """
+
+    def incremental_closure(
+        self,
+        changed: Set[Triple],
+        previous_one_time_triples: Set[Triple],
+    ) -> None:
+        """Derive consequences of the changed triples."""
+        self.pre_process()
+
+        # One-time rules expect to see the graph before closure, and misbehave
+        # if shown the previous inferences.
+        closed_graph = self.graph
+        stated_graph = StatedGraphView(closed_graph)
+        self.graph = stated_graph
+        try:
+            self.one_time_rules()
+        finally:
+            self.graph = closed_graph
+
+        # Some rules add triples to the graph directly, bypassing the store.
+        self.one_time_triples.update(stated_graph.pending_graph)
+
+        # Some one-time rules depend on the graph as a whole; for instance,
+        # datatype disjointness is only inferred for datatypes in use.
+        obsolete_triples = previous_one_time_triples - self.one_time_triples
+        for triple in obsolete_triples:
+            self.graph.remove((*triple, INFERENCE))
+
+        for triple in self.one_time_triples:
+            self.graph.add(triple)
+
+        changed = {
+            *changed,
+            *obsolete_triples,
+            *(self.one_time_triples - previous_one_time_triples),
+        }
+        candidates = self._affected_triples(changed)
+
+        cycle_num = 0
+        while candidates:
+            cycle_num += 1
+
+            self.empty_stored_triples()
+            for triple in candidates:
+                self.rules(triple, self._rule_cycle(triple, cycle_num))
+
+            new_triples = set(self.added_triples)
+            self.flush_stored_triples()
+
+            candidates = self._affected_triples(
+                new_triples,
+            ) if new_triples else set()
+
+        logger.info('Inference: incremental closure took %s cycles.', cycle_num)
+
+        self.post_process()
+        self.flush_stored_triples()
+
+        self._remove_stated_inferences(changed)
+        self._remove_unused_vocabulary(changed)
+
+        # Same as owlrl.Closure.Core.closure() does.
+        for message in self.error_messages:
+            message_node = rdflib.BNode()
+            self.graph.add((message_node, RDF.type, ERROR.ErrorMessage))
+            self.graph.add(
+                (message_node, ERROR.error, rdflib.Literal(message)),
+            )
+
+    def _remove_stated_inferences(self, changed: Set[Triple]) -> None:
+        """
+        Remove inferences which have been stated since.
+
+        Full closure never infers a stated triple, so the inference graph
+        must not keep a copy of a triple which was inferred before it was
+        stated.
+        """
+        for triple in changed:
+            if triple in self.one_time_triples:
+                continue
+
+            if is_stated(self.graph, triple):
+                self.graph.remove((*triple, INFERENCE))
+
+    def _remove_unused_vocabulary(self, changed: Set[Triple]) -> None:
+        """
+        Remove inferences about vocabulary terms which are no longer used.
+
+        Closure describes every term used in the graph: OWL RL infers
+        `v owl:sameAs v`, RDFS infers `v rdf:type rdf:Property`, and so on.
+        For vocabulary terms, such triples are not removed by over_delete().
+        """
+        terms = {
+            term
+            for triple in changed
+            for term in triple
+            if is_vocabulary_term(term)
+        }
+
+        while terms:
+            term = terms.pop()
+            about_term = set(self.graph.triples((term, None, None)))
+
+            is_used = any(
+                triple[0] != term
+                for triple in triples_mentioning(self.graph, [term])
+            ) or any(
+                triple in self.one_time_triples or is_stated(self.graph, triple)
+                for triple in about_term
+            )
+
+            if is_used:
+                continue
+
+            for triple in about_term:
+                self.graph.remove((*triple, INFERENCE))
+                terms.update(
+                    mentioned_term
+                    for mentioned_term in triple
+                    if is_vocabulary_term(mentioned_term)
+                    and mentioned_term != term
+                )
+
+    def _rule_cycle(self, triple: Triple, cycle_num: int) -> int:
+        """
+        Choose cycle number to apply the rules to a triple with.
+
+        Some rules only fire on the first cycle, which full closure runs over
+        stated triples and one-time inferences. Other triples are treated as
+        if they were found on a later cycle.
+        """
+        if cycle_num > 1:
+            return cycle_num
+
+        if triple in self.one_time_triples or is_stated(self.graph, triple):
+            return 1
+
+        return 2
+
+    def _affected_triples(self, changed: Set[Triple]) -> Set[Triple]:
+        """Find triples which rules have to be applied to."""
+        return {
+            *(triple for triple in changed if triple in self.graph),
+            *triples_mentioning(self.graph, terms_of(changed)),
+            *owl_constructs(self.graph),
+        }
+
+
+class IncrementalOWLRLExtension(IncrementalClosure, OWLRLExtensionNamedGraph):
+    """OWL RL closure which can be updated incrementally."""
+
+
+class IncrementalRDFSClosure(IncrementalClosure, RDFSNamedGraph):
+    """RDFS closure which can be updated incrementally."""
+
+
+def close_incrementally(
+    graph: rdflib.ConjunctiveGraph,
+    changed: Set[Triple],
+    previous_one_time_triples: Set[Triple],
+    closure_class: Type[IncrementalClosure] = IncrementalOWLRLExtension,
+) -> Set[Triple]:
+    """
+    Expand a closed graph with consequences of the changed triples.
+
+    Returns triples inferred by one-time rules.
+    """
+    closure = closure_class(  # type: ignore
+        graph,
+        axioms=False,
+        daxioms=False,
+    )
+
+    with improved_datatypes():
+        closure.incremental_closure(
+            changed=changed,
+            previous_one_time_triples=previous_one_time_triples,
+        )
+
+    return closure.one_time_triples
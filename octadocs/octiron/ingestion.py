@@ -0,0 +1,182 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import rdflib
+from octadocs.instrumentation import instrumentation
+from octadocs.octiron.document_loader import document_loader
+from octadocs.octiron.fingerprint import FileFingerprint
+from octadocs.octiron.persistent_cache import StoredTriple
+from octadocs.octiron.plugins import Loader
+from octadocs.types import Context
+
+logger = logging.getLogger(__name__)
+
+
+class SourceFile(NamedTuple):
+    """A file to import into the graph."""
+
+    path: Path
+    local_iri: rdflib.URIRef
+    global_url: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ImportTask:
+    """Everything a loader needs to convert a file into triples."""
+
+    path: Path
+    local_iri: rdflib.URIRef
+    global_url: Optional[str]
+    loader_class: Type[Loader]
+    context: Context
+    fingerprint: FileFingerprint
+
+    def load(self) -> List[StoredTriple]:
+        """Run the loader and collect the triples it produces."""
+        loader_instance = self.loader_class(
+            path=self.path,
+            context=self.context,
+            local_iri=self.local_iri,
+            global_url=self.global_url,
+        )
+
+        return [tuple(triple) for triple in loader_instance.stream()]
+
+
+# Triples loaded from every file of a batch, in task order.
+LoadedBatch = List[Tuple[ImportTask, List[StoredTriple]]]
+
+
+@dataclass(frozen=True)
+class WorkerBatch:
+    """
+    Files for a worker process to load in one go.
+
+    Tasks are sent without their contexts: the merged context of every
+    directory is sent once per batch instead. The JSON-LD document loader of
+    the worker is set up like the one of the main process, which workers
+    started with `spawn` rather than `fork` would not otherwise inherit.
+    """
+
+    tasks: List[ImportTask]
+    context_per_directory: Dict[Path, Context]
+    document_loader_settings: Dict[str, Any]  # type: ignore
+
+    @classmethod
+    def from_tasks(cls, tasks: List[ImportTask]) -> 'WorkerBatch':
+        """Pack the tasks, sharing their contexts per directory."""
+        return cls(
+            tasks=[replace(task, context={}) for task in tasks],
+            context_per_directory={
+                task.path.parent: task.context
+                for task in tasks
+            },
+            document_loader_settings=document_loader.settings,
+        )
+
+    def load(self) -> List[Optional[List[StoredTriple]]]:
+        """
+        Load every file of the batch in a worker process.
+
+        Loader errors are not always picklable, so instead of sending them
+        back we return None for the file and let the main process reproduce
+        the error.
+        """
+        if document_loader.settings != self.document_loader_settings:
+            document_loader.configure(**self.document_loader_settings)
+
+        return [
+            self._load_task(task)
+            for task in self.tasks
+        ]
+
+    def _load_task(self, task: ImportTask) -> Optional[List[StoredTriple]]:
+        context = self.context_per_directory[task.path.parent]
+        try:
+            return replace(task, context=context).load()
+        except Exception:  # noqa: B902
+            return None
+
+
+def _load_in_worker(batch: WorkerBatch) -> List[Optional[List[StoredTriple]]]:
+    """Entry point of a worker process."""
+    return batch.load()
+
+
+def count_loaded(task: ImportTask, triples: List[StoredTriple]) -> None:
+    """Count the file and its triples per loader class."""
+    instrumentation.count(f'files loaded via {task.loader_class.__name__}')
+    instrumentation.count('triples loaded', len(triples))
+
+
+def load_in_sequence(tasks: List[ImportTask]) -> Iterator[LoadedBatch]:
+    """Load files in the main process, one batch per file."""
+    for task in tasks:
+        loader_name = task.loader_class.__name__
+        with instrumentation.span(loader_name, 'load', path=str(task.path)):
+            triples = task.load()
+
+        count_loaded(task, triples)
+        yield [(task, triples)]
+
+
+def load_in_parallel(
+    tasks: List[ImportTask],
+    workers: int,
+) -> Iterator[LoadedBatch]:
+    """
+    Load files in a pool of worker processes, preserving task order.
+
+    Neighbouring files, which usually share their directory, are sent to
+    a worker together, to keep inter-process communication overhead low.
+    The time measured per batch is the time the main process waits for it
+    rather than the time it took to load.
+    """
+    batch_size = max(1, len(tasks) // (workers * 4))
+    task_batches = [
+        tasks[batch_start:batch_start + batch_size]
+        for batch_start in range(0, len(tasks), batch_size)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _load_in_worker,
+            map(WorkerBatch.from_tasks, task_batches),
+        )
+
+        for task_batch in task_batches:
+            with instrumentation.span(
+                'worker batch',
+                'load',
+                files=len(task_batch),
+            ):
+                batch_triples = next(results)
+
+            yield [
+                (task, _retry_if_failed(task, triples))
+                for task, triples in zip(task_batch, batch_triples)
+            ]
+
+
+def _retry_if_failed(
+    task: ImportTask,
+    triples: Optional[List[StoredTriple]],
+) -> List[StoredTriple]:
+    if triples is None:
+        logger.info('Retrying %s in the main process', task.path)
+        triples = task.load()
+
+    count_loaded(task, triples)
+    return triples
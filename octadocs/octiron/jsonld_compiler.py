@@ -0,0 +1,464 @@
+"""
+Convert simple JSON-LD documents to triples without pyld and rdflib-jsonld.
+
+Front matter of a typical page only uses a small subset of JSON-LD: plain
+keys, `@id`, `@type`, type coercion from the context, lists and nested
+objects. For that subset, we can skip the expand → flatten → serialize →
+parse round trip and produce triples directly. The result, including blank
+node labels, is the same as the round trip would produce.
+
+Anything beyond the subset raises `UnsupportedDocument`, and the caller is
+expected to fall back to the complete implementation.
+"""
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Union
+
+import rdflib
+from octadocs.types import Context, Triple
+from pyld import jsonld
+from rdflib_jsonld.context import Context as ParserContext
+
+KEYWORD_PATTERN = re.compile(r'^@[a-zA-Z]+$')
+ABSOLUTE_IRI_PATTERN = re.compile(r'^([A-Za-z][A-Za-z0-9+-.]*|_):[^\s]*$')
+PREFIX_IRI_PATTERN = re.compile(r'.*[:/\?#\[\]@]$')
+IRI_LIKE_TERM_PATTERN = re.compile(r'.*((:[^:])|/)')
+
+SUPPORTED_TERM_DEFINITION_KEYS = frozenset({'@id', '@type'})
+SUPPORTED_NODE_KEYWORDS = frozenset({'@id', '@type'})
+SCALAR_TYPES = (bool, int, float)
+
+Value = Union[rdflib.URIRef, rdflib.Literal, 'ExpandedNode']
+
+# rdflib-jsonld normalizes every IRI it parses; we do the same to produce
+# identical results.
+PARSER_CONTEXT = ParserContext()
+
+
+class UnsupportedDocument(Exception):
+    """Document uses JSON-LD features the compiler does not support."""
+
+
+@dataclass(frozen=True)
+class TermDefinition:
+    """Definition of a term in a compiled context."""
+
+    iri: str
+    type_mapping: Optional[str] = None
+    is_prefix: bool = False
+
+
+@dataclass(frozen=True)
+class CompiledContext:
+    """JSON-LD context converted to a lookup table of terms."""
+
+    terms: Mapping[str, TermDefinition]
+    vocab: Optional[str] = None
+    base: Optional[str] = None
+    has_base: bool = False
+
+
+@dataclass
+class ExpandedNode:
+    """Node object with all the keys and values expanded."""
+
+    iri: Optional[str]
+    types: List[str]
+    properties: Dict[str, List[Value]]
+
+
+def is_absolute_iri(iri: str) -> bool:
+    """Check if the string is an absolute IRI, the way pyld does."""
+    return ABSOLUTE_IRI_PATTERN.match(iri) is not None
+
+
+@lru_cache(maxsize=4096)
+def as_resource(iri: str) -> rdflib.URIRef:
+    """Normalize IRI of a subject or an object."""
+    return rdflib.URIRef(PARSER_CONTEXT.resolve(iri))
+
+
+@lru_cache(maxsize=4096)
+def as_predicate(iri: str) -> rdflib.URIRef:
+    """Normalize IRI of a predicate or a datatype."""
+    return rdflib.URIRef(PARSER_CONTEXT.expand(iri))
+
+
+def _require_absolute_iri(iri: str) -> str:
+    """Only absolute IRIs, and not blank nodes, are supported."""
+    if not is_absolute_iri(iri) or iri.startswith('_:'):
+        raise UnsupportedDocument()
+
+    return iri
+
+
+@dataclass
+class _ContextCompiler:
+    """Create term definitions, resolving dependencies between terms."""
+
+    local_context: Dict[str, Any]  # type: ignore
+    vocab: Optional[str]
+    terms: Dict[str, TermDefinition]
+    defining: Set[str]
+
+    def define_all(self) -> None:
+        """Define every term of the local context."""
+        for term in self.local_context:
+            self.define(term)
+
+    def define(self, term: str) -> None:
+        """Create definition of a term, unless it already exists."""
+        if term in self.terms:
+            return
+
+        if term in self.defining or not term or term.startswith('@'):
+            raise UnsupportedDocument()
+
+        self.defining.add(term)
+
+        raw_definition = self.local_context[term]
+        is_simple = isinstance(raw_definition, str)
+        if is_simple:
+            raw_definition = {'@id': raw_definition}
+
+        if not isinstance(raw_definition, dict) or (
+            set(raw_definition) - SUPPORTED_TERM_DEFINITION_KEYS
+        ):
+            raise UnsupportedDocument()
+
+        iri = None
+        is_prefix = False
+        raw_iri = raw_definition.get('@id', term)
+        if raw_iri != term:
+            if not isinstance(raw_iri, str) or raw_iri.startswith('@'):
+                raise UnsupportedDocument()
+
+            # Terms which look like IRIs must expand to their own definition;
+            # we do not bother checking that and leave it to pyld.
+            if IRI_LIKE_TERM_PATTERN.match(term):
+                raise UnsupportedDocument()
+
+            iri = _require_absolute_iri(self.expand(raw_iri))
+            is_prefix = (
+                is_simple and
+                ':' not in term and
+                PREFIX_IRI_PATTERN.match(iri) is not None
+            )
+
+        if iri is None:
+            iri = self._iri_by_term_name(term)
+
+        self.terms[term] = TermDefinition(
+            iri=iri,
+            type_mapping=self._type_mapping(raw_definition.get('@type')),
+            is_prefix=is_prefix,
+        )
+
+    def expand(self, iri: str) -> str:
+        """Expand an IRI used in the context, defining dependencies."""
+        if KEYWORD_PATTERN.match(iri):
+            raise UnsupportedDocument()
+
+        if iri in self.local_context:
+            self.define(iri)
+            return self.terms[iri].iri
+
+        prefix, colon, suffix = iri.partition(':')
+        if colon and prefix:
+            if prefix == '_':
+                raise UnsupportedDocument()
+
+            if suffix.startswith('//'):
+                return iri
+
+            if prefix in self.local_context:
+                self.define(prefix)
+
+            prefix_definition = self.terms.get(prefix)
+            if prefix_definition is not None and prefix_definition.is_prefix:
+                return prefix_definition.iri + suffix
+
+            if is_absolute_iri(iri):
+                return iri
+
+        if self.vocab is not None:
+            return self.vocab + iri
+
+        raise UnsupportedDocument()
+
+    def _iri_by_term_name(self, term: str) -> str:
+        """Derive IRI of a term which does not specify one."""
+        prefix, colon, suffix = term.partition(':')
+        if colon and prefix:
+            if prefix in self.local_context:
+                self.define(prefix)
+
+            prefix_definition = self.terms.get(prefix)
+            if prefix_definition is not None:
+                return prefix_definition.iri + suffix
+
+            return _require_absolute_iri(term)
+
+        if self.vocab is None:
+            raise UnsupportedDocument()
+
+        return self.vocab + term
+
+    def _type_mapping(self, type_mapping: Any) -> Optional[str]:  # type: ignore
+        """Validate and expand @type of a term definition."""
+        if type_mapping is None or type_mapping in {'@id', '@vocab'}:
+            return type_mapping
+
+        if not isinstance(type_mapping, str) or type_mapping.startswith('@'):
+            raise UnsupportedDocument()
+
+        return _require_absolute_iri(self.expand(type_mapping))
+
+
+def compile_context(context: Context) -> CompiledContext:
+    """Convert a JSON-LD context into a lookup table of terms."""
+    if not isinstance(context, dict):
+        raise UnsupportedDocument()
+
+    local_context = {
+        str(term): definition
+        for term, definition in context.items()
+    }
+
+    vocab = local_context.pop('@vocab', None)
+    has_base = '@base' in local_context
+    base = local_context.pop('@base', None)
+
+    for keyword_value in (vocab, base):
+        if keyword_value is not None and not (
+            isinstance(keyword_value, str) and is_absolute_iri(keyword_value)
+        ):
+            raise UnsupportedDocument()
+
+    if has_base and base is None:
+        raise UnsupportedDocument()
+
+    compiler = _ContextCompiler(
+        local_context=local_context,
+        vocab=str(vocab) if vocab is not None else None,
+        terms={},
+        defining=set(),
+    )
+    compiler.define_all()
+
+    return CompiledContext(
+        terms=compiler.terms,
+        vocab=compiler.vocab,
+        base=str(base) if base is not None else None,
+        has_base=has_base,
+    )
+
+
+@dataclass
+class _DocumentCompiler:
+    """Expand a document against a compiled context and emit triples."""
+
+    context: CompiledContext
+    base: str
+    blank_node_count: int = 0
+
+    def expand_iri(  # type: ignore
+        self,
+        iri: Any,
+        vocab: bool,
+        document_relative: bool = True,
+    ) -> str:
+        """Expand IRI from the document to an absolute IRI."""
+        if not isinstance(iri, str) or KEYWORD_PATTERN.match(iri):
+            raise UnsupportedDocument()
+
+        terms = self.context.terms
+        if vocab and iri in terms:
+            return terms[iri].iri
+
+        prefix, colon, suffix = iri.partition(':')
+        if colon and prefix:
+            if prefix == '_':
+                raise UnsupportedDocument()
+
+            if suffix.startswith('//'):
+                return iri
+
+            prefix_definition = terms.get(prefix)
+            if prefix_definition is not None and prefix_definition.is_prefix:
+                return prefix_definition.iri + suffix
+
+            if is_absolute_iri(iri):
+                return iri
+
+        if vocab and self.context.vocab is not None:
+            return self.context.vocab + iri
+
+        if not document_relative:
+            raise UnsupportedDocument()
+
+        base = self.base
+        if self.context.has_base:
+            base = jsonld.prepend_base(base, self.context.base)
+
+        return _require_absolute_iri(jsonld.prepend_base(base, iri))
+
+    def expand_property(self, key: str) -> str:
+        """
+        Expand a property key to an absolute IRI.
+
+        Keys are never resolved against the base IRI, and pyld silently drops
+        those which do not expand to an absolute IRI. Such documents are left
+        to pyld.
+        """
+        return _require_absolute_iri(
+            self.expand_iri(key, vocab=True, document_relative=False),
+        )
+
+    def expand_node(self, node: Dict[str, Any]) -> ExpandedNode:  # type: ignore
+        """Expand keys and values of a node object."""
+        for key in node.keys():
+            if not isinstance(key, str) or (
+                key.startswith('@') and key not in SUPPORTED_NODE_KEYWORDS
+            ):
+                raise UnsupportedDocument()
+
+        iri = None
+        if '@id' in node:
+            iri = self.expand_iri(node['@id'], vocab=False)
+
+        raw_types = node.get('@type', [])
+        if not isinstance(raw_types, list):
+            raw_types = [raw_types]
+
+        expanded_node = ExpandedNode(
+            iri=iri,
+            types=[
+                self.expand_iri(raw_type, vocab=True)
+                for raw_type in raw_types
+            ],
+            properties={},
+        )
+
+        for key, raw_value in sorted(node.items()):
+            if key in SUPPORTED_NODE_KEYWORDS:
+                continue
+
+            expanded_node.properties.setdefault(
+                self.expand_property(key),
+                [],
+            ).extend(self.expand_values(key, raw_value))
+
+        return expanded_node
+
+    def expand_values(  # type: ignore
+        self,
+        key: str,
+        raw_value: Any,
+    ) -> Iterator[Value]:
+        """Expand value, or values, of a property."""
+        if not isinstance(raw_value, list):
+            raw_value = [raw_value]
+
+        for raw_item in raw_value:
+            if raw_item is None:
+                continue
+
+            elif isinstance(raw_item, dict):
+                yield self.expand_node(raw_item)
+
+            else:
+                yield self.expand_scalar(key, raw_item)
+
+    def expand_scalar(  # type: ignore
+        self,
+        key: str,
+        raw_value: Any,
+    ) -> Union[rdflib.URIRef, rdflib.Literal]:
+        """Expand a value which is neither a list nor an object."""
+        term_definition = self.context.terms.get(key)
+        type_mapping = term_definition and term_definition.type_mapping
+
+        if isinstance(raw_value, str):
+            if type_mapping == '@id':
+                return as_resource(self.expand_iri(raw_value, vocab=False))
+
+            elif type_mapping == '@vocab':
+                return as_resource(self.expand_iri(raw_value, vocab=True))
+
+            elif type_mapping is not None:
+                return rdflib.Literal(
+                    raw_value,
+                    datatype=as_predicate(type_mapping),
+                )
+
+            return rdflib.Literal(raw_value)
+
+        if type_mapping is not None or not isinstance(raw_value, SCALAR_TYPES):
+            raise UnsupportedDocument()
+
+        if isinstance(raw_value, float) and not math.isfinite(raw_value):
+            raise UnsupportedDocument()
+
+        return rdflib.Literal(raw_value)
+
+    def emit(
+        self,
+        subject: rdflib.term.Node,
+        node: ExpandedNode,
+    ) -> Iterator[Triple]:
+        """
+        Convert an expanded node into triples.
+
+        Blank nodes are numbered in the same order as JSON-LD flattening
+        does: depth first, with properties sorted by their IRIs.
+        """
+        for node_type in node.types:
+            yield Triple(subject, rdflib.RDF.type, as_resource(node_type))
+
+        for predicate, node_values in sorted(node.properties.items()):
+            for node_value in node_values:
+                if isinstance(node_value, ExpandedNode):
+                    nested_subject = self.identify(node_value)
+                    yield Triple(
+                        subject,
+                        as_predicate(predicate),
+                        nested_subject,
+                    )
+                    yield from self.emit(nested_subject, node_value)
+
+                else:
+                    yield Triple(
+                        subject,
+                        as_predicate(predicate),
+                        node_value,
+                    )
+
+    def identify(self, node: ExpandedNode) -> rdflib.term.Node:
+        """Get IRI of a node, or issue a blank node for it."""
+        if node.iri is not None:
+            return as_resource(node.iri)
+
+        blank_node = rdflib.BNode(f'b{self.blank_node_count}')
+        self.blank_node_count += 1
+        return blank_node
+
+
+def compile_document(
+    document: Dict[str, Any],  # type: ignore
+    context: CompiledContext,
+    base: str,
+) -> List[Triple]:
+    """Convert a JSON-LD document with the given context into triples."""
+    compiler = _DocumentCompiler(context=context, base=base)
+    expanded_node = compiler.expand_node(document)
+
+    if expanded_node.iri is None:
+        raise UnsupportedDocument()
+
+    return list(compiler.emit(
+        subject=compiler.identify(expanded_node),
+        node=expanded_node,
+    ))
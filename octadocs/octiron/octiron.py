@@ -3,27 +3,65 @@ import re
 import sys
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from functools import reduce
+from functools import partial, reduce
+from itertools import chain, starmap
 from pathlib import Path
 from types import MappingProxyType
-from typing import Dict, Iterable, Optional, Type
+from typing import Dict, Iterable, List, Optional, Set, Type
 
-import owlrl
 import rdflib
 from octadocs.conversions import triples_to_quads
-from octadocs.octiron.context import merge
+from octadocs.instrumentation import instrumentation
+from octadocs.octiron.context import (
+    CachedContext,
+    ContextFingerprint,
+    hash_context,
+    merge,
+)
 from octadocs.octiron.context_loaders import (
     context_from_json,
     context_from_yaml,
 )
-from octadocs.octiron.owlrl_named_graph import OWLRLExtensionNamedGraph
+from octadocs.octiron.fingerprint import FileFingerprint, fingerprint_file
+from octadocs.octiron.ingestion import (
+    ImportTask,
+    LoadedBatch,
+    SourceFile,
+    load_in_parallel,
+    load_in_sequence,
+)
+from octadocs.octiron.incremental_inference import (
+    IncrementalOWLRLExtension,
+    IncrementalRDFSClosure,
+    InferenceDelta,
+    abandons_vocabulary_predicate,
+    close_incrementally,
+    is_stated,
+    over_delete,
+)
+from octadocs.octiron.owlrl_named_graph import (
+    INFERENCE,
+    improved_datatypes,
+    inference_view,
+)
+from octadocs.octiron.persistent_cache import PersistentCache
 from octadocs.octiron.plugins import (
     Loader,
     MarkdownLoader,
     TurtleLoader,
     YAMLLoader,
 )
-from octadocs.types import DEFAULT_CONTEXT, DEFAULT_NAMESPACES, OCTA, Context
+from octadocs.octiron.sparql_rules import SparqlRuleEngine
+from octadocs.query import QueryResult, QueryResultCache, query
+from octadocs.repeated_queries import repeated_query_detector
+from octadocs.types import (
+    DEFAULT_CONTEXT,
+    DEFAULT_NAMESPACES,
+    OCTA,
+    Context,
+    Quad,
+    Triple,
+)
 from urlpath import URL
 
 if sys.version_info >= (3, 8):
@@ -47,16 +85,100 @@ class CacheStatus(Enum):
     EXPIRED = auto()
 
 
+class InferenceProfile(Enum):
+    """What to infer after the graph was updated."""
+
+    NONE = 'none'
+    RDFS = 'rdfs'
+    OWL_RL = 'owlrl'
+    CUSTOM = 'custom'
+
+
+# Closure applied before custom inference rules, per profile.
+CLOSURE_PER_PROFILE = MappingProxyType({
+    InferenceProfile.RDFS: IncrementalRDFSClosure,
+    InferenceProfile.OWL_RL: IncrementalOWLRLExtension,
+})
+
+
 @dataclass
 class Octiron:   # noqa: WPS214
     """Convert a lump of goo and data into a semantic graph."""
 
     root_directory: Path
     custom_namespaces: Dict[str, rdflib.Namespace] = field(default_factory=dict)
-    last_modified_timestamp_per_file: Dict[rdflib.URIRef, float] = field(
+    fingerprint_per_file: Dict[rdflib.URIRef, FileFingerprint] = field(
+        default_factory=dict,
+        metadata={
+            '__doc__': 'Fingerprint of every file imported into the graph.',
+        },
+    )
+    cache_directory: Optional[Path] = field(
+        default=None,
+        metadata={
+            '__doc__': 'Directory to persist imported graphs in between runs.',
+        },
+    )
+    context_per_directory: Dict[Path, CachedContext] = field(
+        default_factory=dict,
+        metadata={
+            '__doc__': 'Merged context of every directory seen so far.',
+        },
+    )
+    context_per_file: Dict[Path, CachedContext] = field(
         default_factory=dict,
         metadata={
-            '__doc__': 'Time when every file was last imported into the graph.',
+            '__doc__': 'Parsed content of every context file seen so far.',
+        },
+    )
+    context_hash_per_fingerprint: Dict[ContextFingerprint, str] = field(
+        default_factory=dict,
+        metadata={
+            '__doc__': 'Hash of every distinct merged context seen so far.',
+        },
+    )
+    context_fingerprint_per_directory: Optional[
+        Dict[Path, ContextFingerprint]
+    ] = field(
+        default=None,
+        metadata={
+            '__doc__': (
+                'Context files of every directory seen during the current ' +
+                'update; None outside of an update.'
+            ),
+        },
+    )
+    inference_profile: InferenceProfile = field(
+        default=InferenceProfile.OWL_RL,
+        metadata={
+            '__doc__': 'Semantics to build the inference graph with.',
+        },
+    )
+    incremental_inference: bool = field(
+        default=False,
+        metadata={
+            '__doc__': 'Only infer consequences of changes since last time.',
+        },
+    )
+    inference_delta: Optional[InferenceDelta] = field(
+        default=None,
+        metadata={
+            '__doc__': (
+                'Changes since last inference; None means full inference ' +
+                'is required.'
+            ),
+        },
+    )
+    generation: int = field(
+        default=0,
+        metadata={
+            '__doc__': 'Number which grows every time the graph is changed.',
+        },
+    )
+    one_time_inferences: Set[Triple] = field(
+        default_factory=set,
+        metadata={
+            '__doc__': 'Triples inferred by one-time closure rules last time.',
         },
     )
 
@@ -82,76 +204,294 @@ class Octiron:   # noqa: WPS214
 
         return conjunctive_graph
 
+    @cached_property
+    def query_results(self) -> QueryResultCache:
+        """Results of queries against current generation of the graph."""
+        return QueryResultCache()
+
+    @cached_property
+    def custom_rules(self) -> SparqlRuleEngine:
+        """Inference rules written in SPARQL by the user."""
+        return SparqlRuleEngine(
+            directory=self.root_directory.parent / 'inference',
+        )
+
+    @cached_property
+    def persistent_cache(self) -> Optional[PersistentCache]:
+        """Load the on-disk cache of imported graphs, if it is configured."""
+        if self.cache_directory is None:
+            return None
+
+        return PersistentCache.load(self.cache_directory)
+
     def get_context_per_directory(
         self,
         directory: Path,
     ) -> Context:
-        """Find context file per disk directory."""
-        return reduce(
+        """
+        Find context file per disk directory.
+
+        The result is cached until any of the contributing context files is
+        changed, removed, or a new one is added.
+        """
+        fingerprint = self._create_context_fingerprint(directory)
+
+        cached_context = self.context_per_directory.get(directory)
+        if cached_context is not None and (
+            cached_context.fingerprint == fingerprint
+        ):
+            return cached_context.context
+
+        context = reduce(
             merge,  # type: ignore
-            map(
+            starmap(
                 self._get_context_file,
-                reversed(list(self._find_context_files(directory))),
+                reversed(fingerprint),
             ),
             dict(DEFAULT_CONTEXT),
         )
 
+        self.context_per_directory[directory] = CachedContext(
+            fingerprint=fingerprint,
+            context=context,
+        )
+
+        return context
+
+    def get_context_hash_per_directory(self, directory: Path) -> str:
+        """
+        Hash the context of a directory.
+
+        The hash only depends on content of the context files which apply to
+        the directory, and is computed once per distinct set of them.
+        """
+        context = self.get_context_per_directory(directory)
+        context_fingerprint = self.context_per_directory[directory].fingerprint
+
+        context_hash = self.context_hash_per_fingerprint.get(
+            context_fingerprint,
+        )
+        if context_hash is None:
+            context_hash = hash_context(context)
+            self.context_hash_per_fingerprint[context_fingerprint] = (
+                context_hash
+            )
+
+        return context_hash
+
+    def cached_fingerprint(
+        self,
+        local_iri: rdflib.URIRef,
+    ) -> Optional[FileFingerprint]:
+        """Find fingerprint of a file in the graph or in persistent cache."""
+        fingerprint = self.fingerprint_per_file.get(local_iri)
+
+        if fingerprint is None and self.persistent_cache:
+            cached_graph = self.persistent_cache.graphs.get(local_iri)
+            if cached_graph is not None:
+                fingerprint = cached_graph.fingerprint
+
+        return fingerprint
+
     def create_file_cache_status(
         self,
         local_iri: rdflib.URIRef,
-        last_modification_timestamp_on_disk: float,
+        fingerprint: FileFingerprint,
     ) -> CacheStatus:
         """Determine caching status of a file."""
-        cached_modification_time = self.last_modified_timestamp_per_file.get(
-            local_iri,
-        )
+        cached_fingerprint = self.cached_fingerprint(local_iri)
 
-        if cached_modification_time is None:
+        if cached_fingerprint is None:
             return CacheStatus.NOT_CACHED
 
-        elif cached_modification_time < last_modification_timestamp_on_disk:
+        elif not cached_fingerprint.matches(fingerprint):
             return CacheStatus.EXPIRED
 
         return CacheStatus.UP_TO_DATE
 
     def clear_named_graph(self, local_iri: rdflib.URIRef) -> None:
         """Remove all triples in the specified named graph."""
-        # Ugly formatting is used because of:
-        #   https://github.com/RDFLib/rdflib/issues/1277
-        self.graph.update(f'CLEAR GRAPH <{local_iri}>')
+        self.clear_named_graphs([local_iri])
+
+    def clear_named_graphs(self, local_iris: Iterable[rdflib.URIRef]) -> int:
+        """
+        Remove all triples in the specified named graphs.
+
+        Triples are removed from the store directly, context by context.
+        Returns the number of quads removed.
+        """
+        quad_count = 0
+        for local_iri in set(local_iris):
+            named_graph = self.graph.get_context(local_iri)
+            if self.inference_delta is not None:
+                self.inference_delta.removed.update(named_graph)
+
+            quad_count += len(named_graph)
+            self.graph.remove((None, None, None, named_graph))
+
+        if quad_count:
+            self.generation += 1
+
+        return quad_count
+
+    def forget_files(self, local_iris: Iterable[rdflib.URIRef]) -> int:
+        """
+        Drop the named graphs of source files which no longer exist.
+
+        Returns the number of quads removed.
+        """
+        local_iris = set(local_iris)
+        for local_iri in local_iris:
+            self.fingerprint_per_file.pop(local_iri, None)
 
-    def update_from_file(  # noqa: WPS210
+            if self.persistent_cache is not None:
+                self.persistent_cache.discard(local_iri)
+
+        return self.clear_named_graphs(local_iris)
+
+    def forget_missing_files(
+        self,
+        present_iris: Iterable[rdflib.URIRef],
+    ) -> int:
+        """
+        Drop named graphs of all files except the given ones.
+
+        Files deleted or renamed since they were imported, or since they were
+        stored in the persistent cache, are found this way. Returns the
+        number of quads removed.
+        """
+        known_iris = set(self.fingerprint_per_file)
+        if self.persistent_cache is not None:
+            known_iris.update(self.persistent_cache.graphs)
+
+        missing_iris = known_iris.difference(present_iris)
+        quad_count = self.forget_files(missing_iris)
+
+        if missing_iris:
+            logger.info(
+                'Removed %s files no longer in the site, %s quads reclaimed.',
+                len(missing_iris),
+                quad_count,
+            )
+
+        instrumentation.count('files removed', len(missing_iris))
+        instrumentation.count('quads reclaimed', quad_count)
+
+        return quad_count
+
+    def start_incremental_inference(self) -> None:
+        """
+        Only infer consequences of changes from now on.
+
+        The inference graph must be up to date at this point.
+        """
+        self.incremental_inference = True
+        if self.inference_delta is None:
+            self.inference_delta = InferenceDelta()
+
+    def update_from_file(
         self,
         path: Path,
         local_iri: rdflib.URIRef,
         global_url: Optional[str] = None,
     ) -> None:
         """Update the graph from file determined by given path."""
+        self.update_from_files([
+            SourceFile(path=path, local_iri=local_iri, global_url=global_url),
+        ])
+
+    def update_from_files(
+        self,
+        source_files: Iterable[SourceFile],
+        workers: int = 1,
+    ) -> None:
+        """
+        Update the graph from multiple files.
+
+        With more than one worker, loaders run in a pool of processes, and the
+        graph is only updated in the main process.
+        """
+        # Context files of a directory are only looked up once per update.
+        self.context_fingerprint_per_directory = {}
+        try:
+            tasks = [
+                task
+                for task in starmap(self.prepare_import, source_files)
+                if task is not None
+            ]
+        finally:
+            self.context_fingerprint_per_directory = None
+
+        # Graphs of expired files are cleared at once, before any is stored.
+        self.clear_named_graphs(
+            task.local_iri
+            for task in tasks
+            if task.local_iri in self.fingerprint_per_file
+        )
+
+        if workers > 1 and len(tasks) > 1:
+            batches = load_in_parallel(tasks=tasks, workers=workers)
+        else:
+            batches = load_in_sequence(tasks)
+
+        for batch in batches:
+            self.store_imports(batch)
+
+    def prepare_import(  # noqa: WPS210
+        self,
+        path: Path,
+        local_iri: rdflib.URIRef,
+        global_url: Optional[str] = None,
+    ) -> Optional[ImportTask]:
+        """
+        Decide whether a file has to be imported into the graph.
+
+        Returns None if the file is up to date or has no loader.
+        """
         # Create a shorter (printable) version of the path for logging messages.
         try:
             relative_path = path.relative_to(self.root_directory)
         except ValueError:
             relative_path = path
 
-        file_last_modification_time = path.stat().st_mtime
+        # Assets which no loader handles are not worth reading at all.
+        loader_class = self.get_loader_class_for_path(path)
+        if loader_class is None:
+            return None
+
+        fingerprint = fingerprint_file(
+            path=path,
+            context_hash=self.get_context_hash_per_directory(path.parent),
+            previous=self.cached_fingerprint(local_iri),
+            global_url=global_url,
+        )
 
         cache_status = self.create_file_cache_status(
             local_iri=local_iri,
-            last_modification_timestamp_on_disk=file_last_modification_time,
+            fingerprint=fingerprint,
         )
 
         if cache_status == CacheStatus.UP_TO_DATE:
-            logger.info('Skipping %s (cached and up to date)', relative_path)
-            return
-
-        elif cache_status == CacheStatus.EXPIRED:
-            self.clear_named_graph(local_iri)
+            if local_iri in self.fingerprint_per_file:
+                instrumentation.count('files skipped')
+                logger.info(
+                    'Skipping %s (cached and up to date)',
+                    relative_path,
+                )
+                self.fingerprint_per_file[local_iri] = fingerprint
+            else:
+                instrumentation.count('files restored')
+                logger.info('Restoring %s from persistent cache', relative_path)
+                self.restore_from_persistent_cache(local_iri, fingerprint)
+
+            # Remember the new modification time of a touched file, so that
+            # it is not hashed again next time.
+            if self.persistent_cache is not None:
+                self.persistent_cache.refresh(local_iri, fingerprint)
+
+            return None
 
         context = self.get_context_per_directory(path.parent)
-        loader_class = self.get_loader_class_for_path(path)
-
-        if loader_class is None:
-            return
 
         logger.info(
             'Importing %s via %s (%s)',
@@ -162,54 +502,104 @@ class Octiron:   # noqa: WPS214
             ) else 'cached but expired',
         )
 
-        loader_instance = loader_class(
+        return ImportTask(
             path=path,
-            context=context,
             local_iri=local_iri,
             global_url=global_url,
+            loader_class=loader_class,
+            context=context,
+            fingerprint=fingerprint,
         )
-        triples = loader_instance.stream()
 
-        quads = triples_to_quads(triples=triples, graph=local_iri)
+    def store_imports(self, batch: LoadedBatch) -> None:
+        """Add triples loaded from files into their named graphs at once."""
+        self.graph.addN(chain.from_iterable(
+            chain(
+                triples_to_quads(
+                    triples=starmap(Triple, triples),
+                    graph=task.local_iri,
+                ),
+                self.metadata_quads(task.local_iri),
+            )
+            for task, triples in batch
+        ))
+        self.generation += 1
+
+        for task, _triples in batch:
+            self.register_import(task)
+
+    def register_import(self, task: ImportTask) -> None:
+        """Remember a file whose triples are already in the graph."""
+        local_iri = task.local_iri
+
+        # Store the file fingerprint
+        self.fingerprint_per_file[local_iri] = task.fingerprint
+
+        stored_triples = list(self.graph.get_context(local_iri))
+
+        if self.inference_delta is not None:
+            self.inference_delta.added.update(stored_triples)
+
+        if self.persistent_cache is not None:
+            self.persistent_cache.store(
+                local_iri=local_iri,
+                fingerprint=task.fingerprint,
+                triples=stored_triples,
+            )
+
+    def restore_from_persistent_cache(
+        self,
+        local_iri: rdflib.URIRef,
+        fingerprint: FileFingerprint,
+    ) -> None:
+        """Load the named graph of a file from the persistent cache."""
+        cached_graph = self.persistent_cache.graphs[local_iri]  # type: ignore
 
-        self.graph.addN(quads)
+        self.graph.addN(triples_to_quads(
+            triples=starmap(Triple, cached_graph.triples),
+            graph=local_iri,
+        ))
+        self.generation += 1
 
-        self.add_metadata(
-            local_iri=local_iri,
-        )
+        self.fingerprint_per_file[local_iri] = fingerprint
 
-        # Store the file last modification time
-        self.last_modified_timestamp_per_file[local_iri] = (
-            file_last_modification_time
-        )
+        if self.inference_delta is not None:
+            self.inference_delta.added.update(
+                starmap(Triple, cached_graph.triples),
+            )
+
+    def save_persistent_cache(self) -> None:
+        """Write imported graphs to disk for the next run to reuse."""
+        if self.persistent_cache is not None:
+            self.persistent_cache.save()
 
-    def add_metadata(self, local_iri: rdflib.URIRef) -> None:
-        """Store metadata about a source file."""
+    def metadata_quads(self, local_iri: rdflib.URIRef) -> List[Quad]:
+        """Describe a source file in its named graph."""
         local_url = URL(local_iri.toPython())
         parent_iri = rdflib.URIRef(str(local_url.parent))
         file_name = rdflib.Literal(local_url.name)
         directory_name = rdflib.Literal(local_url.parent.name)
 
-        quads = [
-            (
+        return [
+            Quad(
                 local_iri,
                 rdflib.RDF.type,
                 OCTA.Directory,
                 local_iri,
             ),
-            (
+            Quad(
                 parent_iri,
                 OCTA.isParentOf,
                 local_iri,
                 local_iri,
             ),
-            (
+            Quad(
                 parent_iri,
                 OCTA.fileName,
                 directory_name,
                 local_iri,
             ),
-            (
+            Quad(
                 local_iri,
                 OCTA.fileName,
                 file_name,
@@ -217,21 +607,125 @@ class Octiron:   # noqa: WPS214
             ),
         ]
 
-        self.graph.addN(quads)
-
     def apply_inference(self) -> None:  # noqa: WPS213
         """Do whatever is needed after the graph was updated from a file."""
-        logger.info('Inference: OWL RL started...')
-        owlrl.DeductiveClosure(OWLRLExtensionNamedGraph).expand(self.graph)
-        logger.info('Inference: OWL RL complete.')
-
-        # Custom inference queries
-        inference_dir = self.root_directory.parent / 'inference'
-        if inference_dir.is_dir():
-            for sparql_file in inference_dir.iterdir():
-                logger.info('Inference: %s', sparql_file.name)
-                sparql_text = sparql_file.read_text()
-                self.graph.update(sparql_text)
+        with instrumentation.span('apply_inference', 'inference'):
+            if self.inference_profile == InferenceProfile.NONE:
+                logger.info('Inference: disabled.')
+
+            elif self.inference_profile == InferenceProfile.CUSTOM:
+                self.graph.remove((None, None, None, INFERENCE))
+                self.apply_custom_inference()
+
+            else:
+                self.apply_closure()
+                self.apply_custom_inference()
+
+        self.generation += 1
+
+        if self.incremental_inference:
+            self.inference_delta = InferenceDelta()
+
+    def apply_closure(self) -> None:
+        """Apply RDFS or OWL RL closure, fully or incrementally."""
+        delta = self.inference_delta
+        if delta is None:
+            with instrumentation.span(
+                self.inference_profile.value,
+                'inference',
+                mode='full',
+            ):
+                self.apply_full_inference()
+
+        elif delta.is_empty:
+            logger.info('Inference: graph has not changed, skipping closure.')
+
+        else:
+            with instrumentation.span(
+                self.inference_profile.value,
+                'inference',
+                mode='incremental',
+            ):
+                self.apply_incremental_inference(delta)
+
+    def apply_custom_inference(self) -> None:
+        """Run inference/*.sparql rules, storing results as inferences."""
+        with instrumentation.span('custom rules', 'inference'):
+            self.custom_rules.apply(inference_view(self.graph))
+
+    def apply_full_inference(self) -> None:
+        """Recalculate the closure of the whole graph."""
+        logger.info('Inference: %s started...', self.inference_profile.value)
+        self.graph.remove((None, None, None, INFERENCE))
+
+        closure = CLOSURE_PER_PROFILE[self.inference_profile](  # type: ignore
+            self.graph,
+            axioms=False,
+            daxioms=False,
+        )
+        with improved_datatypes():
+            closure.closure()
+
+        self.one_time_inferences = closure.one_time_triples
+        logger.info('Inference: %s complete.', self.inference_profile.value)
+
+    def apply_incremental_inference(self, delta: InferenceDelta) -> None:
+        """Update the closure with the changes since last inference."""
+        # A triple might have been removed from one named graph but still be
+        # stated in another one.
+        removed = {
+            triple
+            for triple in delta.removed
+            if not is_stated(self.graph, triple)
+        }
+
+        over_deleted = over_delete(
+            inference_graph=self.graph.get_context(INFERENCE),
+            removed=removed,
+        )
+
+        if over_deleted is None:
+            self.apply_full_inference()
+            return
+
+        logger.info(
+            'Inference: %s for %s added and %s removed triples started...',
+            self.inference_profile.value,
+            len(delta.added),
+            len(removed),
+        )
+        self.one_time_inferences = close_incrementally(
+            graph=self.graph,
+            changed={*delta.added, *removed, *over_deleted},
+            previous_one_time_triples=self.one_time_inferences,
+            closure_class=CLOSURE_PER_PROFILE[self.inference_profile],
+        )
+
+        # Incremental closure cannot tell which descriptions of such a
+        # predicate are left without support; this is rare enough to start
+        # over.
+        if abandons_vocabulary_predicate(
+            self.graph,
+            {*removed, *over_deleted},
+        ):
+            self.apply_full_inference()
+            return
+
+        logger.info('Inference: %s complete.', self.inference_profile.value)
+
+    def query(self, query_text: str, **kwargs: str) -> QueryResult:
+        """
+        Run SPARQL query against the graph.
+
+        While the graph stays the same, the result is computed only once.
+        """
+        repeated_query_detector.record(query_text, kwargs)
+        return self.query_results.get(
+            generation=self.generation,
+            query_text=query_text,
+            bindings=kwargs,
+            execute=partial(query, query_text, instance=self.graph, **kwargs),
+        )
 
     def get_loader_class_for_path(self, path: Path) -> Optional[Type[Loader]]:
         """Based on file path, determine the loader to use."""
@@ -260,7 +754,45 @@ class Octiron:   # noqa: WPS214
             if context_directory == self.root_directory:
                 return
 
-    def _get_context_file(self, path: Path) -> Context:
-        """Read and return context file by path."""
+    def _create_context_fingerprint(
+        self,
+        directory: Path,
+    ) -> ContextFingerprint:
+        """List context files of a directory with their modification times."""
+        fingerprints = self.context_fingerprint_per_directory
+        if fingerprints is not None and directory in fingerprints:
+            return fingerprints[directory]
+
+        fingerprint = tuple(
+            (context_path, context_path.stat().st_mtime)
+            for context_path in self._find_context_files(directory)
+        )
+
+        if fingerprints is not None:
+            fingerprints[directory] = fingerprint
+
+        return fingerprint
+
+    def _get_context_file(
+        self,
+        path: Path,
+        last_modification_time: float,
+    ) -> Context:
+        """Read and return context file by path, unless it is cached."""
+        fingerprint = ((path, last_modification_time),)
+
+        cached_context = self.context_per_file.get(path)
+        if cached_context is not None and (
+            cached_context.fingerprint == fingerprint
+        ):
+            return cached_context.context
+
         context_loader = CONTEXT_FORMATS[path.name]
-        return context_loader(path)
+        context = context_loader(path)
+
+        self.context_per_file[path] = CachedContext(
+            fingerprint=fingerprint,
+            context=context,
+        )
+
+        return context
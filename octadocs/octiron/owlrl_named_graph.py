@@ -1,26 +1,70 @@
-import itertools
+from contextlib import contextmanager
+from typing import Iterator, Set
 
-from octadocs.conversions import triples_to_quads
 from octadocs.types import Triple
-from owlrl import OWLRL_Extension
-from rdflib import URIRef
+from owlrl import DatatypeHandling, OWLRL_Extension, RDFS_Semantics
+from rdflib import ConjunctiveGraph, URIRef
 
+INFERENCE = URIRef('inference')
 
-class OWLRLExtensionNamedGraph(OWLRL_Extension):
-    """OWL RL with inferred triples in a separate graph."""
 
-    graph_name = URIRef('inference')
+def inference_view(graph: ConjunctiveGraph) -> ConjunctiveGraph:
+    """
+    Create a view of the graph which writes into the inference graph.
 
-    def flush_stored_triples(self):
-        """Store the triples into a named graph."""
-        # Remove the previous version of inferences
-        self.graph.remove_context(self.graph_name)
+    Reading from the view returns triples of all named graphs.
+    """
+    return ConjunctiveGraph(store=graph.store, identifier=INFERENCE)
+
+
+@contextmanager
+def improved_datatypes() -> Iterator[None]:
+    """Use owlrl datatype conversions, as owlrl.DeductiveClosure does."""
+    DatatypeHandling.use_Alt_lexical_conversions()
+
+    try:
+        yield
+    finally:
+        DatatypeHandling.use_RDFLib_lexical_conversions()
+
+
+class NamedGraphClosure:
+    """
+    Mixin for owlrl closures, putting inferred triples into a separate graph.
+
+    Triples inferred by one-time rules are remembered.
+    """
+
+    graph_name = INFERENCE
 
-        triples = itertools.starmap(
-            Triple,
-            self.added_triples,
+    def __init__(self, graph, axioms, daxioms, rdfs=False):
+        """Make every inferred triple land in the inference graph."""
+        super().__init__(  # type: ignore
+            inference_view(graph), axioms, daxioms, rdfs,
         )
-        quads = triples_to_quads(triples, graph=self.graph_name)
-        self.graph.addN(quads)
+        self.is_running_one_time_rules = False
+        self.one_time_triples: Set[Triple] = set()
+
+    def one_time_rules(self):
+        """Apply one-time rules, remembering the triples they infer."""
+        self.is_running_one_time_rules = True
+        try:
+            super().one_time_rules()  # type: ignore
+            self.flush_stored_triples()
+        finally:
+            self.is_running_one_time_rules = False
+
+    def flush_stored_triples(self):
+        """Send the stored triples to the graph."""
+        if self.is_running_one_time_rules:
+            self.one_time_triples.update(self.added_triples)  # type: ignore
+
+        super().flush_stored_triples()  # type: ignore
+
+
+class OWLRLExtensionNamedGraph(NamedGraphClosure, OWLRL_Extension):
+    """OWL RL with inferred triples in a separate graph."""
+
 
-        self.empty_stored_triples()
+class RDFSNamedGraph(NamedGraphClosure, RDFS_Semantics):
+    """RDFS with inferred triples in a separate graph."""
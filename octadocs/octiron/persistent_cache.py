@@ -0,0 +1,146 @@
+import logging
+import pickle  # noqa: S403
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import rdflib
+from octadocs.octiron.fingerprint import FileFingerprint
+
+try:  # noqa
+    from importlib.metadata import PackageNotFoundError, version  # noqa
+except ImportError:
+    from importlib_metadata import (  # type: ignore  # noqa
+        PackageNotFoundError,
+        version,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Bump this whenever the layout of the stored data changes. Caches written by
+# a different version are discarded instead of being misinterpreted.
+CACHE_FORMAT_VERSION = 4
+
+CACHE_FILE_NAME = 'graph.pickle'
+
+StoredTriple = Tuple[rdflib.term.Node, rdflib.term.Node, rdflib.term.Node]
+
+
+def octadocs_version() -> str:
+    """Version of the installed octadocs package."""
+    try:
+        return version('octadocs')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+def cache_version() -> Tuple[int, str]:
+    """
+    Identify the code a cache is written by.
+
+    Loaders of another octadocs release might produce different triples from
+    the same file, so its cache is not reused either.
+    """
+    return CACHE_FORMAT_VERSION, octadocs_version()
+
+
+@dataclass
+class CachedGraph:
+    """Named graph of a source file, stored along with the file fingerprint."""
+
+    fingerprint: FileFingerprint
+    triples: List[StoredTriple]
+
+
+@dataclass
+class PersistentCache:
+    """
+    On-disk storage of named graphs imported from source files.
+
+    Lets a cold `mkdocs build` restore the graphs of unchanged files instead of
+    running the loaders against them again.
+    """
+
+    directory: Path
+    graphs: Dict[rdflib.URIRef, CachedGraph] = field(default_factory=dict)
+    is_modified: bool = False
+
+    @property
+    def path(self) -> Path:
+        """Path to the cache file."""
+        return self.directory / CACHE_FILE_NAME
+
+    @classmethod
+    def load(cls, directory: Path) -> 'PersistentCache':
+        """Read the cache from disk, or start a new one if it is unusable."""
+        cache = cls(directory=directory)
+
+        try:
+            with cache.path.open('rb') as cache_file:
+                stored_version, graphs = pickle.load(  # noqa: S301
+                    cache_file,
+                )
+        except FileNotFoundError:
+            return cache
+        except Exception as err:  # noqa: B902
+            logger.warning('Ignoring unreadable cache %s: %s', cache.path, err)
+            return cache
+
+        if stored_version != cache_version():
+            logger.info(
+                'Ignoring cache %s written by another octadocs version.',
+                cache.path,
+            )
+            return cache
+
+        cache.graphs = graphs
+        return cache
+
+    def store(
+        self,
+        local_iri: rdflib.URIRef,
+        fingerprint: FileFingerprint,
+        triples: List[StoredTriple],
+    ) -> None:
+        """Remember the named graph of a file."""
+        self.graphs[local_iri] = CachedGraph(
+            fingerprint=fingerprint,
+            triples=triples,
+        )
+        self.is_modified = True
+
+    def refresh(
+        self,
+        local_iri: rdflib.URIRef,
+        fingerprint: FileFingerprint,
+    ) -> None:
+        """Update the fingerprint of a file whose content has not changed."""
+        cached_graph = self.graphs.get(local_iri)
+        if cached_graph is not None and cached_graph.fingerprint != fingerprint:
+            cached_graph.fingerprint = fingerprint
+            self.is_modified = True
+
+    def discard(self, local_iri: rdflib.URIRef) -> None:
+        """Forget the named graph of a file, if it was stored."""
+        if self.graphs.pop(local_iri, None) is not None:
+            self.is_modified = True
+
+    def save(self) -> None:
+        """Write the cache to disk if anything has changed."""
+        if not self.is_modified:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write into a temporary file first so that an interrupted build does
+        # not leave a truncated cache behind.
+        temporary_path = self.path.with_suffix('.tmp')
+        with temporary_path.open('wb') as cache_file:
+            pickle.dump(
+                (cache_version(), self.graphs),
+                cache_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+        temporary_path.replace(self.path)
+        self.is_modified = False
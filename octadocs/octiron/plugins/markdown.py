@@ -1,15 +1,19 @@
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, List
+from typing import Any, Dict, Iterator, List
 
-import frontmatter
 import rdflib
+import yaml
 from documented import DocumentedError
 from octadocs.octiron.plugins import Loader
-from octadocs.octiron.yaml_extensions import as_triple_stream
+from octadocs.octiron.yaml_extensions import SafeLoader, as_triple_stream
 from octadocs.types import OCTA, Triple
 from yaml.scanner import ScannerError
 
+# A line which opens or closes YAML front matter.
+FRONT_MATTER_BOUNDARY = re.compile(r'^-{3,}\s*$')
+
 
 @dataclass
 class InvalidFrontmatter(DocumentedError):
@@ -36,10 +40,17 @@ class InvalidFrontmatter(DocumentedError):
     @property
     def explanation(self) -> str:
         """Explain the error to the user."""
-        if 'found character \'\\t\' that' in str(self.error):   # noqa: WPS342
+        # Unlike PyYAML, libyaml does not quote the offending character.
+        if (
+            'cannot start any token' in str(self.error) and
+            '\t' in self.raw_frontmatter
+        ):
             return 'Suggestion:\n  Use spaces, not tabs, for indentation.'
 
-        if self.error.problem == 'mapping values are not allowed here':
+        if self.error.problem in {
+            'mapping values are not allowed here',
+            'mapping values are not allowed in this context',
+        }:
             return (
                 'Suggestion:\n'
                 '  If property value contains ":", use quotes.\n\n'
@@ -78,6 +89,46 @@ def process_yaml_scanner_error(
     )
 
 
+def read_front_matter(path: Path) -> Dict[str, Any]:  # type: ignore
+    """
+    Read and parse YAML front matter of a Markdown file.
+
+    The file is only read up to the closing boundary of the front matter,
+    not through the prose. Returns an empty dict if there is no front
+    matter, or if it does not describe a mapping.
+    """
+    # Every line before the front matter itself is kept as a blank line, for
+    # YAML errors to point at lines of the file.
+    header_lines: List[str] = []
+    with path.open(encoding='utf-8-sig') as markdown_file:
+        for line in markdown_file:
+            header_lines.append('\n')
+            if line.strip():
+                break
+
+        if not header_lines or not FRONT_MATTER_BOUNDARY.match(line):
+            return {}
+
+        for line in markdown_file:  # noqa: WPS440
+            if FRONT_MATTER_BOUNDARY.match(line):
+                break
+
+            header_lines.append(line)
+
+        else:
+            # The front matter is never closed.
+            return {}
+
+    meta_data = yaml.load(  # noqa: S506
+        ''.join(header_lines),
+        Loader=SafeLoader,
+    )
+    if not isinstance(meta_data, dict):
+        return {}
+
+    return meta_data
+
+
 class MarkdownLoader(Loader):
     """Load semantic data from Markdown front matter."""
 
@@ -86,7 +137,7 @@ class MarkdownLoader(Loader):
     def stream(self) -> Iterator[Triple]:
         """Return stream of triples."""
         try:
-            meta_data = frontmatter.load(self.path).metadata
+            meta_data = read_front_matter(self.path)
         except ScannerError as err:
             raise process_yaml_scanner_error(
                 err=err,
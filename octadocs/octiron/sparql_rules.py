@@ -0,0 +1,317 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import rdflib
+from rdflib.paths import AlternativePath, InvPath, MulPath, SequencePath
+from rdflib.plugins.sparql.algebra import traverse, translateUpdate, triples
+from rdflib.plugins.sparql.parser import parseUpdate
+from rdflib.plugins.sparql.parserutils import CompValue
+
+logger = logging.getLogger(__name__)
+
+# Predicates a rule reads or writes; None stands for any predicate at all.
+Predicates = Optional[FrozenSet[rdflib.URIRef]]
+
+# Rules which keep changing the graph are stopped after so many passes.
+MAX_ITERATIONS = 100
+
+Quad = Tuple[rdflib.term.Node, rdflib.term.Node, rdflib.term.Node, Any]
+
+
+def union(predicate_sets: Iterable[Predicates]) -> Predicates:
+    """Unite sets of predicates."""
+    united: Set[rdflib.URIRef] = set()
+    for predicates in predicate_sets:
+        if predicates is None:
+            return None
+
+        united.update(predicates)
+
+    return frozenset(united)
+
+
+def overlap(first: Predicates, second: Predicates) -> bool:
+    """Check if two sets of predicates might have a predicate in common."""
+    if first is None or second is None:
+        return True
+
+    return bool(first & second)
+
+
+def path_predicates(path: Any) -> Predicates:  # type: ignore
+    """Find predicates a property path consists of."""
+    if isinstance(path, rdflib.URIRef):
+        return frozenset({path})
+
+    if isinstance(path, (SequencePath, AlternativePath)):
+        return union(map(path_predicates, path.args))
+
+    if isinstance(path, MulPath):
+        return path_predicates(path.path)
+
+    if isinstance(path, InvPath):
+        return path_predicates(path.arg)
+
+    # A variable or a negated path can match anything.
+    return None
+
+
+def triples_predicates(triple_patterns: Iterable[Any]) -> Predicates:
+    """Find predicates of a list of triple patterns."""
+    return union(
+        path_predicates(predicate)
+        for _subject, predicate, _object in triple_patterns
+    )
+
+
+def template_predicates(template: Optional[CompValue]) -> Predicates:
+    """Find predicates of an INSERT or DELETE template."""
+    if template is None:
+        return frozenset()
+
+    quads = template.quads or {}
+    return union([
+        triples_predicates(template.triples or []),
+        *map(triples_predicates, quads.values()),
+    ])
+
+
+def pattern_predicates(pattern: CompValue) -> Predicates:
+    """Find predicates a WHERE clause reads."""
+    found: List[Predicates] = []
+
+    def visit(node: Any) -> None:  # type: ignore
+        if not isinstance(node, CompValue):
+            return
+
+        if node.name == 'BGP':
+            found.append(triples_predicates(node.triples))
+
+        # Graph patterns of EXISTS and NOT EXISTS are not translated yet.
+        elif node.name == 'TriplesBlock':
+            found.append(triples_predicates(triples(node.triples)))
+
+    traverse(pattern, visitPre=visit)
+
+    return union(found)
+
+
+def operation_predicates(
+    operation: CompValue,
+) -> Tuple[Predicates, Predicates]:
+    """Find predicates an update operation reads and writes."""
+    if operation.name == 'Modify':
+        return (
+            pattern_predicates(operation.where),
+            union([
+                template_predicates(operation.delete),
+                template_predicates(operation.insert),
+            ]),
+        )
+
+    if operation.name in {'InsertData', 'DeleteData'}:
+        return frozenset(), template_predicates(operation)
+
+    if operation.name == 'DeleteWhere':
+        predicates = template_predicates(operation)
+        return predicates, predicates
+
+    # LOAD, CLEAR, COPY and others work on whole graphs.
+    return None, None
+
+
+def operation_deletes(operation: CompValue) -> bool:
+    """Check if an update operation might remove triples."""
+    if operation.name == 'InsertData':
+        return False
+
+    if operation.name == 'Modify':
+        return operation.delete is not None
+
+    return True
+
+
+def written_quads(
+    graph: rdflib.ConjunctiveGraph,
+    predicates: Predicates,
+) -> Set[Quad]:
+    """Collect quads with any of the predicates, or all quads if None."""
+    patterns = [None] if predicates is None else sorted(predicates)
+    return {
+        (subject, predicate, obj, context.identifier)
+        for pattern in patterns
+        for subject, predicate, obj, context in graph.quads(
+            (None, pattern, None),
+        )
+    }
+
+
+@dataclass(frozen=True)
+class SparqlRule:
+    """SPARQL UPDATE from the inference directory, parsed and translated."""
+
+    path: Path
+    modification_time: float
+    update: List[CompValue] = field(compare=False)
+    reads: Predicates
+    writes: Predicates
+    deletes: bool
+
+    def depends_on(self, other: 'SparqlRule') -> bool:
+        """Check if this rule reads what the other one writes."""
+        return overlap(self.reads, other.writes)
+
+
+def compile_rule(
+    path: Path,
+    namespaces: Mapping[str, rdflib.URIRef],
+) -> SparqlRule:
+    """Parse and translate a rule file."""
+    modification_time = path.stat().st_mtime
+    update = translateUpdate(
+        parseUpdate(path.read_text()),
+        initNs=namespaces,
+    )
+    predicates = [operation_predicates(operation) for operation in update]
+
+    return SparqlRule(
+        path=path,
+        modification_time=modification_time,
+        update=update,
+        reads=union(reads for reads, _writes in predicates),
+        writes=union(writes for _reads, writes in predicates),
+        deletes=any(map(operation_deletes, update)),
+    )
+
+
+def order_rules(rules: Iterable[SparqlRule]) -> List[SparqlRule]:
+    """
+    Sort rules so that each of them runs after the rules it depends on.
+
+    Rules which depend on each other in a cycle are sorted by file name.
+    """
+    remaining = sorted(rules, key=lambda rule: rule.path)
+    ordered = []
+
+    while remaining:
+        independent_rule = next(
+            (
+                rule
+                for rule in remaining
+                if not any(
+                    rule.depends_on(other)
+                    for other in remaining
+                    if other is not rule
+                )
+            ),
+            remaining[0],
+        )
+        ordered.append(independent_rule)
+        remaining.remove(independent_rule)
+
+    return ordered
+
+
+@dataclass
+class SparqlRuleEngine:
+    """
+    Apply SPARQL UPDATE rules from a directory until they infer nothing new.
+
+    Each rule is compiled once and recompiled when its file changes. After a
+    rule has changed the graph, the rules reading what it writes run again.
+    """
+
+    directory: Path
+    rule_per_path: Dict[Path, SparqlRule] = field(default_factory=dict)
+
+    def rules(
+        self,
+        namespaces: Mapping[str, rdflib.URIRef],
+    ) -> List[SparqlRule]:
+        """Compile new and changed rules, and sort them by dependencies."""
+        paths = sorted(
+            self.directory.glob('*.sparql'),
+        ) if self.directory.is_dir() else []
+
+        self.rule_per_path = {
+            path: self._get_rule(path, namespaces)
+            for path in paths
+        }
+
+        return order_rules(self.rule_per_path.values())
+
+    def apply(self, graph: rdflib.ConjunctiveGraph) -> None:
+        """Run the rules against the graph up to a fixpoint."""
+        rules = self.rules(dict(graph.namespaces()))
+        pending = {rule.path for rule in rules}
+
+        iteration = 0
+        while pending:
+            iteration += 1
+            if iteration > MAX_ITERATIONS:
+                logger.warning(
+                    'Inference: rules %s still change the graph after %s ' +
+                    'iterations, stopping.',
+                    ', '.join(sorted(path.name for path in pending)),
+                    MAX_ITERATIONS,
+                )
+                return
+
+            for rule in rules:
+                if rule.path in pending:
+                    pending.remove(rule.path)
+                    pending.update(self._apply_rule(rule, rules, graph))
+
+    def _apply_rule(
+        self,
+        rule: SparqlRule,
+        rules: List[SparqlRule],
+        graph: rdflib.ConjunctiveGraph,
+    ) -> Iterable[Path]:
+        """Run a rule, and return paths of rules which have to run again."""
+        logger.info('Inference: %s', rule.path.name)
+
+        if rule.deletes:
+            # A rule which replaces triples might keep their count the same.
+            quads_before = written_quads(graph, rule.writes)
+            graph.update(rule.update)
+            has_changed = written_quads(graph, rule.writes) != quads_before
+
+        else:
+            triple_count = len(graph)
+            graph.update(rule.update)
+            has_changed = len(graph) != triple_count
+
+        if not has_changed:
+            return []
+
+        return [
+            dependent_rule.path
+            for dependent_rule in rules
+            if dependent_rule.depends_on(rule)
+        ]
+
+    def _get_rule(
+        self,
+        path: Path,
+        namespaces: Mapping[str, rdflib.URIRef],
+    ) -> SparqlRule:
+        """Retrieve compiled rule unless the file has changed since."""
+        rule = self.rule_per_path.get(path)
+        if rule is not None and rule.modification_time == path.stat().st_mtime:
+            return rule
+
+        logger.info('Inference: compiling %s', path.name)
+        return compile_rule(path, namespaces)
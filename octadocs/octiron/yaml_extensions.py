@@ -4,12 +4,32 @@ from dataclasses import dataclass
 from functools import partial
 from itertools import starmap
 from pprint import pformat
-from typing import Any, Dict, Iterator, List, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import rdflib
 from boltons.iterutils import remap
 from documented import DocumentedError
-from octadocs.octiron.context import merge
+from octadocs.octiron.context import (
+    ProcessedContextCache,
+    hash_context,
+    merge,
+)
+from octadocs.octiron.document_loader import document_loader
+from octadocs.octiron.jsonld_compiler import (
+    CompiledContext,
+    UnsupportedDocument,
+    compile_context,
+    compile_document,
+)
 from octadocs.types import LOCAL, Context, Triple
 from pyld import jsonld
 
@@ -26,6 +46,55 @@ MetaData = Union[List[Dict[str, Any]], Dict[str, Any]]   # type: ignore  # noqa
 Data = TypeVar('Data')
 
 
+class CachingJsonLdProcessor(jsonld.JsonLdProcessor):
+    """
+    JSON-LD processor which reuses processed expansion contexts.
+
+    `pyld` processes `expandContext` from scratch on every `expand()` call.
+    If the caller provides `contextHash` option, we only do that once per
+    distinct context.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache of processed contexts."""
+        super().__init__()
+        self.processed_contexts: ProcessedContextCache[Dict[str, Any]] = (
+            ProcessedContextCache()
+        )
+
+    def process_context(  # type: ignore
+        self,
+        active_ctx: Dict[str, Any],
+        local_ctx: Any,
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Process context or retrieve it from cache."""
+        context_hash = (options or {}).get('contextHash')
+        if context_hash is None or local_ctx is None:
+            return super().process_context(active_ctx, local_ctx, options)
+
+        # Result depends on the context we start from and on the base IRI.
+        return self.processed_contexts.get(
+            context_hash='{uuid}|{base}|{context_hash}'.format(
+                uuid=active_ctx.get('_uuid'),
+                base=options.get('base'),
+                context_hash=context_hash,
+            ),
+            process=partial(
+                super().process_context,
+                active_ctx,
+                local_ctx,
+                options,
+            ),
+        )
+
+
+jsonld_processor = CachingJsonLdProcessor()
+compiled_contexts: ProcessedContextCache[CompiledContext] = (
+    ProcessedContextCache()
+)
+
+
 @dataclass
 class ExpandError(DocumentedError):
     """
@@ -143,14 +212,50 @@ def _dict_as_triple_stream(  # type: ignore
     # link this IRI to the local document IRI.
     meta_data['octa:subjectOf'] = local_iri
 
+    # Documents in a directory share a context; we process it only once.
+    context_hash = hash_context(context)
+
+    try:
+        triples: Iterable[Triple] = compile_document(
+            document=meta_data,
+            context=compiled_contexts.get(
+                context_hash=context_hash,
+                process=partial(compile_context, context),
+            ),
+            base=str(LOCAL),
+        )
+    except UnsupportedDocument:
+        triples = _triples_via_pyld(
+            meta_data=meta_data,
+            context=context,
+            context_hash=context_hash,
+        )
+
+    yield from map(
+        partial(
+            reformat_blank_nodes,
+            f'{local_iri}/',
+        ),
+        triples,
+    )
+
+
+def _triples_via_pyld(  # type: ignore
+    meta_data: Dict[str, Any],
+    context: Context,
+    context_hash: Optional[str] = None,
+) -> Iterator[Triple]:
+    """Convert a JSON-LD document into triples with pyld and rdflib-jsonld."""
     # Reason: https://github.com/RDFLib/rdflib-jsonld/issues/97
     # If we don't expand with an explicit @base, import will fail silently.
     try:
-        meta_data = jsonld.expand(
+        meta_data = jsonld_processor.expand(
             meta_data,
             options={
                 'base': str(LOCAL),
                 'expandContext': context,
+                'contextHash': context_hash,
+                'documentLoader': document_loader,
             },
         )
     except TypeError as err:
@@ -160,7 +265,10 @@ def _dict_as_triple_stream(  # type: ignore
 
     # Reason: https://github.com/RDFLib/rdflib-jsonld/issues/98
     # If we don't flatten, @included sections will not be imported.
-    meta_data = jsonld.flatten(meta_data)
+    meta_data = jsonld.flatten(
+        meta_data,
+        options={'documentLoader': document_loader},
+    )
     serialized_meta_data = json.dumps(meta_data, indent=4)
 
     graph = rdflib.Graph()
@@ -168,16 +276,7 @@ def _dict_as_triple_stream(  # type: ignore
         data=serialized_meta_data,
         format='json-ld',
     )
-    yield from map(
-        partial(
-            reformat_blank_nodes,
-            f'{local_iri}/',
-        ),
-        starmap(
-            Triple,
-            iter(graph),
-        ),
-    )
+    return starmap(Triple, iter(graph))
 
 
 def _list_as_triple_stream(  # type: ignore
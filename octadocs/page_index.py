@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, cast
+
+import rdflib
+from octadocs.profiler import query_profiler
+from octadocs.query import SelectResult, query
+
+
+@dataclass
+class PageIndex:
+    """
+    Facts about every page which the plugin needs to render it.
+
+    Built once the graph is complete, so that rendering a page does not
+    require to run any queries.
+    """
+
+    template_per_page: Dict[rdflib.URIRef, str] = field(default_factory=dict)
+    this_per_page: Dict[rdflib.URIRef, rdflib.URIRef] = field(
+        default_factory=dict,
+    )
+
+    def template(self, page_iri: rdflib.URIRef) -> Optional[str]:
+        """Find the template to render the page with."""
+        return self.template_per_page.get(page_iri)
+
+    def this(self, page_iri: rdflib.URIRef) -> rdflib.URIRef:
+        """Find the resource the page describes, or the page itself."""
+        return self.this_per_page.get(page_iri, page_iri)
+
+
+def build_page_index(graph: rdflib.ConjunctiveGraph) -> PageIndex:
+    """Look up templates and subjects of all pages at once."""
+    with query_profiler.source('page index'):
+        return _build_page_index(graph)
+
+
+def _build_page_index(graph: rdflib.ConjunctiveGraph) -> PageIndex:
+    """Run the page index queries."""
+    page_index = PageIndex()
+
+    template_rows = cast(SelectResult, query(
+        '''
+            SELECT ?page ?template_name WHERE {
+                ?page octa:template ?template_name .
+            }
+        ''',
+        instance=graph,
+    ))
+    for template_row in template_rows:
+        page_index.template_per_page.setdefault(
+            template_row['page'],
+            template_row['template_name'].value,
+        )
+
+    this_rows = cast(SelectResult, query(
+        '''
+            SELECT ?page ?this WHERE {
+                ?this octa:subjectOf ?page .
+            }
+        ''',
+        instance=graph,
+    ))
+    for this_row in this_rows:
+        page_index.this_per_page.setdefault(this_row['page'], this_row['this'])
+
+    return page_index
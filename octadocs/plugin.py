@@ -1,20 +1,27 @@
 import logging
-import operator
-from functools import lru_cache, partial
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Optional
 
 import rdflib
 from livereload import Server
+from mkdocs.config import config_options
 from mkdocs.plugins import BasePlugin
-from mkdocs.structure.files import Files
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import Navigation
 from mkdocs.structure.pages import Page
 from octadocs.conversions import src_path_to_iri
+from octadocs.file_changes import FileChanges, file_change_tracker
+from octadocs.instrumentation import instrumentation
 from octadocs.navigation.processor import OctadocsNavigationProcessor
-from octadocs.octiron import Octiron
-from octadocs.query import Query, query
-from octadocs.stored_query import StoredQuery
+from octadocs.octiron import InferenceProfile, Octiron, SourceFile
+from octadocs.octiron.document_loader import document_loader
+from octadocs.octiron.octiron import CONTEXT_FORMATS
+from octadocs.page_index import PageIndex, build_page_index
+from octadocs.profiler import query_profiler
+from octadocs.query import Query, prepared_queries
+from octadocs.repeated_queries import repeated_query_detector
+from octadocs.stored_query import StoredQuery, stored_query_cache
 from octadocs.types import LOCAL
 from typing_extensions import TypedDict
 
@@ -51,82 +58,255 @@ class TemplateContext(TypedDict):
     rdfs: rdflib.Namespace
 
 
-def get_template_by_page(
-    page: Page,
-    graph: rdflib.ConjunctiveGraph,
-) -> Optional[str]:
-    """Find the template to render the given Markdown file."""
-    iri = rdflib.URIRef(f'{LOCAL}{page.file.src_path}')
+# Named graph of octadocs.yaml, loaded into the graph of every site.
+OCTADOCS_VOCABULARY = rdflib.URIRef('https://ns.octadocs.io/')
 
-    bindings = graph.query(
-        'SELECT ?template_name WHERE { ?iri octa:template ?template_name }',
-        initBindings={
-            'iri': iri,
-        },
-    ).bindings
 
-    if bindings:
-        return bindings[0]['template_name'].value
+def source_file(mkdocs_file: File) -> SourceFile:
+    """Describe a file of the site for import into the graph."""
+    return SourceFile(
+        path=Path(mkdocs_file.abs_src_path),
+        local_iri=src_path_to_iri(mkdocs_file.src_path),
+        global_url=f'/{mkdocs_file.url}',
+    )
 
-    return None
+
+def relative_src_path(path: Path, docs_dir: Path) -> str:
+    """Convert an absolute path under docs_dir into a MkDocs src_path."""
+    return str(path.relative_to(docs_dir))
 
 
 @lru_cache(None)
-def cached_octiron(docs_dir: Path) -> Octiron:
+def cached_octiron(
+    docs_dir: Path,
+    cache_directory: Optional[Path] = None,
+    incremental_inference: bool = False,
+    inference_profile: InferenceProfile = InferenceProfile.OWL_RL,
+) -> Octiron:
     """Retrieve cached Octiron instance or create it if absent."""
-    return Octiron(root_directory=docs_dir)
+    return Octiron(
+        root_directory=docs_dir,
+        cache_directory=cache_directory,
+        incremental_inference=incremental_inference,
+        inference_profile=inference_profile,
+    )
 
 
 class OctaDocsPlugin(BasePlugin):
     """MkDocs Meta plugin."""
 
+    config_scheme = (
+        # Directory, relative to the parent of docs_dir, to persist the graph
+        # in between builds, for instance `.octadocs`; add it to .gitignore.
+        # Persistence is disabled by default.
+        ('cache_directory', config_options.Type(str, default='')),
+
+        # Number of processes to read source files with.
+        ('workers', config_options.Type(int, default=1)),
+
+        # Local copies of remote JSON-LD documents, as a mapping from URL to
+        # file path relative to the parent of docs_dir.
+        ('contexts', config_options.Type(dict, default={})),
+
+        # Never download remote JSON-LD documents. Set to false to download
+        # those which are neither bundled nor cached.
+        ('offline', config_options.Type(bool, default=True)),
+
+        # Seconds to wait for a remote JSON-LD document to download.
+        ('network_timeout', config_options.Type(int, default=10)),
+
+        # On rebuilds, only infer consequences of the changed files.
+        ('incremental_inference', config_options.Type(bool, default=False)),
+
+        # Semantics to infer new facts with: `none` disables inference,
+        # `rdfs` and `owlrl` apply the closure under RDFS or OWL RL semantics,
+        # `custom` only runs the queries in `inference` directory. Custom
+        # queries are run after the closure too, except for `none`.
+        ('inference', config_options.Choice(
+            choices=[profile.value for profile in InferenceProfile],
+            default=InferenceProfile.OWL_RL.value,
+        )),
+
+        # JSON file, relative to the parent of docs_dir, to write the timings
+        # of every query executed during the build to. Set to an empty string
+        # to disable query profiling.
+        ('query_profile', config_options.Type(str, default='')),
+
+        # Warn when a page runs the same query with different bindings at
+        # least this many times, which usually means a query in a loop.
+        # Set to 0 to disable the check.
+        ('repeated_query_threshold', config_options.Type(int, default=0)),
+
+        # Log wall time of the build stages and counters of imported files.
+        ('build_timings', config_options.Type(bool, default=False)),
+
+        # JSON file, relative to the parent of docs_dir, to write the build
+        # stages to in Chrome trace event format, for chrome://tracing or
+        # Perfetto. Set to an empty string to disable.
+        ('build_trace', config_options.Type(str, default='')),
+    )
+
     octiron: Octiron
     stored_query: StoredQuery
+    page_index: PageIndex
 
     def on_config(self, config: Config) -> Config:
         """Initialize Octiron and provide graph to macros through the config."""
         docs_dir = Path(config['docs_dir'])
 
-        self.octiron = cached_octiron(
-            docs_dir=docs_dir,
+        instrumentation.reset(enabled=(
+            self.config['build_timings'] or bool(self.config['build_trace'])
+        ))
+        query_profiler.reset(enabled=bool(self.config['query_profile']))
+        repeated_query_detector.reset(
+            threshold=self.config['repeated_query_threshold'],
         )
 
-        self.stored_query = StoredQuery(
-            path=docs_dir.parent / 'queries',
-            executor=partial(
-                query,
-                instance=self.octiron.graph,
-            ),
-        )
+        with instrumentation.span('on_config', 'plugin'):
+            cache_directory = self.config['cache_directory']
+            cache_path = (
+                docs_dir.parent / cache_directory
+            ) if cache_directory else None
+
+            self.octiron = cached_octiron(
+                docs_dir=docs_dir,
+                cache_directory=cache_path,
+                incremental_inference=self.config['incremental_inference'],
+                inference_profile=InferenceProfile(self.config['inference']),
+            )
+
+            document_loader.configure(
+                cache_directory=cache_path,
+                bundled_contexts={
+                    url: docs_dir.parent / context_path
+                    for url, context_path in self.config['contexts'].items()
+                },
+                offline=self.config['offline'],
+                timeout=self.config['network_timeout'],
+            )
+
+            self.stored_query = StoredQuery(
+                path=docs_dir.parent / 'queries',
+                executor=self.octiron.query,
+                _text_cache=stored_query_cache,
+            )
 
-        if config['extra'] is None:
-            config['extra'] = {}  # type: ignore
+            if config['extra'] is None:
+                config['extra'] = {}  # type: ignore
 
-        config['extra'].update({
-            'graph': self.octiron.graph,
-            'octiron': self.octiron,
-            'queries': self.stored_query,
-        })
+            config['extra'].update({
+                'graph': self.octiron.graph,
+                'octiron': self.octiron,
+                'queries': self.stored_query,
+            })
 
         return config
 
+    def on_pre_build(self, config: Config) -> None:
+        """
+        Check stored queries for changes again.
+
+        Under `mkdocs serve`, this runs before every rebuild, so that edited
+        query files are read anew.
+        """
+        stored_query_cache.start_build()
+
     def on_files(self, files: Files, config: Config):
         """Extract metadata from files and compose the site graph."""
+        with instrumentation.span('on_files', 'plugin'):
+            self.octiron.forget_missing_files({
+                OCTADOCS_VOCABULARY,
+                *(
+                    src_path_to_iri(mkdocs_file.src_path)
+                    for mkdocs_file in files
+                ),
+            })
+
+            file_changes = file_change_tracker.take()
+
+            if self._can_update_incrementally(file_changes):
+                self.update_changed_files(
+                    files=files,
+                    file_changes=file_changes,  # type: ignore
+                    docs_dir=Path(config['docs_dir']),
+                )
+            else:
+                self.update_all_files(files)
+
+            self.octiron.save_persistent_cache()
+            self.octiron.apply_inference()
+
+            self.page_index = build_page_index(self.octiron.graph)
+
+    def update_all_files(self, files: Files) -> None:
+        """Check every file, and import those which are new or modified."""
         # Load the Octadocs vocabulary into graph
         self.octiron.update_from_file(
             path=Path(__file__).parent / 'octadocs.yaml',
-            local_iri=rdflib.URIRef('https://ns.octadocs.io/'),
+            local_iri=OCTADOCS_VOCABULARY,
             global_url='/octadocs.yaml',
         )
 
-        for mkdocs_file in files:
-            self.octiron.update_from_file(
-                path=Path(mkdocs_file.abs_src_path),
-                local_iri=src_path_to_iri(mkdocs_file.src_path),
-                global_url=f'/{mkdocs_file.url}',
+        self.octiron.update_from_files(
+            source_files=map(source_file, files),
+            workers=self.config['workers'],
+        )
+
+    def update_changed_files(
+        self,
+        files: Files,
+        file_changes: FileChanges,
+        docs_dir: Path,
+    ) -> None:
+        """
+        Only import the files the watcher has reported as changed.
+
+        Removed files are not in the site anymore, and their graphs are
+        dropped along with those of any other missing files.
+        """
+        changed_files = (
+            files.get_file_from_path(
+                relative_src_path(changed_path, docs_dir),
             )
+            for changed_path in file_changes.changed
+        )
+
+        self.octiron.update_from_files(
+            source_files=[
+                source_file(mkdocs_file)
+                for mkdocs_file in changed_files
+                if mkdocs_file is not None
+            ],
+            workers=self.config['workers'],
+        )
+
+    def _can_update_incrementally(
+        self,
+        file_changes: Optional[FileChanges],
+    ) -> bool:
+        """
+        Decide whether the reported changes are enough to update the graph.
+
+        Every file has to be checked if the changes are unknown, if the graph
+        is new, or if a context file has changed, because it affects other
+        files in its directory.
+        """
+        if file_changes is None or not (
+            self.octiron.fingerprint_per_file
+        ):
+            return False
+
+        return not any(
+            changed_path.name in CONTEXT_FORMATS
+            for changed_path in file_changes.paths
+        )
 
-        self.octiron.apply_inference()
+    def on_pre_page(self, page: Page, config: Config, files: Files) -> Page:
+        """Attribute queries run while reading the page to it."""
+        instrumentation.begin('markdown', 'page', page=page.file.src_path)
+        query_profiler.current_page = page.file.src_path
+        repeated_query_detector.current_page = page.file.src_path
+        return page
 
     def on_page_markdown(
         self,
@@ -136,9 +316,8 @@ class OctaDocsPlugin(BasePlugin):
         files: Files,
     ):
         """Inject page template path, if necessary."""
-        template_name = get_template_by_page(
-            page=page,
-            graph=self.octiron.graph,
+        template_name = self.page_index.template(
+            src_path_to_iri(page.file.src_path),
         )
 
         if template_name is not None:
@@ -146,6 +325,17 @@ class OctaDocsPlugin(BasePlugin):
 
         return markdown
 
+    def on_page_content(
+        self,
+        html: str,
+        page: Page,
+        config: Config,
+        files: Files,
+    ) -> str:
+        """Finish measuring the conversion of the page to HTML."""
+        instrumentation.end('markdown')
+        return html
+
     def on_page_context(
         self,
         context: TemplateContext,
@@ -154,33 +344,17 @@ class OctaDocsPlugin(BasePlugin):
         nav: Page,
     ) -> TemplateContext:
         """Attach the views to certain pages."""
-        page_iri = rdflib.URIRef(
-            f'{LOCAL}{page.file.src_path}',
-        )
-
-        this_choices = list(map(
-            operator.itemgetter(rdflib.Variable('this')),
-            self.octiron.graph.query(
-                'SELECT * WHERE { ?this octa:subjectOf ?page_iri }',
-                initBindings={
-                    'page_iri': page_iri,
-                },
-            ).bindings,
-        ))
-
-        if this_choices:
-            context['this'] = this_choices[0]
-        else:
-            context['this'] = page_iri
+        instrumentation.begin('render', 'page', page=page.file.src_path)
+        page_iri = src_path_to_iri(page.file.src_path)
+        query_profiler.current_page = page.file.src_path
+        repeated_query_detector.current_page = page.file.src_path
 
+        context['this'] = self.page_index.this(page_iri)
         context['graph'] = self.octiron.graph
         context['iri'] = page_iri
 
         # noinspection PyTypedDict
-        context['query'] = partial(
-            query,
-            instance=self.octiron.graph,
-        )
+        context['query'] = self.octiron.query
         context['queries'] = self.stored_query
         context['local'] = LOCAL
 
@@ -189,15 +363,65 @@ class OctaDocsPlugin(BasePlugin):
 
         return context
 
+    def on_post_page(self, output: str, page: Page, config: Config) -> str:
+        """Stop attributing queries to the page and report repeated ones."""
+        instrumentation.end('render')
+        query_profiler.current_page = None
+        repeated_query_detector.current_page = None
+        repeated_query_detector.finish_page(page.file.src_path)
+        return output
+
+    def on_post_build(self, config: Config) -> None:
+        """Write build timings and the query profile, if requested."""
+        if self.config['build_timings']:
+            instrumentation.log_summary()
+
+        if self.config['build_trace']:
+            instrumentation.write_chrome_trace(
+                Path(config['docs_dir']).parent / self.config['build_trace'],
+            )
+
+        if not query_profiler.enabled:
+            return
+
+        query_profiler.write_report(
+            path=Path(config['docs_dir']).parent / self.config['query_profile'],
+            caches={
+                'prepared query': (
+                    prepared_queries.hits,
+                    prepared_queries.misses,
+                ),
+                'query result': (
+                    self.octiron.query_results.hits,
+                    self.octiron.query_results.misses,
+                ),
+            },
+        )
+
     def on_serve(
         self,
         server: Server,
         config: Config,
         builder: Callable,  # type: ignore
     ) -> Server:
-        """Watch the stored queries directory if it exists."""
+        """
+        Watch the stored queries directory if it exists.
+
+        Track changes of source files, to only import those on rebuilds, and,
+        if incremental inference is enabled, infer consequences of the changes
+        only.
+        """
         stored_queries = Path(config['docs_dir']).parent / 'queries'
 
+        # Only the livereload server of MkDocs 1.2+ watches files via
+        # watchdog. With older versions, every rebuild checks all files.
+        observer = getattr(server, 'observer', None)
+        if observer is not None:
+            file_change_tracker.watch(observer, Path(config['docs_dir']))
+
+            if self.config['incremental_inference']:
+                self.octiron.start_incremental_inference()
+
         if stored_queries.is_dir():
             server.watch(str(stored_queries))
 
@@ -210,10 +434,11 @@ class OctaDocsPlugin(BasePlugin):
         files: Files,
     ) -> Navigation:
         """Update the site's navigation from the knowledge graph."""
-        if not config.get('nav'):
-            nav = OctadocsNavigationProcessor(
-                graph=self.octiron.graph,
-                navigation=nav,
-            ).generate()
+        with instrumentation.span('on_nav', 'plugin'):
+            if not config.get('nav'):
+                nav = OctadocsNavigationProcessor(
+                    graph=self.octiron.graph,
+                    navigation=nav,
+                ).generate()
 
         return nav
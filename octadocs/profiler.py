@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sized,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+QueryOutcome = TypeVar('QueryOutcome')
+
+# Hits and misses of a cache.
+CacheStatistics = Tuple[int, int]
+
+# How many queries and pages to list in the log summary.
+SUMMARY_SIZE = 10
+
+
+def hash_query(query_text: str) -> str:
+    """Short identifier of a query text."""
+    return hashlib.sha256(query_text.encode('utf-8')).hexdigest()[:12]
+
+
+def hit_rate(hits: int, misses: int) -> Optional[float]:
+    """Share of cache lookups which were hits."""
+    lookups = hits + misses
+    return hits / lookups if lookups else None
+
+
+@dataclass
+class QueryExecution:
+    """Measurements of a single query execution."""
+
+    query_hash: str
+    source: str
+    duration: float
+    row_count: Optional[int]
+    page: Optional[str]
+
+
+@dataclass
+class QueryProfiler:
+    """
+    Measure every query executed during a build.
+
+    Every execution is attributed to its source, like a stored query or a
+    macro, and to the page being rendered at the moment.
+    """
+
+    enabled: bool = False
+    current_page: Optional[str] = None
+    sources: List[str] = field(default_factory=list)
+    query_texts: Dict[str, str] = field(default_factory=dict)
+    executions: List[QueryExecution] = field(default_factory=list)
+
+    def reset(self, enabled: bool) -> None:
+        """Start profiling a new build."""
+        self.enabled = enabled
+        self.current_page = None
+        self.sources = []
+        self.query_texts = {}
+        self.executions = []
+
+    @contextmanager
+    def source(self, name: str) -> Iterator[None]:
+        """Attribute queries executed in this block to the given source."""
+        self.sources.append(name)
+        try:
+            yield
+        finally:
+            self.sources.pop()
+
+    def profile(
+        self,
+        source: str,
+        query_text: str,
+        execute: Callable[[], QueryOutcome],
+    ) -> QueryOutcome:
+        """
+        Execute a query and measure it.
+
+        Lazy query results are fetched in full, to measure all the work.
+        """
+        if not self.enabled:
+            return execute()
+
+        started = time.perf_counter()
+        query_outcome = execute()
+        row_count = len(query_outcome) if isinstance(
+            query_outcome, Sized,
+        ) else None
+        duration = time.perf_counter() - started
+
+        query_hash = hash_query(query_text)
+        self.query_texts[query_hash] = query_text
+        self.executions.append(QueryExecution(
+            query_hash=query_hash,
+            source=self.sources[-1] if self.sources else source,
+            duration=duration,
+            row_count=row_count,
+            page=self.current_page,
+        ))
+
+        return query_outcome
+
+    def report(
+        self,
+        caches: Mapping[str, CacheStatistics],
+    ) -> Dict[str, Any]:  # type: ignore
+        """Aggregate measurements per query and per page."""
+        executions_per_query = defaultdict(list)
+        duration_per_page: Dict[Optional[str], float] = defaultdict(float)
+        for execution in self.executions:
+            executions_per_query[execution.query_hash].append(execution)
+            duration_per_page[execution.page] += execution.duration
+
+        queries = sorted(
+            (
+                {
+                    'hash': query_hash,
+                    'text': self.query_texts[query_hash],
+                    'sources': sorted({
+                        execution.source for execution in executions
+                    }),
+                    'count': len(executions),
+                    'total_duration': sum(
+                        execution.duration for execution in executions
+                    ),
+                    'max_duration': max(
+                        execution.duration for execution in executions
+                    ),
+                    'rows': sum(
+                        execution.row_count or 0 for execution in executions
+                    ),
+                }
+                for query_hash, executions in executions_per_query.items()
+            ),
+            key=lambda query_summary: query_summary['total_duration'],
+            reverse=True,
+        )
+
+        pages = [
+            {'page': page, 'total_duration': duration}
+            for page, duration in sorted(
+                duration_per_page.items(),
+                key=lambda page_and_duration: page_and_duration[1],
+                reverse=True,
+            )
+        ]
+
+        return {
+            'total_duration': sum(
+                execution.duration for execution in self.executions
+            ),
+            'execution_count': len(self.executions),
+            'queries': queries,
+            'pages': pages,
+            'caches': {
+                cache_name: {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hit_rate(hits, misses),
+                }
+                for cache_name, (hits, misses) in caches.items()
+            },
+            'executions': [asdict(execution) for execution in self.executions],
+        }
+
+    def write_report(
+        self,
+        path: Path,
+        caches: Mapping[str, CacheStatistics],
+    ) -> None:
+        """Write the report as JSON and log its summary."""
+        report = self.report(caches)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, default=str))
+
+        log_summary(report)
+        logger.info('Query profile: written to %s', path)
+
+
+def log_summary(report: Mapping[str, Any]) -> None:  # type: ignore
+    """Log the slowest queries and pages, and cache hit rates."""
+    logger.info(
+        'Query profile: %s executions took %.3fs.',
+        report['execution_count'],
+        report['total_duration'],
+    )
+
+    for query_summary in report['queries'][:SUMMARY_SIZE]:
+        logger.info(
+            'Query profile: %s × %s took %.3fs (%s): %s',
+            query_summary['hash'],
+            query_summary['count'],
+            query_summary['total_duration'],
+            ', '.join(query_summary['sources']),
+            ' '.join(query_summary['text'].split())[:80],
+        )
+
+    for page_summary in report['pages'][:SUMMARY_SIZE]:
+        logger.info(
+            'Query profile: page %s took %.3fs.',
+            page_summary['page'] or '(no page)',
+            page_summary['total_duration'],
+        )
+
+    for cache_name, cache_summary in report['caches'].items():
+        hit_rate = cache_summary['hit_rate']
+        logger.info(
+            'Query profile: %s cache hit rate is %s.',
+            cache_name,
+            'unknown' if hit_rate is None else f'{hit_rate:.0%}',
+        )
+
+
+query_profiler = QueryProfiler()
@@ -1,8 +1,30 @@
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import rdflib
+from documented import DocumentedError
+from octadocs.profiler import query_profiler
 from rdflib import Graph, term
-from rdflib.plugins.sparql.processor import SPARQLResult
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.evaluate import evalQuery
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query as PreparedQuery
 from typing_extensions import Protocol
 
 SelectRow = Dict[str, term.Node]
@@ -17,13 +39,292 @@ class SelectResult(List[SelectRow]):
         return self[0] if self else None
 
 
+class LazySelectResult(Sequence[SelectRow]):  # noqa: WPS214
+    """
+    SPARQL SELECT query result which fetches rows when they are needed.
+
+    Iteration, `.first` and indexing fetch as few rows as possible. Operations
+    which need the whole result, like `len()`, fetch all of it.
+
+    This is a read-only `Sequence` rather than a `list`: list methods would
+    work on the rows fetched so far. Comparison and concatenation with lists
+    are supported; for anything else, convert it with `list()`.
+    """
+
+    def __init__(self, rows: Iterable[SelectRow]) -> None:
+        """Wrap an iterable of rows, which is consumed on demand."""
+        self._fetched_rows = SelectResult()
+        self._pending_rows = iter(rows)
+
+    @property
+    def first(self) -> Optional[SelectRow]:
+        """Return first element of the list."""
+        return self[0] if self else None
+
+    def __iter__(self) -> Iterator[SelectRow]:
+        """Iterate over rows, fetching them one by one."""
+        index = 0
+        while self._fetch(index + 1) > index:
+            yield self._fetched_rows[index]
+            index += 1
+
+    def __len__(self) -> int:
+        """Count all the rows."""
+        return self._fetch()
+
+    def __bool__(self) -> bool:
+        """Check if there is at least one row."""
+        return self._fetch(1) > 0
+
+    def __getitem__(self, index):  # type: ignore
+        """Fetch rows up to the requested one."""
+        if isinstance(index, int) and index >= 0:
+            self._fetch(index + 1)
+
+        elif (
+            isinstance(index, slice) and
+            index.stop is not None and
+            min(index.start or 0, index.stop, index.step or 1) >= 0
+        ):
+            self._fetch(index.stop)
+
+        else:
+            self._fetch()
+
+        if isinstance(index, slice):
+            return SelectResult(self._fetched_rows[index])
+
+        return self._fetched_rows[index]
+
+    def __contains__(self, row: object) -> bool:
+        """Check if the row is present in the result."""
+        return any(fetched_row == row for fetched_row in self)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare with a list or another result."""
+        if isinstance(other, LazySelectResult):
+            other = other._all_rows()  # noqa: WPS437
+
+        if not isinstance(other, list):
+            return NotImplemented
+
+        return self._all_rows() == other
+
+    def __add__(self, other: object) -> SelectResult:
+        """Concatenate with a list or another result."""
+        if not isinstance(other, (list, LazySelectResult)):
+            return NotImplemented
+
+        return SelectResult([*self._all_rows(), *other])
+
+    def __radd__(self, other: object) -> SelectResult:
+        """Concatenate a list with this result."""
+        if not isinstance(other, list):
+            return NotImplemented
+
+        return SelectResult([*other, *self._all_rows()])
+
+    def __repr__(self) -> str:
+        """Represent all the rows."""
+        return repr(self._all_rows())
+
+    def _all_rows(self) -> SelectResult:
+        """Fetch all the rows."""
+        self._fetch()
+        return self._fetched_rows
+
+    def _fetch(self, count: Optional[int] = None) -> int:
+        """
+        Fetch rows until there are `count` of them, or all if it is None.
+
+        Returns the number of rows fetched so far.
+        """
+        fetched_count = len(self._fetched_rows)
+        if count is None or count > fetched_count:
+            self._fetched_rows.extend(islice(
+                self._pending_rows,
+                None if count is None else count - fetched_count,
+            ))
+
+        return len(self._fetched_rows)
+
+
+@dataclass
+class ColumnarResult:
+    """SPARQL SELECT query result as a list of values per variable."""
+
+    variables: List[str]
+    columns: Dict[str, List[Optional[term.Node]]]
+
+    def __len__(self) -> int:
+        """Count the rows."""
+        return len(self.columns[self.variables[0]]) if self.variables else 0
+
+    def rows(self) -> Iterator[Tuple[Optional[term.Node], ...]]:
+        """Iterate over rows, as tuples of values in order of variables."""
+        return zip(*(self.columns[variable] for variable in self.variables))
+
+
+@dataclass
+class NotASelectQuery(DocumentedError):
+    """
+    Only the result of a SELECT query can be arranged in columns.
+
+    Query: {self.query_text}
+    """
+
+    query_text: str
+
+
+@dataclass
+class NotABatchableQuery(DocumentedError):
+    """
+    Only a SELECT query without aggregates can be run for many bindings at once.
+
+    Query: {self.query_text}
+    """
+
+    query_text: str
+
+
+@dataclass
+class InconsistentBindings(DocumentedError):
+    """
+    Every binding of a batched query must bind the same variables.
+
+    Expected: {self.expected}
+    Found: {self.found}
+    """
+
+    expected: List[str]
+    found: List[str]
+
+
 QueryResult = Union[
-    SelectResult,   # SELECT
-    Graph,          # CONSTRUCT
-    bool,           # ASK
+    SelectResult,       # SELECT
+    LazySelectResult,   # SELECT, rows fetched on demand
+    Graph,              # CONSTRUCT
+    bool,               # ASK
 ]
 
 
+# query_many() applies these to the solutions of every binding separately.
+PER_BINDING_MODIFIERS = frozenset({'Slice', 'Distinct', 'Reduced', 'Project'})
+
+# Query text and namespace bindings it was prepared with.
+PreparedQueryKey = Tuple[str, FrozenSet[Tuple[str, rdflib.URIRef]]]
+
+
+class PreparedQueryCache:
+    """
+    Least recently used cache of parsed and translated SPARQL queries.
+
+    Parsing a query takes longer than running it against a typical site
+    graph, and the same few queries are run for every page.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.prepared_queries: 'OrderedDict[PreparedQueryKey, PreparedQuery]'
+        self.prepared_queries = OrderedDict()
+
+    def get(
+        self,
+        query_text: str,
+        namespaces: Mapping[str, rdflib.URIRef],
+    ) -> PreparedQuery:
+        """Retrieve prepared query, parsing it if necessary."""
+        key = (query_text, frozenset(namespaces.items()))
+
+        prepared_query = self.prepared_queries.get(key)
+        if prepared_query is not None:
+            self.hits += 1
+            self.prepared_queries.move_to_end(key)
+            return prepared_query
+
+        self.misses += 1
+        prepared_query = prepareQuery(query_text, initNs=dict(namespaces))
+        self.prepared_queries[key] = prepared_query
+        if len(self.prepared_queries) > self.max_size:
+            self.prepared_queries.popitem(last=False)
+
+        return prepared_query
+
+
+prepared_queries = PreparedQueryCache()
+
+
+def prepare(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+) -> PreparedQuery:
+    """Prepare query with namespaces bound in the graph."""
+    return prepared_queries.get(query_text, dict(instance.namespaces()))
+
+
+# Graph generation, query text and bindings.
+QueryResultKey = Tuple[int, str, FrozenSet[Tuple[str, Any]]]  # type: ignore
+
+
+class QueryResultCache:
+    """
+    Least recently used results of queries against the current graph.
+
+    Generation of a graph is a number which grows every time the graph is
+    changed. Results of earlier generations are discarded.
+
+    A lazy result keeps the state of its query evaluation until all the rows
+    are fetched, so the number of cached results is limited.
+
+    Cached results are shared by all callers, and must not be modified.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.results: 'OrderedDict[QueryResultKey, QueryResult]'
+        self.results = OrderedDict()
+
+    def get(
+        self,
+        generation: int,
+        query_text: str,
+        bindings: Mapping[str, Any],  # type: ignore
+        execute: Callable[[], QueryResult],
+    ) -> QueryResult:
+        """Retrieve query result, executing the query if necessary."""
+        if generation != self.generation:
+            self.generation = generation
+            self.results = OrderedDict()
+
+        key = (generation, query_text, frozenset(bindings.items()))
+
+        try:
+            query_result = self.results.get(key)
+        except TypeError:
+            # Some of the bindings are not hashable.
+            return execute()
+
+        if query_result is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return query_result
+
+        self.misses += 1
+        query_result = execute()
+        self.results[key] = query_result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+        return query_result
+
+
 class Query(Protocol):
     """Query protocol."""
 
@@ -41,34 +342,278 @@ def query(
     instance: rdflib.ConjunctiveGraph,
     **kwargs: str,
 ) -> QueryResult:
-    """Run SPARQL SELECT query and return formatted result."""
-    sparql_result: SPARQLResult = instance.query(
-        query_text,
-        initBindings=kwargs,
+    """
+    Run SPARQL query and return formatted result.
+
+    Rows of a SELECT query result are fetched lazily.
+    """
+    return query_profiler.profile(
+        source='query',
+        query_text=query_text,
+        execute=partial(_query, query_text, instance, kwargs),
     )
 
-    if sparql_result.askAnswer is not None:
-        return sparql_result.askAnswer
 
-    if sparql_result.graph is not None:
-        graph: rdflib.Graph = sparql_result.graph
+def query_columns(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    **kwargs: str,
+) -> ColumnarResult:
+    """Run SPARQL SELECT query and return values of every variable."""
+    return query_profiler.profile(
+        source='query_columns',
+        query_text=query_text,
+        execute=partial(_query_columns, query_text, instance, kwargs),
+    )
+
+
+def query_many(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    bindings: Iterable[Mapping[str, Any]],  # type: ignore
+) -> List[SelectResult]:
+    """
+    Run SPARQL SELECT query for every binding in one evaluation.
+
+    Returns a result per binding, in the order of bindings. Bindings are
+    joined with the query like a VALUES clause, not substituted into it like
+    `query()` does; this only matters for variables which the query uses in
+    FILTER, BIND or OPTIONAL alone. Aggregates are not supported.
+    """
+    bindings = list(bindings)
+    return query_profiler.profile(
+        source='query_many',
+        query_text=query_text,
+        execute=partial(_query_many, query_text, instance, bindings),
+    )
+
+
+def _query(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    bindings: Mapping[str, Any],  # type: ignore
+) -> QueryResult:
+    """Run SPARQL query without profiling."""
+    evaluation = _evaluate(query_text, instance, bindings)
+
+    if evaluation['type_'] == 'ASK':
+        return evaluation['askAnswer']
+
+    if evaluation['type_'] == 'CONSTRUCT':
+        graph: rdflib.Graph = evaluation['graph']
         for prefix, namespace in instance.namespaces():
             graph.bind(prefix, namespace)
 
         return graph
 
-    return _format_query_bindings(sparql_result.bindings)
+    return LazySelectResult(
+        _format_query_bindings(evaluation['bindings']),
+    )
+
+
+def _query_columns(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    bindings: Mapping[str, Any],  # type: ignore
+) -> ColumnarResult:
+    """Run SPARQL SELECT query in columnar form without profiling."""
+    evaluation = _evaluate(query_text, instance, bindings)
+
+    if evaluation['type_'] != 'SELECT':
+        raise NotASelectQuery(query_text=query_text)
+
+    variables = evaluation['vars_']
+    columns: Dict[str, List[Optional[term.Node]]] = {
+        str(variable): [] for variable in variables
+    }
+
+    for row in evaluation['bindings']:
+        for variable in variables:
+            columns[str(variable)].append(row.get(variable))
+
+    return ColumnarResult(
+        variables=list(columns),
+        columns=columns,
+    )
+
+
+def _query_many(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    bindings: List[Mapping[str, Any]],  # type: ignore
+) -> List[SelectResult]:
+    """
+    Evaluate the query once, and join its solutions with all the bindings.
+
+    The pattern of the query is evaluated without bindings, and the join is
+    made by hashing, the way a VALUES clause would be joined. Projection,
+    DISTINCT, LIMIT and OFFSET then apply to the solutions of every binding
+    separately. ORDER BY applies before the solutions are split, which keeps
+    them in order.
+    """
+    select_results = [SelectResult() for _binding in bindings]
+    if not bindings:
+        return select_results
+
+    prepared_query = prepare(query_text, instance)
+    select_query = prepared_query.algebra
+    if select_query.name != 'SelectQuery':
+        raise NotABatchableQuery(query_text=query_text)
+
+    variable_names = sorted(bindings[0])
+    for binding in bindings:
+        if sorted(binding) != variable_names:
+            raise InconsistentBindings(
+                expected=variable_names,
+                found=sorted(binding),
+            )
+
+    modifiers = []
+    pattern = select_query.p
+    while pattern.name in PER_BINDING_MODIFIERS:
+        modifiers.append(pattern)
+        pattern = pattern.p
+
+    if _is_aggregate(pattern):
+        raise NotABatchableQuery(query_text=query_text)
+
+    # Equal bindings share the solutions.
+    variables = [rdflib.Variable(name) for name in variable_names]
+    indices_per_key: Dict[Tuple[term.Node, ...], List[int]] = {}
+    for index, binding in enumerate(bindings):
+        key = tuple(binding[variable_name] for variable_name in variable_names)
+        indices_per_key.setdefault(key, []).append(index)
+
+    pattern_query = CompValue(select_query.name, **select_query)
+    pattern_query['p'] = pattern
+    solutions = evalQuery(
+        instance,
+        PreparedQuery(prepared_query.prologue, pattern_query),
+        initBindings={},
+    )['bindings']
+
+    solutions_per_key = _join_with_keys(
+        solutions=solutions,
+        variables=variables,
+        keys=list(indices_per_key),
+    )
+
+    for key, key_solutions in solutions_per_key.items():
+        for modifier in reversed(modifiers):
+            key_solutions = _apply_modifier(modifier, key_solutions)
+
+        for index in indices_per_key[key]:
+            select_results[index] = SelectResult(key_solutions)
+
+    return select_results
+
+
+def _is_aggregate(pattern: CompValue) -> bool:
+    """Check if solutions of the pattern are grouped and aggregated."""
+    while pattern.name in {'OrderBy', 'Extend', 'Filter'}:
+        pattern = pattern.p
+
+    return pattern.name == 'AggregateJoin'
+
+
+def _join_with_keys(
+    solutions: Iterable[Mapping[rdflib.Variable, term.Node]],
+    variables: List[rdflib.Variable],
+    keys: List[Tuple[term.Node, ...]],
+) -> Dict[Tuple[term.Node, ...], List[Dict[Any, term.Node]]]:  # type: ignore
+    """
+    Distribute solutions among the keys they are compatible with.
+
+    A solution which leaves some of the variables unbound is compatible with
+    any value of them.
+    """
+    solutions_per_key: Dict[Tuple[term.Node, ...], List[Dict[Any, term.Node]]]
+    solutions_per_key = {key: [] for key in keys}
+
+    for solution in solutions:
+        solution_key = tuple(solution.get(variable) for variable in variables)
+        if None in solution_key:
+            matching_keys = [
+                key
+                for key in keys
+                if all(
+                    solution_value is None or solution_value == key_value
+                    for solution_value, key_value in zip(solution_key, key)
+                )
+            ]
+        elif solution_key in solutions_per_key:
+            matching_keys = [solution_key]
+        else:
+            continue
+
+        for key in matching_keys:
+            solutions_per_key[key].append({
+                **solution,
+                **dict(zip(variables, key)),
+            })
+
+    return solutions_per_key
+
+
+def _apply_modifier(  # type: ignore
+    modifier: CompValue,
+    solutions: List[Dict[Any, term.Node]],
+) -> List[Dict[Any, term.Node]]:
+    """Apply a solution modifier to the solutions of one binding."""
+    if modifier.name == 'Project':
+        return [
+            {
+                str(variable): solution[variable]
+                for variable in modifier.PV
+                if solution.get(variable) is not None
+            }
+            for solution in solutions
+        ]
+
+    if modifier.name == 'Slice':
+        stop = None if modifier.length is None else (
+            modifier.start + modifier.length
+        )
+        return solutions[modifier.start:stop]
+
+    # DISTINCT, and REDUCED which is allowed to do the same.
+    seen_solutions = set()
+    distinct_solutions = []
+    for solution in solutions:
+        frozen_solution = frozenset(solution.items())
+        if frozen_solution not in seen_solutions:
+            seen_solutions.add(frozen_solution)
+            distinct_solutions.append(solution)
+
+    return distinct_solutions
+
+
+def _evaluate(
+    query_text: str,
+    instance: rdflib.ConjunctiveGraph,
+    bindings: Mapping[str, Any],  # type: ignore
+) -> Dict[str, Any]:  # type: ignore
+    """
+    Evaluate a query without collecting its result.
+
+    Unlike `instance.query()`, rows of a SELECT query are not stored.
+    """
+    return evalQuery(
+        instance,
+        prepare(query_text, instance),
+        initBindings=bindings,
+    )
 
 
 def _format_query_bindings(
-    bindings: List[Dict[rdflib.Variable, term.Identifier]],
-) -> SelectResult:
+    bindings: Iterable[Mapping[rdflib.Variable, term.Identifier]],
+) -> Iterator[SelectRow]:
     """
     Format bindings before returning them.
 
     Converts Variable to str for ease of addressing.
     """
-    return SelectResult(
+    return (
         {
             str(variable_name): rdf_value
             for variable_name, rdf_value
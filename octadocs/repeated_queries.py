@@ -0,0 +1,147 @@
+import inspect
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, DefaultDict, FrozenSet, List, Mapping, Optional, Tuple
+
+from jinja2 import Environment
+
+logger = logging.getLogger(__name__)
+
+# Bindings of a single query execution, in a hashable form.
+BindingsKey = FrozenSet[Tuple[str, str]]
+
+# Template and query shape of a group of executions.
+RepetitionKey = Tuple[str, str]
+
+# IRIs and string literals written right into the query text. Templates
+# often interpolate them instead of passing bindings.
+CONSTANT = re.compile(
+    r'<[^<>\s"{}|^`\\]*>|"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'',
+)
+
+
+@dataclass(frozen=True)
+class RepeatedQuery:
+    """A query executed many times on a page, each time with new bindings."""
+
+    page: str
+    template: str
+    query_text: str
+    count: int
+
+
+def query_shape(query_text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Split query text into its shape and the constants it was filled with.
+
+    Two queries share their shape if they only differ in whitespace, IRIs and
+    string literals.
+    """
+    constants = tuple(CONSTANT.findall(query_text))
+    shape = ' '.join(CONSTANT.sub('?', query_text).split())
+    return shape, constants
+
+
+def find_template(default: str) -> str:
+    """
+    Find the Jinja2 template which the query is executed from.
+
+    Jinja2 executes compiled templates with the environment and the template
+    name in their globals. Templates rendered from a string, like Markdown
+    pages under mkdocs-macros, have no name and are reported under the
+    default one.
+    """
+    frame = inspect.currentframe()
+    while frame is not None:
+        if isinstance(frame.f_globals.get('environment'), Environment):
+            return frame.f_globals.get('name') or default
+
+        frame = frame.f_back
+
+    return default
+
+
+@dataclass
+class RepeatedQueryDetector:
+    """
+    Find the N+1 query pattern on every page.
+
+    A template which loops over query results and runs another query for
+    every row executes a query of the same shape over and over again, only
+    with different bindings or constants. Such queries are reported once the
+    page is rendered.
+    """
+
+    threshold: int = 0
+    current_page: Optional[str] = None
+    bindings_per_page: DefaultDict[
+        str, DefaultDict[RepetitionKey, set],
+    ] = field(default_factory=lambda: defaultdict(lambda: defaultdict(set)))
+
+    @property
+    def enabled(self) -> bool:
+        """Detection is enabled by a positive threshold."""
+        return self.threshold > 0
+
+    def reset(self, threshold: int) -> None:
+        """Start detecting for a new build."""
+        self.threshold = threshold
+        self.current_page = None
+        self.bindings_per_page.clear()
+
+    def record(
+        self,
+        query_text: str,
+        bindings: Mapping[str, Any],  # type: ignore
+    ) -> None:
+        """Remember that a query was executed with the given bindings."""
+        if not self.enabled or self.current_page is None:
+            return
+
+        shape, constants = query_shape(query_text)
+        bindings_key: BindingsKey = frozenset(
+            (name, repr(binding_value))
+            for name, binding_value in bindings.items()
+        )
+        if constants:
+            bindings_key |= {('', repr(constants))}
+
+        if not bindings_key:
+            return
+
+        template = find_template(default=self.current_page)
+        self.bindings_per_page[self.current_page][
+            (template, shape)
+        ].add(bindings_key)
+
+    def finish_page(self, page: str) -> List[RepeatedQuery]:
+        """Report queries the page has executed too many times."""
+        repeated_queries = [
+            RepeatedQuery(
+                page=page,
+                template=template,
+                query_text=query_text,
+                count=len(bindings_keys),
+            )
+            for (template, query_text), bindings_keys in (
+                self.bindings_per_page.pop(page, {}).items()
+            )
+            if len(bindings_keys) >= self.threshold
+        ]
+
+        for repeated_query in repeated_queries:
+            logger.warning(
+                'N+1 queries: %s (%s) ran the same query %s times with '
+                'different bindings, consider query_many(): %s',
+                repeated_query.page,
+                repeated_query.template,
+                repeated_query.count,
+                ' '.join(repeated_query.query_text.split())[:80],
+            )
+
+        return repeated_queries
+
+
+repeated_query_detector = RepeatedQueryDetector()
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, cast
+
+import rdflib
+from octadocs.octiron import Octiron
+from octadocs.profiler import query_profiler
+from octadocs.query import SelectResult, query
+
+
+@dataclass
+class ResourceMaps:
+    """URL and label of every resource which has them."""
+
+    url_per_resource: Dict[rdflib.term.Node, str] = field(
+        default_factory=dict,
+    )
+    label_per_resource: Dict[rdflib.term.Node, Any] = field(  # type: ignore
+        default_factory=dict,
+    )
+
+
+def build_resource_maps(graph: rdflib.ConjunctiveGraph) -> ResourceMaps:
+    """Look up URLs and labels of all resources at once."""
+    resource_maps = ResourceMaps()
+
+    url_rows = cast(SelectResult, query(
+        '''
+            SELECT ?resource ?url WHERE {
+                ?resource octa:subjectOf/octa:url ?url .
+            }
+        ''',
+        instance=graph,
+    ))
+    for url_row in url_rows:
+        resource_maps.url_per_resource.setdefault(
+            url_row['resource'],
+            '/' + url_row['url'].value,
+        )
+
+    label_rows = cast(SelectResult, query(
+        '''
+            SELECT ?resource ?label WHERE {
+                ?resource rdfs:label ?label .
+            }
+        ''',
+        instance=graph,
+    ))
+    for label_row in label_rows:
+        resource_maps.label_per_resource.setdefault(
+            label_row['resource'],
+            label_row['label'].value,
+        )
+
+    return resource_maps
+
+
+@dataclass
+class Resolver:
+    """
+    Convert resources to URLs and labels for templates.
+
+    Lookup maps are built on first use and rebuilt whenever the graph changes.
+    """
+
+    octiron: Octiron
+    generation: Optional[int] = None
+    resource_maps: ResourceMaps = field(default_factory=ResourceMaps)
+
+    def url(self, resource: rdflib.term.Node) -> Optional[str]:
+        """Convert a resource to a clickable URL."""
+        return self._current_maps().url_per_resource.get(resource)
+
+    def urls(
+        self,
+        resources: Iterable[rdflib.term.Node],
+    ) -> List[Optional[str]]:
+        """Convert a list of resources to clickable URLs."""
+        url_per_resource = self._current_maps().url_per_resource
+        return [url_per_resource.get(resource) for resource in resources]
+
+    def label(
+        self,
+        resource: rdflib.term.Node,
+    ) -> Optional[Any]:  # type: ignore
+        """Find human readable label of a resource."""
+        return self._current_maps().label_per_resource.get(resource)
+
+    def labels(
+        self,
+        resources: Iterable[rdflib.term.Node],
+    ) -> List[Optional[Any]]:  # type: ignore
+        """Find human readable labels of a list of resources."""
+        label_per_resource = self._current_maps().label_per_resource
+        return [label_per_resource.get(resource) for resource in resources]
+
+    def _current_maps(self) -> ResourceMaps:
+        """Rebuild lookup maps if the graph has changed since."""
+        if self.generation != self.octiron.generation:
+            with query_profiler.source('url/label'):
+                self.resource_maps = build_resource_maps(self.octiron.graph)
+            self.generation = self.octiron.generation
+
+        return self.resource_maps
@@ -1,8 +1,9 @@
 import dataclasses
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional, Set
 
 from documented import DocumentedError
+from octadocs.profiler import query_profiler
 from octadocs.query import QueryResult
 from typing_extensions import Protocol
 
@@ -30,22 +31,78 @@ class QueryNotFound(DocumentedError):
     path: Path
 
 
+@dataclasses.dataclass(frozen=True)
+class CachedQueryText:
+    """Text of a stored query file and its modification time."""
+
+    modification_time: float
+    text: str
+
+
+class StoredQueryCache:
+    """
+    Texts of stored queries, reused while the files stay unchanged.
+
+    Modification time of every file is checked once per build; the queries
+    used on every page are thus read from disk at most once.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self.texts: Dict[Path, CachedQueryText] = {}
+        self.checked_paths: Set[Path] = set()
+
+    def start_build(self) -> None:
+        """Check modification times again, since the files might change."""
+        self.checked_paths = set()
+
+    def read(self, path: Path) -> str:
+        """Read query text from cache or from disk."""
+        cached_text = self.texts.get(path)
+        if cached_text is not None and path in self.checked_paths:
+            return cached_text.text
+
+        modification_time = path.stat().st_mtime
+        if (
+            cached_text is None or
+            cached_text.modification_time != modification_time
+        ):
+            cached_text = CachedQueryText(
+                modification_time=modification_time,
+                text=path.read_text(),
+            )
+            self.texts[path] = cached_text
+
+        self.checked_paths.add(path)
+        return cached_text.text
+
+
+stored_query_cache = StoredQueryCache()
+
+
 @dataclasses.dataclass(frozen=True)
 class StoredQuery:
     """
     Stored SPARQL query access interface.
 
     Accepts `executor`, which is a function that accepts query text and params,
-    returning the query execution result.
+    returning the query execution result. Query texts are read via
+    `_text_cache`, if provided; the field is private for `queries.cache` to
+    still resolve a stored query named `cache`.
     """
 
     path: Path
     executor: QueryExecutor
+    _text_cache: Optional[StoredQueryCache] = dataclasses.field(
+        default=None,
+        repr=False,
+    )
 
     def __call__(self, **kwargs) -> QueryResult:
         """Execute the query."""
         text = self._read_query_text()
-        return self.executor(text, **kwargs)
+        with query_profiler.source(f'StoredQuery {self.path.name}'):
+            return self.executor(text, **kwargs)
 
     def _append(self, segment: str) -> 'StoredQuery':
         """Append another segment to the path."""
@@ -59,6 +116,9 @@ class StoredQuery:
         query_path = self.path.with_name(f'{self.path.name}.sparql')
 
         try:
+            if self._text_cache is not None:
+                return self._text_cache.read(query_path)
+
             return query_path.read_text()
         except FileNotFoundError as err:
             raise QueryNotFound(path=query_path) from err
@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+
+from benchmarks.corpus import CorpusParameters, generate_corpus
+from benchmarks.suite import find_regressions, run_pipeline
+
+TINY = CorpusParameters(
+    page_count=5,
+    directory_depth=1,
+    context_file_count=1,
+    front_matter_size=2,
+    vocabulary_size=2,
+    rule_count=1,
+)
+
+
+def test_corpus():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        docs_dir = generate_corpus(root, TINY)
+
+        pages = sorted(docs_dir.glob('**/page-*.md'))
+        assert len(pages) == 5
+        assert len(list(docs_dir.glob('**/context.yaml'))) == 1
+        assert len(list((root / 'inference').glob('*.sparql'))) == 1
+
+
+def test_pipeline():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        timings = run_pipeline(Path(temp_dir), TINY)
+
+    assert set(timings) == {
+        'update_from_file',
+        'apply_inference',
+        'navigation',
+        'macro queries',
+    }
+
+
+def test_regressions():
+    baseline = {'small': {'apply_inference': 1.0, 'navigation': 0.01}}
+    timings = {'small': {'apply_inference': 1.5, 'navigation': 0.03}}
+
+    assert find_regressions(
+        timings=timings,
+        baseline=baseline,
+        tolerance=0.25,
+        noise_floor=0.05,
+    ) == ['small / apply_inference: 1.500s, baseline 1.000s']
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from octadocs.octiron import Octiron
+from rdflib import Literal, URIRef
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+
+def test_clear_named_graphs():
+    """Several named graphs are cleared at once, others stay intact."""
+    octiron = Octiron(root_directory=DATA_DIR)
+
+    yaml_iri = URIRef('local:test.yaml')
+    markdown_iri = URIRef('local:test.md')
+    octiron.update_from_file(path=DATA_DIR / 'test.yaml', local_iri=yaml_iri)
+    octiron.update_from_file(path=DATA_DIR / 'test.md', local_iri=markdown_iri)
+
+    # Not a valid IRI in SPARQL syntax
+    odd_iri = URIRef('local:odd> name.md')
+    octiron.graph.add((odd_iri, odd_iri, Literal('odd'), odd_iri))
+
+    kept_iri = URIRef('local:kept.md')
+    octiron.graph.add((kept_iri, kept_iri, Literal('kept'), kept_iri))
+
+    expected_count = sum(
+        len(octiron.graph.get_context(local_iri))
+        for local_iri in (yaml_iri, markdown_iri, odd_iri)
+    )
+
+    generation = octiron.generation
+    assert octiron.clear_named_graphs(
+        [yaml_iri, markdown_iri, odd_iri],
+    ) == expected_count
+    assert octiron.generation > generation
+
+    assert list(octiron.graph.quads()) == [
+        (kept_iri, kept_iri, Literal('kept'), octiron.graph.get_context(
+            kept_iri,
+        )),
+    ]
@@ -0,0 +1,74 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from octadocs.octiron import Octiron, SourceFile
+from rdflib import URIRef
+
+
+def test_context_is_cached():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_directory = Path(temp_dir)
+        (docs_directory / 'context.yaml').write_text(data='foo: bar')
+
+        octiron = Octiron(root_directory=docs_directory)
+
+        context = octiron.get_context_per_directory(docs_directory)
+        assert context['foo'] == 'bar'
+        assert octiron.get_context_per_directory(docs_directory) is context
+
+
+def test_context_is_invalidated():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_directory = Path(temp_dir)
+        context_path = docs_directory / 'context.yaml'
+        context_path.write_text(data='foo: bar')
+
+        posts_directory = docs_directory / 'posts'
+        posts_directory.mkdir()
+
+        octiron = Octiron(root_directory=docs_directory)
+        assert octiron.get_context_per_directory(
+            posts_directory,
+        )['foo'] == 'bar'
+
+        context_path.write_text(data='foo: baz')
+        modification_time = context_path.stat().st_mtime + 1
+        os.utime(context_path, (modification_time, modification_time))
+
+        assert octiron.get_context_per_directory(
+            posts_directory,
+        )['foo'] == 'baz'
+
+        (posts_directory / 'context.json').write_text(data='{"foo": "qux"}')
+
+        assert octiron.get_context_per_directory(
+            posts_directory,
+        )['foo'] == 'qux'
+
+
+def test_context_files_are_found_once_per_update():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_directory = Path(temp_dir)
+        source_files = []
+        for page_name in ('a', 'b', 'c'):
+            page_path = docs_directory / f'{page_name}.md'
+            page_path.write_text(f'---\ntitle: {page_name}\n---\n')
+            source_files.append(SourceFile(
+                path=page_path,
+                local_iri=URIRef(f'local:{page_name}.md'),
+            ))
+
+        octiron = Octiron(root_directory=docs_directory)
+        with patch.object(
+            Octiron,
+            '_find_context_files',
+            autospec=True,
+            side_effect=Octiron._find_context_files,  # noqa: WPS437
+        ) as find_context_files:
+            octiron.update_from_files(source_files)
+            octiron.update_from_files(source_files)
+
+    assert find_context_files.call_count == 2
+    assert octiron.context_fingerprint_per_directory is None
@@ -0,0 +1,83 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from octadocs.octiron.document_loader import (
+    CachingDocumentLoader,
+    RemoteDocumentUnavailable,
+)
+from octadocs.octiron.yaml_extensions import as_triple_stream
+from rdflib import Literal, URIRef
+
+CONTEXT_URL = 'https://example.com/context.jsonld'
+REMOTE_DOCUMENT = {  # noqa: WPS407
+    'contentType': 'application/ld+json',
+    'contextUrl': None,
+    'documentUrl': CONTEXT_URL,
+    'document': {'@context': {'name': 'https://schema.org/name'}},
+}
+
+
+def test_bundled_context():
+    """Remote contexts are taken from the bundle, without network access."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundled_path = Path(temp_dir) / 'context.jsonld'
+        bundled_path.write_text(json.dumps(REMOTE_DOCUMENT['document']))
+
+        loader = CachingDocumentLoader(
+            bundled_contexts={CONTEXT_URL: bundled_path},
+            offline=True,
+        )
+
+        with patch('octadocs.octiron.yaml_extensions.document_loader', loader):
+            triples = set(as_triple_stream(
+                raw_data={
+                    '$context': CONTEXT_URL,
+                    '$id': 'https://example.com/alice',
+                    'name': 'Alice',
+                },
+                context={},
+                local_iri='local:alice.yaml',
+            ))
+
+    assert (
+        URIRef('https://example.com/alice'),
+        URIRef('https://schema.org/name'),
+        Literal('Alice'),
+    ) in triples
+
+
+def test_download_is_cached_on_disk():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_directory = Path(temp_dir)
+
+        with patch.object(
+            CachingDocumentLoader,
+            '_network_loader',
+        ) as network_loader:
+            network_loader.return_value = REMOTE_DOCUMENT
+
+            loader = CachingDocumentLoader(
+                cache_directory=cache_directory,
+                offline=False,
+            )
+            assert loader(CONTEXT_URL) == REMOTE_DOCUMENT
+            assert loader(CONTEXT_URL) == REMOTE_DOCUMENT
+
+        network_loader.assert_called_once()
+
+        offline_loader = CachingDocumentLoader(
+            cache_directory=cache_directory,
+            offline=True,
+        )
+        assert offline_loader(CONTEXT_URL) == REMOTE_DOCUMENT
+
+
+def test_offline_by_default():
+    loader = CachingDocumentLoader()
+
+    with pytest.raises(RemoteDocumentUnavailable):
+        loader(CONTEXT_URL)
+
@@ -0,0 +1,147 @@
+import subprocess  # noqa: S404
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+from unittest.mock import patch
+
+from mkdocs.structure.files import File, Files
+from octadocs.file_changes import FileChanges, FileChangeTracker
+from octadocs.octiron import Octiron
+from octadocs.plugin import OctaDocsPlugin
+from rdflib import URIRef
+
+
+class FakeEvent(NamedTuple):
+    """Looks like a watchdog file system event."""
+
+    event_type: str
+    src_path: str
+    dest_path: Optional[str] = None
+    is_directory: bool = False
+
+
+class FakeObserver:
+    """Stands in for the watchdog observer of the live reload server."""
+
+    def __init__(self):
+        """Nothing is scheduled yet."""
+        self.handlers = []
+
+    def schedule(self, handler, path, recursive):
+        """Remember the handler."""
+        self.handlers.append(handler)
+
+
+def test_tracker():
+    tracker = FileChangeTracker()
+    assert tracker.take() is None
+
+    tracker.watch(FakeObserver(), Path('/docs'))
+    tracker.dispatch(FakeEvent('modified', '/docs/a.md'))
+    tracker.dispatch(FakeEvent('moved', '/docs/b.md', '/docs/c.md'))
+    tracker.dispatch(FakeEvent('deleted', '/docs/d.md'))
+
+    assert tracker.take() == FileChanges(
+        changed=frozenset({Path('/docs/a.md'), Path('/docs/c.md')}),
+        removed=frozenset({Path('/docs/b.md'), Path('/docs/d.md')}),
+    )
+    assert tracker.take() == FileChanges(
+        changed=frozenset(),
+        removed=frozenset(),
+    )
+
+    tracker.dispatch(
+        FakeEvent('deleted', '/docs/section', is_directory=True),
+    )
+    assert tracker.take() is None
+    assert tracker.take() is not None
+
+
+def test_serve_rebuild():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_dir = Path(temp_dir) / 'docs'
+        docs_dir.mkdir()
+        for page_name in ('index', 'about', 'contact'):
+            (docs_dir / f'{page_name}.md').write_text(
+                f'---\ntitle: {page_name}\n---\n',
+            )
+
+        config = {'docs_dir': str(docs_dir), 'extra': {}}
+        files = Files([
+            File(
+                path=page_path.name,
+                src_dir=str(docs_dir),
+                dest_dir=str(Path(temp_dir) / 'site'),
+                use_directory_urls=True,
+            )
+            for page_path in sorted(docs_dir.iterdir())
+        ])
+
+        plugin = OctaDocsPlugin()
+        plugin.load_config({'cache_directory': '', 'inference': 'none'})
+        tracker = FileChangeTracker()
+
+        with patch('octadocs.plugin.file_change_tracker', tracker):
+            plugin.on_config(config)
+            plugin.on_files(files, config)
+
+            tracker.watch(FakeObserver(), docs_dir)
+            tracker.dispatch(FakeEvent('modified', str(docs_dir / 'about.md')))
+            tracker.dispatch(FakeEvent('deleted', str(docs_dir / 'contact.md')))
+            (docs_dir / 'contact.md').unlink()
+            files.remove(files.get_file_from_path('contact.md'))
+
+            with patch.object(
+                Octiron,
+                'prepare_import',
+                autospec=True,
+                side_effect=Octiron.prepare_import,
+            ) as prepare_import:
+                plugin.on_files(files, config)
+
+    assert [
+        call.args[1].name
+        for call in prepare_import.call_args_list
+    ] == ['about.md']
+
+    graph = plugin.octiron.graph
+    assert not list(graph.get_context(URIRef('local:contact.md')))
+    assert list(graph.get_context(URIRef('local:index.md')))
+
+
+class FakeServer:
+    """Stands in for the live reload server."""
+
+    def __init__(self):
+        """Own a fake observer."""
+        self.observer = FakeObserver()
+
+    def watch(self, path):
+        """Ignore the watched path."""
+
+
+def test_serve_respects_incremental_inference_option():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = {'docs_dir': temp_dir, 'extra': {}}
+
+        plugin = OctaDocsPlugin()
+        plugin.load_config({'cache_directory': '', 'inference': 'none'})
+
+        with patch('octadocs.plugin.file_change_tracker', FileChangeTracker()):
+            plugin.on_config(config)
+            with patch.object(
+                plugin.octiron,
+                'start_incremental_inference',
+            ) as start_incremental_inference:
+                plugin.on_serve(FakeServer(), config, builder=None)
+
+    start_incremental_inference.assert_not_called()
+
+
+def test_plugin_does_not_require_watchdog():
+    without_watchdog = 'import sys; sys.modules["watchdog"] = None; '
+    subprocess.run(  # noqa: S603
+        [sys.executable, '-c', without_watchdog + 'import octadocs.plugin'],
+        check=True,
+    )
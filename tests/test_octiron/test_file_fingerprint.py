@@ -0,0 +1,116 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from octadocs.octiron import Octiron
+from octadocs.octiron.fingerprint import fingerprint_file
+from octadocs.octiron.ingestion import SourceFile
+from rdflib import URIRef
+
+PAGE = '---\ntitle: {title}\n---\n'
+
+
+def create_site(docs_dir: Path) -> None:
+    """Two pages, one of them in a section with its own context."""
+    (docs_dir / 'section').mkdir(parents=True)
+    (docs_dir / 'index.md').write_text(PAGE.format(title='Home'))
+    (docs_dir / 'section' / 'page.md').write_text(PAGE.format(title='Page'))
+    (docs_dir / 'section' / 'context.yaml').write_text('{}\n')
+
+
+def update(octiron: Octiron, docs_dir: Path):
+    """Import the site and list the files which had to be loaded again."""
+    source_files = [
+        SourceFile(
+            path=path,
+            local_iri=URIRef(f'local:{path.relative_to(docs_dir)}'),
+        )
+        for path in sorted(docs_dir.rglob('*.md'))
+    ]
+    tasks = [
+        octiron.prepare_import(
+            path=source_file.path,
+            local_iri=source_file.local_iri,
+        )
+        for source_file in source_files
+    ]
+    octiron.update_from_files(source_files)
+    return [task.local_iri for task in tasks if task is not None]
+
+
+def test_fingerprint_reuses_content_hash():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'index.md'
+        path.write_text('content')
+
+        fingerprint = fingerprint_file(path, context_hash='context')
+        assert fingerprint_file(
+            path,
+            context_hash='context',
+            previous=fingerprint,
+        ) == fingerprint
+        assert not fingerprint.matches(
+            fingerprint_file(path, context_hash='another context'),
+        )
+
+
+def test_touched_file_is_skipped():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_dir = Path(temp_dir)
+        create_site(docs_dir)
+
+        octiron = Octiron(root_directory=docs_dir)
+        octiron.update_from_files([
+            SourceFile(path=docs_dir / 'index.md', local_iri=URIRef('local:a')),
+        ])
+
+        index = docs_dir / 'index.md'
+        stat = index.stat()
+        os.utime(index, (stat.st_atime, stat.st_mtime + 10))
+
+        assert octiron.prepare_import(
+            path=index,
+            local_iri=URIRef('local:a'),
+        ) is None
+        assert octiron.fingerprint_per_file[
+            URIRef('local:a')
+        ].modification_time == stat.st_mtime + 10
+
+        index.write_text(PAGE.format(title='Changed'))
+        assert octiron.prepare_import(
+            path=index,
+            local_iri=URIRef('local:a'),
+        ) is not None
+
+
+def test_context_change_expires_subtree():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_dir = Path(temp_dir)
+        create_site(docs_dir)
+
+        octiron = Octiron(root_directory=docs_dir)
+        assert len(update(octiron, docs_dir)) == 2
+        assert not update(octiron, docs_dir)
+
+        context_file = docs_dir / 'section' / 'context.yaml'
+        context_file.write_text('title: rdfs:label\n')
+        stat = context_file.stat()
+        os.utime(context_file, (stat.st_atime, stat.st_mtime + 10))
+
+        assert update(octiron, docs_dir) == [URIRef('local:section/page.md')]
+
+
+def test_assets_are_not_hashed():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image = Path(temp_dir) / 'image.png'
+        image.write_bytes(b'\x89PNG')
+
+        octiron = Octiron(root_directory=Path(temp_dir))
+        with patch('octadocs.octiron.octiron.fingerprint_file') as fingerprint:
+            assert octiron.prepare_import(
+                path=image,
+                local_iri=URIRef('local:image.png'),
+            ) is None
+
+        fingerprint.assert_not_called()
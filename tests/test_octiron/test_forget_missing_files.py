@@ -0,0 +1,31 @@
+import tempfile
+from pathlib import Path
+
+from octadocs.octiron import Octiron
+from rdflib import URIRef
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+KEPT = URIRef('local:test.yaml')
+REMOVED = URIRef('local:test.md')
+
+
+def test_forget_missing_files():
+    """Graphs of files which are not in the site anymore are dropped."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        octiron = Octiron(
+            root_directory=DATA_DIR,
+            cache_directory=Path(temp_dir),
+        )
+        octiron.update_from_file(path=DATA_DIR / 'test.yaml', local_iri=KEPT)
+        octiron.update_from_file(path=DATA_DIR / 'test.md', local_iri=REMOVED)
+        removed_quad_count = len(octiron.graph.get_context(REMOVED))
+        kept_quads = set(octiron.graph.get_context(KEPT))
+
+        assert octiron.forget_missing_files({KEPT}) == removed_quad_count
+        assert octiron.forget_missing_files({KEPT}) == 0
+
+        assert not len(octiron.graph.get_context(REMOVED))
+        assert set(octiron.graph.get_context(KEPT)) == kept_quads
+        assert set(octiron.fingerprint_per_file) == {KEPT}
+        assert set(octiron.persistent_cache.graphs) == {KEPT}
@@ -0,0 +1,53 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from octadocs.octiron.plugins.markdown import (
+    process_yaml_scanner_error,
+    read_front_matter,
+)
+from yaml.scanner import ScannerError
+
+
+def write_page(directory: str, content: bytes) -> Path:
+    """Write a Markdown file."""
+    path = Path(directory) / 'page.md'
+    path.write_bytes(content)
+    return path
+
+
+def test_prose_is_not_read():
+    """Whatever follows the front matter is not read."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_page(
+            temp_dir,
+            b'\n---\ntitle: Hello\n----  \n\n# Hello\n\n' +
+            b'Prose.\n' * 100000 +
+            b'\xff\xfe\n',
+        )
+        assert read_front_matter(path) == {'title': 'Hello'}
+
+
+@pytest.mark.parametrize('content', [
+    b'# Hello\n',
+    b'',
+    b'---\ntitle: Hello\n',
+    b'---\n- title\n---\n',
+])
+def test_no_front_matter(content):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert read_front_matter(write_page(temp_dir, content)) == {}
+
+
+def test_tab_error():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_page(temp_dir, b'---\ntitle:\n\tsub: 1\n---\n')
+
+        with pytest.raises(ScannerError) as error_info:
+            read_front_matter(path)
+
+        assert error_info.value.problem_mark.line == 2
+        assert 'tabs' in process_yaml_scanner_error(
+            err=error_info.value,
+            path=path,
+        ).explanation
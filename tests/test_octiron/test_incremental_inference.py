@@ -0,0 +1,148 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from octadocs.octiron import InferenceProfile, Octiron
+from octadocs.octiron.owlrl_named_graph import INFERENCE
+from rdflib import URIRef
+
+PREFIXES = """
+@prefix ex: <https://example.com/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+"""
+
+SCHEMA = """
+ex:Person rdfs:subClassOf ex:Agent .
+ex:Agent rdfs:subClassOf ex:Being .
+ex:knows rdfs:domain ex:Person ; rdfs:range ex:Person .
+ex:friendOf rdfs:subPropertyOf ex:knows .
+ex:title rdfs:subPropertyOf rdfs:label .
+"""
+
+PEOPLE = """
+ex:alice ex:friendOf ex:bob ; ex:age 42 .
+ex:carol a ex:Person ; ex:title "Carol" .
+"""
+
+OWL_CONSTRUCTS = 'ex:knows a owl:SymmetricProperty .'
+
+CHANGES = [  # noqa: WPS407
+    # Addition only
+    ('people.ttl', PEOPLE + 'ex:dave a ex:Agent .', False),
+
+    # A triple inferred before is now stated, and not inferred anymore
+    ('people.ttl', PEOPLE + 'ex:bob a ex:Person .', False),
+
+    # Removal of instance data
+    ('people.ttl', 'ex:carol a ex:Person ; ex:title "Carol" .', False),
+
+    # Nothing uses rdfs:label as a predicate anymore, so its descriptions are
+    # found by full inference
+    ('people.ttl', PEOPLE.replace(' ; ex:title "Carol"', ''), True),
+
+    # Removal of a schema triple
+    (
+        'schema.ttl',
+        SCHEMA.replace('ex:Agent rdfs:subClassOf ex:Being .', ''),
+        False,
+    ),
+
+    # Conclusions of a schema triple which mentions vocabulary terms cannot
+    # be traced, so its removal forces full inference
+    (
+        'schema.ttl',
+        SCHEMA.replace('ex:title rdfs:subPropertyOf rdfs:label .', ''),
+        True,
+    ),
+
+    # Removal of an OWL construct forces full inference
+    ('owl.ttl', '', True),
+]
+
+
+def write(path: Path, turtle: str, timestamp: int):
+    """Write a Turtle file with a given modification time."""
+    path.write_text(PREFIXES + turtle)
+    os.utime(path, (timestamp, timestamp))
+
+
+def import_files(octiron: Octiron, directory: Path):
+    """Import every Turtle file in the directory and apply inference."""
+    for path in sorted(directory.glob('*.ttl')):
+        octiron.update_from_file(
+            path=path,
+            local_iri=URIRef(f'local:{path.name}'),
+        )
+
+    octiron.apply_inference()
+
+
+def inferred_triples(octiron: Octiron):
+    """Retrieve triples in the inference graph."""
+    return set(octiron.graph.get_context(INFERENCE))
+
+
+@pytest.mark.parametrize(
+    'profile',
+    [InferenceProfile.RDFS, InferenceProfile.OWL_RL],
+)
+@pytest.mark.parametrize(('file_name', 'turtle', 'is_full'), CHANGES)
+def test_incremental_inference(
+    file_name: str,
+    turtle: str,
+    is_full: bool,
+    profile: InferenceProfile,
+):
+    """Incremental inference gives the same result as the full one."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+
+        write(directory / 'schema.ttl', SCHEMA, 1000)
+        write(directory / 'people.ttl', PEOPLE, 1000)
+        write(directory / 'owl.ttl', OWL_CONSTRUCTS, 1000)
+
+        incremental = Octiron(
+            root_directory=directory,
+            incremental_inference=True,
+            inference_profile=profile,
+        )
+        import_files(incremental, directory)
+
+        write(directory / file_name, turtle, 2000)
+
+        with patch.object(
+            incremental,
+            'apply_full_inference',
+            wraps=incremental.apply_full_inference,
+        ) as apply_full_inference:
+            import_files(incremental, directory)
+
+        assert apply_full_inference.called == is_full
+
+        full = Octiron(root_directory=directory, inference_profile=profile)
+        import_files(full, directory)
+
+        assert inferred_triples(incremental) == inferred_triples(full)
+        assert set(incremental.graph) == set(full.graph)
+
+
+def test_nothing_changed():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        write(directory / 'people.ttl', PEOPLE, 1000)
+
+        octiron = Octiron(root_directory=directory, incremental_inference=True)
+        import_files(octiron, directory)
+
+        with patch.object(octiron, 'apply_full_inference') as full:
+            with patch.object(
+                octiron,
+                'apply_incremental_inference',
+            ) as incremental:
+                import_files(octiron, directory)
+
+        full.assert_not_called()
+        incremental.assert_not_called()
@@ -0,0 +1,76 @@
+import tempfile
+from pathlib import Path
+
+from octadocs.octiron import InferenceProfile, Octiron
+from octadocs.octiron.owlrl_named_graph import INFERENCE
+from rdflib import OWL, RDF, Literal, Namespace, URIRef
+
+EX = Namespace('https://example.com/')
+
+PEOPLE = """
+@prefix ex: <https://example.com/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Person rdfs:subClassOf ex:Agent .
+ex:alice a ex:Person .
+"""
+
+CUSTOM_RULE = """
+PREFIX ex: <https://example.com/>
+
+INSERT { ?person ex:greeting "Hello" } WHERE { ?person a ex:Person }
+"""
+
+
+def infer(profile: InferenceProfile):
+    """Import test data and apply inference with given profile."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+
+        docs_directory = directory / 'docs'
+        docs_directory.mkdir()
+        (docs_directory / 'people.ttl').write_text(PEOPLE)
+
+        inference_directory = directory / 'inference'
+        inference_directory.mkdir()
+        (inference_directory / 'greeting.sparql').write_text(CUSTOM_RULE)
+
+        octiron = Octiron(
+            root_directory=docs_directory,
+            inference_profile=profile,
+        )
+        octiron.update_from_file(
+            path=docs_directory / 'people.ttl',
+            local_iri=URIRef('local:people.ttl'),
+        )
+        octiron.apply_inference()
+
+        return set(octiron.graph.get_context(INFERENCE))
+
+
+def test_none():
+    assert not infer(InferenceProfile.NONE)
+
+
+def test_custom():
+    assert infer(InferenceProfile.CUSTOM) == {
+        (EX.alice, EX.greeting, Literal('Hello')),
+    }
+
+
+def test_rdfs():
+    inferred_triples = infer(InferenceProfile.RDFS)
+
+    assert (EX.alice, RDF.type, EX.Agent) in inferred_triples
+    assert (EX.alice, EX.greeting, Literal('Hello')) in inferred_triples
+    assert not any(
+        predicate == OWL.sameAs
+        for _subject, predicate, _object in inferred_triples
+    )
+
+
+def test_owl_rl():
+    inferred_triples = infer(InferenceProfile.OWL_RL)
+
+    assert (EX.alice, RDF.type, EX.Agent) in inferred_triples
+    assert (EX.alice, OWL.sameAs, EX.alice) in inferred_triples
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from octadocs.instrumentation import Instrumentation, instrumentation
+from octadocs.octiron import Octiron
+from rdflib import URIRef
+
+
+def test_disabled():
+    disabled = Instrumentation()
+
+    with disabled.span('on_files', 'plugin'):
+        disabled.count('files skipped')
+    disabled.begin('render', 'page', page='index.md')
+    disabled.end('render')
+
+    assert not disabled.spans
+    assert not disabled.counters
+
+
+def test_summary_and_trace():
+    enabled = Instrumentation()
+    enabled.reset(enabled=True)
+
+    with enabled.span('on_files', 'plugin'):
+        for page in ('index.md', 'about.md'):
+            enabled.begin('render', 'page', page=page)
+            enabled.end('render')
+            enabled.count('pages')
+
+    assert [
+        (span_summary.name, span_summary.count)
+        for span_summary in sorted(
+            enabled.summary(),
+            key=lambda span_summary: span_summary.name,
+        )
+    ] == [('on_files', 1), ('render', 2)]
+
+    trace_events = enabled.chrome_trace()['traceEvents']
+    assert [trace_event['ph'] for trace_event in trace_events] == [
+        'X', 'X', 'X', 'C',
+    ]
+    assert trace_events[0]['args'] == {'page': 'index.md'}
+    assert trace_events[-1]['args'] == {'pages': 2}
+
+
+def test_loader_spans():
+    instrumentation.reset(enabled=True)
+    try:
+        Octiron(root_directory=Path(__file__).parent).update_from_file(
+            path=Path(__file__).parent / 'data/test.yaml',
+            local_iri=URIRef('local:test.yaml'),
+        )
+        span_names = {span.name for span in instrumentation.spans}
+        counters = dict(instrumentation.counters)
+    finally:
+        instrumentation.reset(enabled=False)
+
+    assert 'YAMLLoader' in span_names
+    assert counters['files loaded via YAMLLoader'] == 1
@@ -0,0 +1,132 @@
+import pytest
+from octadocs.octiron.jsonld_compiler import (
+    UnsupportedDocument,
+    compile_context,
+    compile_document,
+)
+from octadocs.octiron.yaml_extensions import _triples_via_pyld
+from octadocs.types import DEFAULT_CONTEXT, LOCAL
+
+CUSTOM_CONTEXT = {
+    **DEFAULT_CONTEXT,
+    'ex': 'https://example.com/vocab#',
+    'name': 'ex:name',
+    'knows': {'@id': 'ex:knows', '@type': '@id'},
+    'kind': {'@id': 'ex:kind', '@type': '@vocab'},
+    'published': {'@id': 'ex:published', '@type': 'xsd:date'},
+    'ex:homepage': {'@type': '@id'},
+}
+
+SUPPORTED_DOCUMENTS = [  # noqa: WPS407
+    {'@id': 'test', 'title': 'Hey, I am a test!'},
+    {'@id': 'local:test.md', 'label': 'Label', 'comment': 'Comment'},
+    {'@id': 'rdfs:Class', '@type': 'rdfs:Class', 'rdfs:subClassOf': 'Thing'},
+    {'@id': 'foo/bar#baz', '@type': ['Page', 'schema:Thing']},
+    {'@id': '../up', 'position': 3, 'draft': True, 'ratio': 0.25},
+    {'@id': 'https://example.com/x', 'schema:name': ['a', 'b', None]},
+    {
+        '@id': 'spo',
+        'infer': [
+            {'rdf:subject': 's'},
+            {'rdf:predicate': 'p', 'nested': {'rdf:object': 'o'}},
+        ],
+        'empty': {},
+        'reference': {'@id': 'elsewhere'},
+    },
+    {
+        '@id': 'merged',
+        'label': {'comment': 'first'},
+        'rdfs:label': [{'comment': 'second'}, 'plain'],
+    },
+    {
+        '@id': 'alice',
+        'name': 'Alice',
+        'knows': ['bob', 'ex:carol', 'https://example.com/dave'],
+        'kind': 'Person',
+        'published': '2021-05-01',
+        'ex:homepage': 'https://alice.example.com/',
+        'ex:friend': {'@type': 'ex:Person', 'name': 'Eve'},
+    },
+    {'@id': 'https://example.com/x', 'octa:subjectOf': 'local:x.md'},
+    {
+        '@id': 'https://example.com',
+        '@type': 'https://example.org',
+        'knows': 'https://example.net',
+        'https://example.com/path/../name': 'normalized',
+        'rdfs:seeAlso': {'@id': 'local:a//b'},
+    },
+]
+
+UNSUPPORTED_DOCUMENTS = [  # noqa: WPS407
+    {'@id': 'x', 'label': {'@value': 'foo', '@language': 'en'}},
+    {'@id': 'x', 'items': {'@list': [1, 2, 3]}},
+    {'@id': 'x', '@included': [{'@id': 'y'}]},
+    {'@id': '_:x', 'label': 'blank'},
+    {'@id': 'x', 'published': 2021},
+    {'@id': 'x', 'matrix': [[1, 2], [3, 4]]},
+    {'@id': 'x', 'nan': float('nan')},
+]
+
+
+@pytest.mark.parametrize('context', [DEFAULT_CONTEXT, CUSTOM_CONTEXT])
+@pytest.mark.parametrize('document', SUPPORTED_DOCUMENTS)
+def test_same_as_pyld(document, context):
+    """Compiler output must be identical to the pyld round trip."""
+    context = dict(context)
+    compiled = compile_document(
+        document=document,
+        context=compile_context(context),
+        base=str(LOCAL),
+    )
+
+    assert set(compiled) == set(_triples_via_pyld(
+        meta_data=document,
+        context=context,
+    ))
+
+
+@pytest.mark.parametrize('document', UNSUPPORTED_DOCUMENTS)
+def test_unsupported_document(document):
+    """Documents beyond the supported subset are rejected."""
+    with pytest.raises(UnsupportedDocument):
+        compile_document(
+            document=document,
+            context=compile_context(CUSTOM_CONTEXT),
+            base=str(LOCAL),
+        )
+
+
+@pytest.mark.parametrize(('document', 'context'), [
+    ({'@id': 'x', 'a b': 'v'}, DEFAULT_CONTEXT),
+    ({'@id': 'x', 'ex:a b': 'v'}, CUSTOM_CONTEXT),
+    ({'@id': 'x', 'relative': 'v'}, {'ex': 'https://example.com/vocab#'}),
+])
+def test_keys_dropped_by_pyld(document, context):
+    """
+    Keys pyld drops are left to pyld.
+
+    Without @vocab, keys are not resolved against the base IRI; keys with
+    whitespace do not expand into valid IRIs.
+    """
+    context = dict(context)
+    with pytest.raises(UnsupportedDocument):
+        compile_document(
+            document=document,
+            context=compile_context(context),
+            base=str(LOCAL),
+        )
+
+    assert not set(_triples_via_pyld(meta_data=document, context=context))
+
+
+@pytest.mark.parametrize('context', [
+    {'@language': 'en'},
+    {'@vocab': 'relative'},
+    {'alias': '@id'},
+    {'items': {'@id': 'ex:items', '@container': '@list'}},
+    ['https://schema.org/'],
+])
+def test_unsupported_context(context):
+    """Contexts beyond the supported subset are rejected."""
+    with pytest.raises(UnsupportedDocument):
+        compile_context(context)
@@ -0,0 +1,114 @@
+import pytest
+from octadocs.macros import table
+from octadocs.query import (
+    LazySelectResult,
+    NotASelectQuery,
+    query,
+    query_columns,
+)
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+
+def numbered_rows(fetched):
+    """Generate rows, recording how many of them were fetched."""
+    for number in range(10):
+        fetched.append(number)
+        yield {'number': Literal(number)}
+
+
+def test_rows_are_fetched_on_demand():
+    fetched = []
+    select_result = LazySelectResult(numbered_rows(fetched))
+    assert not fetched
+
+    assert select_result.first == {'number': Literal(0)}
+    assert len(fetched) == 1
+
+    assert select_result[2] == {'number': Literal(2)}
+    assert len(select_result[:4]) == 4
+    assert len(fetched) == 4
+
+    for row in select_result:
+        if row['number'].value == 5:
+            break
+    assert len(fetched) == 6
+
+    assert len(select_result) == 10
+    assert select_result == [{'number': Literal(number)} for number in range(10)]
+
+
+def test_empty():
+    select_result = LazySelectResult([])
+    assert not select_result
+    assert select_result.first is None
+    assert select_result == []
+
+
+def people():
+    graph = ConjunctiveGraph()
+    graph.bind('ex', EX)
+    graph.add((EX.alice, EX.name, Literal('Alice')))
+    graph.add((EX.alice, EX.age, Literal(42)))
+    graph.add((EX.bob, EX.name, Literal('Bob')))
+    return graph
+
+
+QUERY_TEXT = '''
+SELECT ?name ?age WHERE {
+    ?person ex:name ?name .
+    OPTIONAL { ?person ex:age ?age }
+} ORDER BY ?name
+'''
+
+
+def test_query():
+    select_result = query(QUERY_TEXT, instance=people())
+
+    assert isinstance(select_result, LazySelectResult)
+    assert select_result == [
+        {'name': Literal('Alice'), 'age': Literal(42)},
+        {'name': Literal('Bob')},
+    ]
+
+
+def test_query_columns():
+    columnar_result = query_columns(QUERY_TEXT, instance=people())
+
+    assert columnar_result.variables == ['name', 'age']
+    assert columnar_result.columns == {
+        'name': [Literal('Alice'), Literal('Bob')],
+        'age': [Literal(42), None],
+    }
+    assert list(columnar_result.rows()) == [
+        (Literal('Alice'), Literal(42)),
+        (Literal('Bob'), None),
+    ]
+
+
+def test_query_columns_requires_select():
+    with pytest.raises(NotASelectQuery):
+        query_columns('ASK { ?s ?p ?o }', instance=people())
+
+
+def test_table_from_columns():
+    markdown_table = table(query_columns(QUERY_TEXT, instance=people()))
+
+    assert '| name | age |' in markdown_table
+    assert '| Bob |  |' in markdown_table
+
+
+def test_not_a_list():
+    """List operations never see a partially fetched result."""
+    rows = [{'number': Literal(number)} for number in range(3)]
+
+    select_result = LazySelectResult(iter(rows))
+    assert select_result.first == rows[0]
+    assert select_result + [] == rows
+    assert [] + LazySelectResult(iter(rows)) == rows
+    assert list(reversed(LazySelectResult(iter(rows)))) == rows[::-1]
+    assert LazySelectResult(iter(rows)).index(rows[1]) == 1
+
+    with pytest.raises(AttributeError):
+        select_result.sort()  # type: ignore
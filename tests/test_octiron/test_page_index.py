@@ -0,0 +1,23 @@
+from octadocs.page_index import build_page_index
+from octadocs.types import LOCAL, OCTA
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+
+def test_page_index():
+    graph = ConjunctiveGraph()
+    graph.bind('octa', OCTA)
+
+    about = LOCAL['about.md']
+    index = LOCAL['index.md']
+
+    graph.add((about, OCTA.template, Literal('person.html')))
+    graph.add((EX.alice, OCTA.subjectOf, about))
+
+    page_index = build_page_index(graph)
+
+    assert page_index.template(about) == 'person.html'
+    assert page_index.template(index) is None
+    assert page_index.this(about) == EX.alice
+    assert page_index.this(index) == index
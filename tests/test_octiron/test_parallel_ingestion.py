@@ -0,0 +1,116 @@
+import json
+import logging
+import multiprocessing
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from octadocs.octiron import Octiron, SourceFile
+from octadocs.octiron.document_loader import document_loader
+from octadocs.octiron.ingestion import WorkerBatch
+from rdflib import RDFS, Literal, URIRef
+
+CONTEXT_URL = 'https://example.com/context.jsonld'
+
+
+def test_parallel_ingestion():
+    """Worker processes produce the same graph as sequential import."""
+    data_dir = Path(__file__).parent / 'data'
+
+    source_files = [
+        SourceFile(
+            path=data_dir / file_name,
+            local_iri=URIRef(f'local:{file_name}'),
+        )
+        for file_name in ('test.md', 'test.yaml', 'rdfs.ttl')
+    ]
+
+    sequential = Octiron(root_directory=data_dir)
+    sequential.update_from_files(source_files)
+
+    parallel = Octiron(root_directory=data_dir)
+    parallel.update_from_files(source_files, workers=2)
+
+    assert set(parallel.graph.quads()) == set(sequential.graph.quads())
+
+
+def test_workers_use_bundled_contexts(caplog, monkeypatch):
+    """Workers started from scratch resolve contexts like the main process."""
+    spawn_context = multiprocessing.get_context('spawn')
+    monkeypatch.setattr(
+        multiprocessing,
+        'get_context',
+        lambda method=None: spawn_context,
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        (directory / 'context.jsonld').write_text(json.dumps({
+            '@context': {'name': 'https://schema.org/name'},
+        }))
+        source_files = []
+        for name in ('alice', 'bob'):
+            (directory / f'{name}.yaml').write_text(
+                f'$context: {CONTEXT_URL}\n'
+                f'$id: https://example.com/{name}\n'
+                f'name: {name}\n',
+            )
+            source_files.append(SourceFile(
+                path=directory / f'{name}.yaml',
+                local_iri=URIRef(f'local:{name}.yaml'),
+            ))
+
+        document_loader.configure(
+            bundled_contexts={CONTEXT_URL: directory / 'context.jsonld'},
+        )
+        octiron = Octiron(root_directory=directory)
+        try:
+            with caplog.at_level(logging.INFO):
+                octiron.update_from_files(source_files, workers=2)
+        finally:
+            document_loader.configure()
+
+    assert (
+        URIRef('https://example.com/bob'),
+        URIRef('https://schema.org/name'),
+        Literal('bob'),
+    ) in set(octiron.graph.triples((None, None, None)))
+    assert 'Retrying' not in caplog.text
+
+
+def test_batches():
+    """Contexts are sent once per batch, and a batch is stored at once."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        source_files = []
+        for index in range(16):
+            (directory / f'{index}.yaml').write_text(
+                f'$id: https://example.com/{index}\nlabel: Page {index}\n',
+            )
+            source_files.append(SourceFile(
+                path=directory / f'{index}.yaml',
+                local_iri=URIRef(f'local:{index}.yaml'),
+            ))
+
+        octiron = Octiron(root_directory=directory)
+        tasks = [
+            octiron.prepare_import(*source_file)
+            for source_file in source_files
+        ]
+        worker_batch = WorkerBatch.from_tasks(tasks)
+
+        with patch.object(
+            octiron.graph,
+            'addN',
+            wraps=octiron.graph.addN,
+        ) as add_quads:
+            octiron.update_from_files(source_files, workers=2)
+
+    assert list(worker_batch.context_per_directory) == [directory]
+    assert not any(task.context for task in worker_batch.tasks)
+    assert add_quads.call_count == 8
+    assert (
+        URIRef('https://example.com/15'),
+        RDFS.label,
+        Literal('Page 15'),
+    ) in set(octiron.graph.triples((None, None, None)))
@@ -0,0 +1,92 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from octadocs.octiron import Octiron
+from octadocs.octiron.ingestion import ImportTask
+from octadocs.octiron.persistent_cache import PersistentCache
+from octadocs.types import OCTA
+from rdflib import Literal, URIRef
+
+LOCAL_IRI = URIRef('local:test.yaml')
+
+
+def test_restore_from_persistent_cache():
+    """Unchanged files are restored from disk instead of being re-imported."""
+    data_dir = Path(__file__).parent / 'data'
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_directory = Path(temp_dir)
+
+        octiron = Octiron(
+            root_directory=data_dir,
+            cache_directory=cache_directory,
+        )
+        octiron.update_from_file(
+            path=data_dir / 'test.yaml',
+            local_iri=LOCAL_IRI,
+        )
+        octiron.save_persistent_cache()
+
+        cold_octiron = Octiron(
+            root_directory=data_dir,
+            cache_directory=cache_directory,
+        )
+
+        with patch.object(ImportTask, 'load') as load:
+            cold_octiron.update_from_file(
+                path=data_dir / 'test.yaml',
+                local_iri=LOCAL_IRI,
+            )
+
+        load.assert_not_called()
+        assert set(cold_octiron.graph.quads()) == set(octiron.graph.quads())
+
+
+def test_cache_of_another_version_is_discarded():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PersistentCache(directory=Path(temp_dir))
+        cache.store(LOCAL_IRI, fingerprint=None, triples=[])
+        cache.save()
+
+        assert LOCAL_IRI in PersistentCache.load(Path(temp_dir)).graphs
+
+        with patch(
+            'octadocs.octiron.persistent_cache.octadocs_version',
+            return_value='0.0.0',
+        ):
+            assert not PersistentCache.load(Path(temp_dir)).graphs
+
+
+def test_page_url_change_expires_cache():
+    """A page is imported again if its URL changes, since it is stored."""
+    data_dir = Path(__file__).parent / 'data'
+    page_iri = URIRef('local:test.md')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_directory = Path(temp_dir)
+
+        octiron = Octiron(
+            root_directory=data_dir,
+            cache_directory=cache_directory,
+        )
+        octiron.update_from_file(
+            path=data_dir / 'test.md',
+            local_iri=page_iri,
+            global_url='/a/',
+        )
+        octiron.save_persistent_cache()
+
+        cold_octiron = Octiron(
+            root_directory=data_dir,
+            cache_directory=cache_directory,
+        )
+        cold_octiron.update_from_file(
+            path=data_dir / 'test.md',
+            local_iri=page_iri,
+            global_url='/a.html',
+        )
+
+    assert set(cold_octiron.graph.objects(page_iri, OCTA.url)) == {
+        Literal('/a.html'),
+    }
@@ -0,0 +1,43 @@
+from octadocs.query import PreparedQueryCache, query
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+QUERY_TEXT = 'SELECT ?name WHERE { ?person ex:name ?name }'
+
+
+def test_hits_and_misses():
+    cache = PreparedQueryCache()
+    namespaces = {'ex': EX}
+
+    prepared_query = cache.get(QUERY_TEXT, namespaces)
+    assert cache.get(QUERY_TEXT, namespaces) is prepared_query
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    other_namespaces = {'ex': Namespace('https://example.org/')}
+    assert cache.get(QUERY_TEXT, other_namespaces) is not prepared_query
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cache = PreparedQueryCache(max_size=2)
+    namespaces = {'ex': EX}
+
+    first = cache.get(QUERY_TEXT, namespaces)
+    cache.get('ASK { ?s ?p ?o }', namespaces)
+    cache.get(QUERY_TEXT, namespaces)
+    cache.get('SELECT * WHERE { ?s ?p ?o }', namespaces)
+
+    assert len(cache.prepared_queries) == 2
+    assert cache.get(QUERY_TEXT, namespaces) is first
+
+
+def test_query_with_bindings():
+    graph = ConjunctiveGraph()
+    graph.bind('ex', EX)
+    graph.add((EX.alice, EX.name, Literal('Alice')))
+    graph.add((EX.bob, EX.name, Literal('Bob')))
+
+    for person, name in [(EX.alice, 'Alice'), (EX.bob, 'Bob')]:
+        rows = query(QUERY_TEXT, instance=graph, person=person)
+        assert rows == [{'name': Literal(name)}]
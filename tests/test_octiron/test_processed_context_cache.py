@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from octadocs.octiron import yaml_extensions
+from octadocs.octiron.context import ProcessedContextCache, hash_context
+from octadocs.octiron.yaml_extensions import as_triple_stream
+from octadocs.types import DEFAULT_CONTEXT
+
+# Language maps are not supported by the native compiler; pyld handles them.
+LANGUAGE_CONTEXT = {
+    **DEFAULT_CONTEXT,
+    'title': {'@id': 'rdfs:label', '@container': '@language'},
+}
+
+
+def test_hash_context_ignores_key_order():
+    assert hash_context({'a': 1, 'b': {'c': 2, 'd': 3}}) == hash_context(
+        {'b': {'d': 3, 'c': 2}, 'a': 1},
+    )
+    assert hash_context({'a': 1}) != hash_context({'a': 2})
+
+
+def test_processed_context_cache_evicts_oldest():
+    cache = ProcessedContextCache(max_size=2)
+
+    assert cache.get('a', lambda: 'A') == 'A'
+    assert cache.get('b', lambda: 'B') == 'B'
+    assert cache.get('a', lambda: 'not called') == 'A'
+
+    cache.get('c', lambda: 'C')
+    assert list(cache.processed_contexts) == ['a', 'c']
+
+
+def test_pyld_context_is_processed_once():
+    """Documents sharing a context process it only once."""
+    documents = [
+        {'@id': f'page-{number}', 'title': {'en': f'Page {number}'}}
+        for number in range(3)
+    ]
+    yaml_extensions.jsonld_processor.processed_contexts = (
+        ProcessedContextCache()
+    )
+
+    with patch.object(
+        yaml_extensions.jsonld.JsonLdProcessor,
+        'process_context',
+        autospec=True,
+        side_effect=yaml_extensions.jsonld.JsonLdProcessor.process_context,
+    ) as process_context:
+        triples = [
+            set(as_triple_stream(
+                raw_data=document,
+                context=LANGUAGE_CONTEXT,
+                local_iri='local:test.yaml',
+            ))
+            for document in documents
+        ]
+
+    assert process_context.call_count == 1
+    assert triples[2] == set(yaml_extensions._triples_via_pyld(  # noqa: WPS437
+        meta_data={
+            **documents[2],
+            'octa:subjectOf': 'local:test.yaml',
+        },
+        context=LANGUAGE_CONTEXT,
+    ))
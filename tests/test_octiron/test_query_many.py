@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+import pytest
+from octadocs.query import (
+    InconsistentBindings,
+    NotABatchableQuery,
+    query,
+    query_many,
+)
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+NAME = 'SELECT ?name WHERE { ?person ex:name ?name } ORDER BY ?name'
+
+
+def people() -> ConjunctiveGraph:
+    """Graph of people, one of them with two names."""
+    graph = ConjunctiveGraph()
+    graph.bind('ex', EX)
+    graph.add((EX.alice, EX.name, Literal('Alice')))
+    graph.add((EX.bob, EX.name, Literal('Bob')))
+    graph.add((EX.bob, EX.name, Literal('Robert')))
+    return graph
+
+
+def test_same_as_query():
+    graph = people()
+    bindings = [
+        {'person': EX.bob},
+        {'person': EX.alice},
+        {'person': EX.carol},
+        {'person': EX.bob},
+    ]
+
+    assert query_many(NAME, instance=graph, bindings=bindings) == [
+        query(NAME, instance=graph, **binding)
+        for binding in bindings
+    ]
+
+
+def test_limit_applies_per_binding():
+    select_results = query_many(
+        NAME + ' LIMIT 1',
+        instance=people(),
+        bindings=[{'person': EX.alice}, {'person': EX.bob}],
+    )
+
+    assert select_results == [
+        [{'name': Literal('Alice')}],
+        [{'name': Literal('Bob')}],
+    ]
+
+
+def test_evaluated_once():
+    graph = people()
+    bindings = [{'person': EX.alice}, {'person': EX.bob}, {'person': EX.carol}]
+
+    with patch.object(graph, 'triples', wraps=graph.triples) as triples:
+        query_many(NAME, instance=graph, bindings=bindings)
+
+    assert triples.call_count == 1
+
+
+def test_distinct_and_unbound_variables():
+    graph = people()
+    graph.add((EX.alice, EX.nickname, Literal('Al')))
+    select_results = query_many(
+        'SELECT DISTINCT ?person ?nickname WHERE { ' +
+        '?person ex:name ?name . ' +
+        'OPTIONAL { ?person ex:nickname ?nickname } }',
+        instance=graph,
+        bindings=[{'person': EX.alice}, {'person': EX.bob}],
+    )
+
+    assert select_results == [
+        [{'person': EX.alice, 'nickname': Literal('Al')}],
+        [{'person': EX.bob}],
+    ]
+
+
+def test_aggregate():
+    with pytest.raises(NotABatchableQuery):
+        query_many(
+            'SELECT (COUNT(?name) AS ?count) WHERE { ?person ex:name ?name }',
+            instance=people(),
+            bindings=[{'person': EX.alice}],
+        )
+
+
+def test_no_bindings():
+    assert query_many(NAME, instance=people(), bindings=[]) == []
+
+
+def test_inconsistent_bindings():
+    with pytest.raises(InconsistentBindings):
+        query_many(
+            NAME,
+            instance=people(),
+            bindings=[{'person': EX.alice}, {'name': Literal('Bob')}],
+        )
+
+
+def test_ask():
+    with pytest.raises(NotABatchableQuery):
+        query_many(
+            'ASK { ?person ex:name ?name }',
+            instance=people(),
+            bindings=[{'person': EX.alice}],
+        )
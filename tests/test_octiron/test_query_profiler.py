@@ -0,0 +1,81 @@
+import json
+import tempfile
+from pathlib import Path
+
+from octadocs.profiler import QueryProfiler, hash_query, query_profiler
+from octadocs.query import query
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+QUERY_TEXT = 'SELECT ?name WHERE { ?person ex:name ?name }'
+
+
+def people() -> ConjunctiveGraph:
+    """Graph with two named people."""
+    graph = ConjunctiveGraph()
+    graph.bind('ex', EX)
+    graph.add((EX.alice, EX.name, Literal('Alice')))
+    graph.add((EX.bob, EX.name, Literal('Bob')))
+    return graph
+
+
+def test_disabled():
+    profiler = QueryProfiler()
+
+    assert profiler.profile('test', QUERY_TEXT, lambda: [1, 2]) == [1, 2]
+    assert not profiler.executions
+
+
+def test_sources_and_pages():
+    profiler = QueryProfiler()
+    profiler.reset(enabled=True)
+
+    profiler.current_page = 'index.md'
+    profiler.profile('query', QUERY_TEXT, lambda: [1, 2])
+    with profiler.source('StoredQuery people'):
+        profiler.profile('query', QUERY_TEXT, lambda: [1])
+    profiler.current_page = None
+    profiler.profile('sparql', 'ASK { ?s ?p ?o }', lambda: True)
+
+    report = profiler.report(caches={'prepared query': (3, 1)})
+
+    assert report['execution_count'] == 3
+    assert {
+        query_summary['hash']: (
+            query_summary['count'],
+            query_summary['rows'],
+            query_summary['sources'],
+        )
+        for query_summary in report['queries']
+    } == {
+        hash_query(QUERY_TEXT): (2, 3, ['StoredQuery people', 'query']),
+        hash_query('ASK { ?s ?p ?o }'): (1, 0, ['sparql']),
+    }
+    assert {
+        page_summary['page'] for page_summary in report['pages']
+    } == {'index.md', None}
+    assert report['caches']['prepared query']['hit_rate'] == 0.75
+
+
+def test_query_is_profiled():
+    query_profiler.reset(enabled=True)
+    try:
+        rows = query(QUERY_TEXT, instance=people())
+        assert query_profiler.executions[0].row_count == 2
+        assert len(rows) == 2
+    finally:
+        query_profiler.reset(enabled=False)
+
+
+def test_write_report():
+    profiler = QueryProfiler()
+    profiler.reset(enabled=True)
+    profiler.profile('query', QUERY_TEXT, lambda: [1])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = Path(temp_dir) / 'profile' / 'queries.json'
+        profiler.write_report(report_path, caches={})
+        report = json.loads(report_path.read_text())
+
+    assert report['queries'][0]['text'] == QUERY_TEXT
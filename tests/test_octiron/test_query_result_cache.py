@@ -0,0 +1,71 @@
+import tempfile
+from pathlib import Path
+
+from octadocs.octiron import Octiron
+from octadocs.query import QueryResultCache
+from rdflib import Literal, URIRef
+
+QUERY_TEXT = 'SELECT ?name WHERE { ?person ex:name ?name }'
+
+ALICE = """
+@prefix ex: <https://example.com/> .
+
+ex:alice ex:name "Alice" .
+"""
+
+
+def test_query_is_executed_once_per_generation():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        (directory / 'alice.ttl').write_text(ALICE)
+
+        octiron = Octiron(root_directory=directory)
+        octiron.graph.bind('ex', 'https://example.com/')
+
+        assert octiron.query(QUERY_TEXT) == []
+
+        octiron.update_from_file(
+            path=directory / 'alice.ttl',
+            local_iri=URIRef('local:alice.ttl'),
+        )
+
+        first_result = octiron.query(QUERY_TEXT)
+        assert first_result == [{'name': Literal('Alice')}]
+        assert octiron.query(QUERY_TEXT) is first_result
+        assert octiron.query_results.hits == 1
+
+        octiron.clear_named_graph(URIRef('local:alice.ttl'))
+        assert octiron.query(QUERY_TEXT) == []
+
+
+def test_bindings_are_part_of_the_key():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        (directory / 'alice.ttl').write_text(ALICE)
+
+        octiron = Octiron(root_directory=directory)
+        octiron.graph.bind('ex', 'https://example.com/')
+        octiron.update_from_file(
+            path=directory / 'alice.ttl',
+            local_iri=URIRef('local:alice.ttl'),
+        )
+
+        alice = URIRef('https://example.com/alice')
+        bob = URIRef('https://example.com/bob')
+
+        assert octiron.query(QUERY_TEXT, person=alice)
+        assert not octiron.query(QUERY_TEXT, person=bob)
+        assert octiron.query_results.misses == 2
+
+
+def test_size_is_limited():
+    query_results = QueryResultCache(max_size=2)
+    for query_text in ('first', 'second', 'first', 'third'):
+        query_results.get(
+            generation=1,
+            query_text=query_text,
+            bindings={},
+            execute=lambda: True,
+        )
+
+    assert [key[1] for key in query_results.results] == ['first', 'third']
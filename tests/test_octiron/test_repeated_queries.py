@@ -0,0 +1,109 @@
+import tempfile
+from pathlib import Path
+
+from jinja2 import DictLoader, Environment
+from octadocs.macros import construct
+from octadocs.octiron import Octiron
+from octadocs.repeated_queries import RepeatedQueryDetector, query_shape
+from octadocs.repeated_queries import repeated_query_detector as detector
+from rdflib import ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+PEOPLE = 'SELECT ?person WHERE { ?person ex:name ?name }'
+NAME = 'SELECT ?name WHERE { ?person ex:name ?name }'
+
+TEMPLATE = '''
+{% for row in query(PEOPLE) %}
+  {{ query(NAME, person=row.person).first.name }}
+{% endfor %}
+'''
+
+
+def people(graph: ConjunctiveGraph) -> ConjunctiveGraph:
+    """Graph with three named people."""
+    graph.bind('ex', EX)
+    for name in ('Alice', 'Bob', 'Carol'):
+        graph.add((EX[name.lower()], EX.name, Literal(name)))
+    return graph
+
+
+def test_query_in_loop_is_reported():
+    environment = Environment(loader=DictLoader({'people.html': TEMPLATE}))
+    template = environment.get_template('people.html')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        octiron = Octiron(root_directory=Path(temp_dir))
+        people(octiron.graph)
+
+        detector.reset(threshold=3)
+        try:
+            repeated_queries = []
+            for page in ('people.md', 'again.md'):
+                detector.current_page = page
+                template.render(query=octiron.query, PEOPLE=PEOPLE, NAME=NAME)
+                repeated_queries.extend(detector.finish_page(page))
+        finally:
+            detector.reset(threshold=0)
+
+    # The second page is rendered from cached results only.
+    assert octiron.query_results.hits == 4
+    assert [
+        (repeated.page, repeated.template, repeated.query_text, repeated.count)
+        for repeated in repeated_queries
+    ] == [
+        ('people.md', 'people.html', NAME, 3),
+        ('again.md', 'people.html', NAME, 3),
+    ]
+
+
+def test_constants_are_not_part_of_shape():
+    assert query_shape(
+        'SELECT ?name WHERE {\n  <https://example.com/alice> ex:name ?name .\n'
+        '  FILTER(?name != "Al \\" Capone")\n}',
+    ) == (
+        'SELECT ?name WHERE { ? ex:name ?name . FILTER(?name != ?) }',
+        ('<https://example.com/alice>', '"Al \\" Capone"'),
+    )
+
+
+def test_interpolated_construct_is_reported():
+    graph = people(ConjunctiveGraph())
+
+    detector.reset(threshold=3)
+    detector.current_page = 'index.md'
+    try:
+        for person in (EX.alice, EX.bob, EX.carol):
+            construct(
+                f'CONSTRUCT WHERE {{ <{person}> ex:name ?name }}',
+                instance=graph,
+            )
+        repeated_queries = detector.finish_page('index.md')
+    finally:
+        detector.reset(threshold=0)
+
+    assert [
+        (repeated.query_text, repeated.count)
+        for repeated in repeated_queries
+    ] == [('CONSTRUCT WHERE { ? ex:name ?name }', 3)]
+
+
+def test_below_threshold():
+    repeated_query_detector = RepeatedQueryDetector()
+    repeated_query_detector.reset(threshold=3)
+    repeated_query_detector.current_page = 'index.md'
+
+    repeated_query_detector.record(NAME, {'person': EX.alice})
+    repeated_query_detector.record(NAME, {'person': EX.alice})
+    repeated_query_detector.record(NAME, {'person': EX.bob})
+    repeated_query_detector.record(PEOPLE, {})
+
+    assert not repeated_query_detector.finish_page('index.md')
+
+
+def test_disabled():
+    repeated_query_detector = RepeatedQueryDetector()
+    repeated_query_detector.current_page = 'index.md'
+    repeated_query_detector.record(NAME, {'person': EX.alice})
+
+    assert not repeated_query_detector.bindings_per_page
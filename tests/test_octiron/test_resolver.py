@@ -0,0 +1,32 @@
+import tempfile
+from pathlib import Path
+
+from octadocs.octiron import Octiron
+from octadocs.resolver import Resolver
+from octadocs.types import LOCAL, OCTA
+from rdflib import RDFS, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+
+def test_resolver():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        octiron = Octiron(root_directory=Path(temp_dir))
+
+    graph = octiron.graph
+    graph.add((EX.alice, OCTA.subjectOf, LOCAL['alice.md']))
+    graph.add((LOCAL['alice.md'], OCTA.url, Literal('alice/')))
+    graph.add((EX.alice, RDFS.label, Literal('Alice')))
+
+    resolver = Resolver(octiron=octiron)
+
+    assert resolver.url(EX.alice) == '/alice/'
+    assert resolver.label(EX.alice) == 'Alice'
+    assert resolver.urls([EX.alice, EX.bob]) == ['/alice/', None]
+    assert resolver.labels([EX.bob, EX.alice]) == [None, 'Alice']
+
+    graph.add((EX.bob, RDFS.label, Literal('Bob')))
+    assert resolver.label(EX.bob) is None
+
+    octiron.generation += 1
+    assert resolver.label(EX.bob) == 'Bob'
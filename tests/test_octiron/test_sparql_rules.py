@@ -0,0 +1,137 @@
+import os
+import tempfile
+from pathlib import Path
+
+from octadocs.octiron.sparql_rules import SparqlRuleEngine, compile_rule
+from rdflib import RDF, ConjunctiveGraph, Literal, Namespace
+
+EX = Namespace('https://example.com/')
+
+PREFIXES = 'PREFIX ex: <https://example.com/>\n'
+
+# File names are chosen so that alphabetical order is the wrong one.
+RULES = {  # noqa: WPS407
+    'a-greet.sparql': (
+        'INSERT { ?person ex:greeting "Hi" } WHERE { ?person a ex:Person }'
+    ),
+    'b-ancestors.sparql': (
+        'INSERT { ?person ex:ancestor ?grandparent } WHERE { ' +
+        '?person ex:ancestor/ex:ancestor ?grandparent }'
+    ),
+    'c-parents.sparql': (
+        'INSERT { ?child ex:ancestor ?parent ; a ex:Person } WHERE { ' +
+        '?child ex:parent ?parent }'
+    ),
+}
+
+
+def write_rules(directory: Path):
+    """Write rule files into the directory."""
+    for file_name, rule_text in RULES.items():
+        (directory / file_name).write_text(PREFIXES + rule_text)
+
+
+def family() -> ConjunctiveGraph:
+    """Three generations of a family."""
+    graph = ConjunctiveGraph()
+    graph.add((EX.alice, EX.parent, EX.bob))
+    graph.add((EX.bob, EX.parent, EX.carol))
+    graph.add((EX.carol, EX.parent, EX.dave))
+    return graph
+
+
+def test_predicates():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        write_rules(directory)
+
+        parents = compile_rule(directory / 'c-parents.sparql', namespaces={})
+        ancestors = compile_rule(
+            directory / 'b-ancestors.sparql',
+            namespaces={},
+        )
+
+    assert parents.reads == {EX.parent}
+    assert parents.writes == {EX.ancestor, RDF.type}
+    assert ancestors.reads == {EX.ancestor}
+    assert ancestors.depends_on(parents)
+    assert ancestors.depends_on(ancestors)
+    assert not parents.depends_on(ancestors)
+
+
+def test_order():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        write_rules(directory)
+
+        rules = SparqlRuleEngine(directory=directory).rules(namespaces={})
+
+    assert [rule.path.name for rule in rules] == [
+        'c-parents.sparql',
+        'a-greet.sparql',
+        'b-ancestors.sparql',
+    ]
+
+
+def test_fixpoint():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        write_rules(directory)
+
+        graph = family()
+        SparqlRuleEngine(directory=directory).apply(graph)
+
+    assert (EX.alice, EX.ancestor, EX.dave) in graph
+    assert (EX.carol, EX.greeting, Literal('Hi')) in graph
+
+
+def test_recompile_on_change():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        write_rules(directory)
+        engine = SparqlRuleEngine(directory=directory)
+
+        rule_path = directory / 'a-greet.sparql'
+        first_rule = engine.rules(namespaces={})[1]
+        assert engine.rules(namespaces={})[1] is first_rule
+
+        rule_path.write_text(PREFIXES + RULES['a-greet.sparql'].replace(
+            'Hi', 'Hello',
+        ))
+        modification_time = rule_path.stat().st_mtime + 1
+        os.utime(rule_path, (modification_time, modification_time))
+
+        graph = family()
+        engine.apply(graph)
+
+    assert (EX.carol, EX.greeting, Literal('Hello')) in graph
+    assert engine.rule_per_path[rule_path] is not first_rule
+
+
+def test_fixpoint_with_rewrite_rule():
+    """Rules which replace as many triples as they remove still count."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        (directory / 'a-promote.sparql').write_text(
+            PREFIXES +
+            'DELETE { ?item ex:draft ?value } ' +
+            'INSERT { ?item ex:final ?value } ' +
+            'WHERE { ?item ex:draft ?value }',
+        )
+        (directory / 'b-propagate.sparql').write_text(
+            PREFIXES +
+            'INSERT { ?next ex:draft ?value } WHERE { ' +
+            '?item ex:final ?value ; ex:next ?next . ' +
+            'FILTER NOT EXISTS { ?next ex:final ?value } }',
+        )
+
+        graph = ConjunctiveGraph()
+        graph.add((EX.one, EX.draft, Literal(1)))
+        graph.add((EX.one, EX.next, EX.two))
+        graph.add((EX.two, EX.next, EX.three))
+        graph.add((EX.three, EX.next, EX.four))
+
+        SparqlRuleEngine(directory=directory).apply(graph)
+
+    assert (EX.four, EX.final, Literal(1)) in graph
+    assert not list(graph.triples((None, EX.draft, None)))
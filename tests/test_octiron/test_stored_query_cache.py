@@ -0,0 +1,85 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from octadocs.plugin import OctaDocsPlugin
+from octadocs.stored_query import (
+    QueryNotFound,
+    StoredQuery,
+    StoredQueryCache,
+    stored_query_cache,
+)
+
+
+def execute(query_text: str, **kwargs):
+    """Return query text instead of running it."""
+    return query_text
+
+
+def test_query_is_read_once_per_build():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        queries_directory = Path(temp_dir)
+        query_path = queries_directory / 'people.sparql'
+        query_path.write_text('SELECT * WHERE { ?s ?p ?o }')
+
+        cache = StoredQueryCache()
+        queries = StoredQuery(
+            path=queries_directory,
+            executor=execute,
+            _text_cache=cache,
+        )
+
+        with patch.object(
+            Path,
+            'read_text',
+            autospec=True,
+            side_effect=Path.read_text,
+        ) as read:
+            queries.people()
+            queries.people()
+            cache.start_build()
+            queries.people()
+
+        assert read.call_count == 1
+
+        query_path.write_text('ASK { ?s ?p ?o }')
+        modification_time = query_path.stat().st_mtime + 1
+        os.utime(query_path, (modification_time, modification_time))
+
+        assert queries.people() == 'SELECT * WHERE { ?s ?p ?o }'
+
+        cache.start_build()
+        assert queries.people() == 'ASK { ?s ?p ?o }'
+
+
+def test_missing_query():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        queries = StoredQuery(
+            path=Path(temp_dir),
+            executor=execute,
+            _text_cache=StoredQueryCache(),
+        )
+
+        with pytest.raises(QueryNotFound):
+            queries.missing()
+
+
+def test_cache_is_not_a_query_name():
+    """`queries.cache` refers to a stored query, not to the text cache."""
+    queries = StoredQuery(
+        path=Path('/queries'),
+        executor=execute,
+        _text_cache=StoredQueryCache(),
+    )
+
+    assert queries.cache.path == Path('/queries/cache')
+
+
+def test_rebuild_checks_queries_again():
+    plugin = OctaDocsPlugin()
+    with patch.object(stored_query_cache, 'start_build') as start_build:
+        plugin.on_pre_build(config={})
+
+    start_build.assert_called_once_with()